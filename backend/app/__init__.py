@@ -8,11 +8,13 @@ from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 
 from config import Config
+from app.cache import ResponseCache
 
 db = SQLAlchemy()
 migrate = Migrate()
 bcrypt = Bcrypt()
 jwt = JWTManager()
+response_cache = ResponseCache()
 
 def create_app():
     app = Flask(__name__)
@@ -25,6 +27,7 @@ def create_app():
     migrate.init_app(app, db)
     bcrypt.init_app(app)
     jwt.init_app(app)
+    response_cache.init_app(app)
 
     # Setup CORS
     CORS(
@@ -33,9 +36,9 @@ def create_app():
         resources={
             r"/api/*": {
                 "origins": "*",  # Allow any origin
-                "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-                "allow_headers": ["Content-Type", "Authorization"],
-                "expose_headers": ["Content-Type"],
+                "methods": ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+                "allow_headers": ["Content-Type", "Authorization", "If-None-Match", "If-Modified-Since", "Range", "If-Range"],
+                "expose_headers": ["Content-Type", "ETag", "Last-Modified", "Content-Range", "Accept-Ranges", "Content-Disposition"],
                 "max_age": 86400
             }
         }
@@ -45,6 +48,42 @@ def create_app():
     from app.routes import api_bp
     app.register_blueprint(api_bp, url_prefix='/api')
 
+    # Expired job sweeper: `flask sweep-expired-jobs`, or a thread when EXPIRY_SWEEP_INTERVAL > 0
+    from app.expiry import expiry_sweeper, sweep_expired_command
+    expiry_sweeper.init_app(app)
+    app.cli.add_command(sweep_expired_command)
+
+    # Buffered job view counts, flushed to job_stats by a background thread
+    from app.job_stats import job_views
+    job_views.init_app(app)
+
+    # Application event outbox: `flask dispatch-outbox`, or a thread when OUTBOX_DISPATCH_INTERVAL > 0
+    from app.outbox import dispatch_outbox_command, outbox_dispatcher
+    outbox_dispatcher.init_app(app)
+    app.cli.add_command(dispatch_outbox_command)
+
+    # Similar-jobs TF-IDF index: rebuilt by a thread every SIMILAR_JOBS_MAX_AGE seconds, or `flask build-similar-jobs-index`
+    from app.similarity import build_similar_jobs_index_command, similar_jobs
+    similar_jobs.init_app(app)
+    app.cli.add_command(build_similar_jobs_index_command)
+
+    # Per-job and per-company application counters: `flask reconcile-application-stats` repairs drift
+    from app.application_stats import reconcile_application_stats_command
+    app.cli.add_command(reconcile_application_stats_command)
+
+    # Resume text extraction for candidate search: `flask extract-resumes`, or a thread when RESUME_EXTRACT_INTERVAL > 0
+    from app.candidate_search import extract_resumes_command, resume_extractor
+    resume_extractor.init_app(app)
+    app.cli.add_command(extract_resumes_command)
+
+    # `flask check-query-plans`: EXPLAIN every route query, fail on full scans
+    from app.query_plans import check_query_plans_command
+    app.cli.add_command(check_query_plans_command)
+
+    # `flask geocode-jobs`: fill in job coordinates from location text
+    from app.proximity import geocode_jobs_command
+    app.cli.add_command(geocode_jobs_command)
+
     # Debug: print routes
     print("\n--- Registered Routes ---")
     for rule in app.url_map.iter_rules():
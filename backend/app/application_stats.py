@@ -0,0 +1,247 @@
+# backend/app/application_stats.py
+
+import math
+from datetime import datetime
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import case, event, func, inspect, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models import Application, CompanyApplicationStat, Job, JobApplicationStat
+
+# Statuses counted in their own column; others only count towards `applications`
+APPLICATION_STATUSES = ('pending', 'reviewed', 'accepted', 'rejected')
+
+# Counter columns of job_application_stats and company_application_stats
+COUNTERS = ('applications',) + APPLICATION_STATUSES + ('first_reviews', 'review_seconds')
+
+# Application columns a job's counters depend on
+_TRACKED = ('job_id', 'status', 'application_date', 'reviewed_at')
+
+
+def contribution(status, application_date, reviewed_at):
+    """{counter: value} one application adds to its job's row."""
+    counts = {'applications': 1}
+    if status in APPLICATION_STATUSES:
+        counts[status] = 1
+    if reviewed_at is not None and application_date is not None:
+        counts['first_reviews'] = 1
+        counts['review_seconds'] = (reviewed_at - application_date).total_seconds()
+    return counts
+
+
+def _add(totals, key, counts, sign=1):
+    row = totals.setdefault(key, {})
+    for counter, value in counts.items():
+        row[counter] = row.get(counter, 0) + sign * value
+
+
+def _upsert(dialect_name, model):
+    # Counters are added in SQL, so concurrent writers cannot lose updates
+    module = postgresql if dialect_name == 'postgresql' else sqlite
+    table = model.__table__
+    statement = module.insert(table)
+    return statement.on_conflict_do_update(
+        index_elements=[column.name for column in table.primary_key],
+        set_={
+            **{counter: table.c[counter] + statement.excluded[counter] for counter in COUNTERS},
+            'updated_at': statement.excluded.updated_at,
+        },
+    )
+
+
+def _write(connection, model, key, deltas):
+    deltas = {owner: counts for owner, counts in deltas.items() if any(counts.values())}
+    if not deltas:
+        return
+    now = datetime.utcnow()
+    rows = [{key: owner, **{counter: counts.get(counter, 0) for counter in COUNTERS}, 'updated_at': now}
+            for owner, counts in sorted(deltas.items())]   # fixed order, so concurrent writers cannot deadlock
+    connection.execute(_upsert(connection.dialect.name, model), rows)
+
+
+def _company_deltas(connection, deltas):
+    companies = dict(connection.execute(
+        select(Job.id, Job.company_id).where(Job.id.in_(deltas), Job.company_id.isnot(None))
+    ).all())
+    totals = {}
+    for job_id, company_id in companies.items():
+        _add(totals, company_id, deltas[job_id])
+    return totals
+
+
+def apply_deltas(connection, deltas):
+    """Add {job id: {counter: delta}} to the jobs' stats and their companies' rollups."""
+    deltas = {job_id: counts for job_id, counts in deltas.items() if any(counts.values())}
+    if not deltas:
+        return
+    _write(connection, JobApplicationStat, 'job_id', deltas)
+    _write(connection, CompanyApplicationStat, 'company_id', _company_deltas(connection, deltas))
+
+
+def count_inserted(connection, rows):
+    """Count applications inserted outside the unit of work (rows with the _TRACKED columns)."""
+    deltas = {}
+    for row in rows:
+        _add(deltas, row.job_id, contribution(row.status, row.application_date, row.reviewed_at))
+    apply_deltas(connection, deltas)
+
+
+def _review_seconds(dialect_name):
+    if dialect_name == 'postgresql':
+        return func.extract('epoch', Application.reviewed_at - Application.application_date)
+    return (func.julianday(Application.reviewed_at) - func.julianday(Application.application_date)) * 86400.0
+
+
+def aggregate_query(dialect_name, job_ids=None):
+    """SELECT job_id, *COUNTERS FROM applications GROUP BY job_id, for `job_ids` or every job."""
+    reviewed = Application.reviewed_at.isnot(None) & Application.application_date.isnot(None)
+    query = select(
+        Application.job_id,
+        func.count(),
+        *(func.sum(case((Application.status == status, 1), else_=0)) for status in APPLICATION_STATUSES),
+        func.sum(case((reviewed, 1), else_=0)),
+        func.sum(case((reviewed, _review_seconds(dialect_name)), else_=0.0)),
+    ).group_by(Application.job_id)
+    if job_ids is not None:
+        query = query.where(Application.job_id.in_(job_ids))
+    return query
+
+
+def aggregate_jobs(connection, job_ids=None):
+    """{job id: {counter: value}} computed from applications, for `job_ids` or every job."""
+    query = aggregate_query(connection.dialect.name, job_ids)
+    return {row[0]: dict(zip(COUNTERS, (value or 0 for value in row[1:]))) for row in connection.execute(query)}
+
+
+def _stored(connection, model, key, owners=None):
+    query = select(model.__table__.c[key], *(model.__table__.c[counter] for counter in COUNTERS))
+    if owners is not None:
+        query = query.where(model.__table__.c[key].in_(owners))
+    return {row[0]: dict(zip(COUNTERS, row[1:])) for row in connection.execute(query)}
+
+
+def _differences(expected, stored):
+    """{owner: {counter: expected - stored}} for owners whose counters drifted."""
+    deltas = {}
+    for owner in expected.keys() | stored.keys():
+        want, have = expected.get(owner, {}), stored.get(owner, {})
+        diff = {counter: want.get(counter, 0) - have.get(counter, 0) for counter in COUNTERS}
+        # Review seconds are summed in floating point, on two different paths
+        if not math.isclose(want.get('review_seconds', 0), have.get('review_seconds', 0), rel_tol=1e-9, abs_tol=0.01):
+            deltas[owner] = diff
+        elif any(diff[counter] for counter in COUNTERS if counter != 'review_seconds'):
+            deltas[owner] = {**diff, 'review_seconds': 0}
+    return deltas
+
+
+def refresh_jobs(connection, job_ids):
+    """Recompute the jobs' counters from applications and carry the change to their companies.
+
+    For changes made with bulk UPDATEs, whose previous values are unknown;
+    costs one indexed aggregate over the jobs' applications.
+    """
+    job_ids = list(job_ids)
+    if job_ids:
+        apply_deltas(connection, _differences(aggregate_jobs(connection, job_ids),
+                                              _stored(connection, JobApplicationStat, 'job_id', job_ids)))
+
+
+def move_jobs(connection, moves):
+    """Move the counters of jobs that changed company: [(job id, old company, new company)]."""
+    moves = [move for move in moves if move[1] != move[2]]
+    if not moves:
+        return
+    stored = _stored(connection, JobApplicationStat, 'job_id', [job_id for job_id, _, _ in moves])
+    totals = {}
+    for job_id, old_company, new_company in moves:
+        if job_id not in stored:
+            continue
+        if old_company is not None:
+            _add(totals, old_company, stored[job_id], -1)
+        if new_company is not None:
+            _add(totals, new_company, stored[job_id])
+    _write(connection, CompanyApplicationStat, 'company_id', totals)
+
+
+def reconcile(connection, dry_run=False):
+    """Rebuild drifted job and company counters from applications; returns (jobs fixed, companies fixed)."""
+    job_deltas = _differences(aggregate_jobs(connection), _stored(connection, JobApplicationStat, 'job_id'))
+    if not dry_run:
+        _write(connection, JobApplicationStat, 'job_id', job_deltas)
+
+    # Company rollups are checked against the job rows as they should be
+    expected_jobs = _stored(connection, JobApplicationStat, 'job_id')
+    if dry_run:
+        for job_id, counts in job_deltas.items():
+            _add(expected_jobs, job_id, counts)
+    expected_companies = {}
+    for job_id, company_id in connection.execute(select(Job.id, Job.company_id).where(Job.company_id.isnot(None))):
+        if job_id in expected_jobs:
+            _add(expected_companies, company_id, expected_jobs[job_id])
+    company_deltas = _differences(expected_companies, _stored(connection, CompanyApplicationStat, 'company_id'))
+    if not dry_run:
+        _write(connection, CompanyApplicationStat, 'company_id', company_deltas)
+    return len(job_deltas), len(company_deltas)
+
+
+def _tracked_values(obj, before):
+    # In after_flush attribute history still describes the flush: `deleted`
+    # holds a replaced value, and a value added without one replaced None.
+    # Unchanged attributes expired by an earlier commit are loaded.
+    values = {}
+    for key in _TRACKED:
+        history = inspect(obj).attrs[key].history
+        if before and history.deleted:
+            values[key] = history.deleted[0]
+        elif before and history.added:
+            values[key] = None
+        else:
+            values[key] = getattr(obj, key)
+    return values
+
+
+def _count(deltas, values, sign):
+    _add(deltas, values['job_id'], contribution(values['status'], values['application_date'], values['reviewed_at']), sign)
+
+
+@event.listens_for(Session, 'after_flush')
+def _count_flushed(session, flush_context):
+    deltas, moves = {}, []
+    for obj in session.new:
+        if isinstance(obj, Application):
+            _count(deltas, _tracked_values(obj, before=False), 1)
+    for obj in session.deleted:
+        if isinstance(obj, Application):
+            _count(deltas, _tracked_values(obj, before=True), -1)
+    for obj in session.dirty:
+        if isinstance(obj, Application):
+            before, after = _tracked_values(obj, before=True), _tracked_values(obj, before=False)
+            if before != after:
+                _count(deltas, before, -1)
+                _count(deltas, after, 1)
+        elif isinstance(obj, Job):
+            # A job moved to another company takes its counters along
+            history = inspect(obj).attrs.company_id.history
+            if history.added:
+                moves.append((obj.id, history.deleted[0] if history.deleted else None, history.added[0]))
+    if deltas or moves:
+        connection = session.connection()
+        apply_deltas(connection, deltas)
+        move_jobs(connection, moves)
+
+
+@click.command('reconcile-application-stats')
+@click.option('--dry-run', is_flag=True, help='Only report how many rows drifted')
+@with_appcontext
+def reconcile_application_stats_command(dry_run):
+    """Rebuild job_application_stats and company_application_stats rows that drifted from applications."""
+    jobs, companies = reconcile(db.session.connection(), dry_run=dry_run)
+    if dry_run:
+        db.session.rollback()
+    else:
+        db.session.commit()
+    click.echo(f"{'Would fix' if dry_run else 'Fixed'} {jobs} job row(s) and {companies} company row(s).")
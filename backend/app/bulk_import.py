@@ -0,0 +1,296 @@
+# backend/app/bulk_import.py
+
+import csv
+import io
+import json
+from datetime import datetime, timezone
+
+from flask import current_app
+from flask_restx import inputs
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import DBAPIError
+
+from app import db
+from app.geo import location_columns
+from app.job_changes import record_job_changes
+from app.models import Company, Job, User
+from app.salary import salary_columns
+from app.search import index_jobs
+from app.versioning import bump_versions
+
+IMPORT_FORMATS = ('json', 'ndjson', 'csv')
+
+CONTENT_TYPES = {
+    'application/json': 'json',
+    'application/x-ndjson': 'ndjson',
+    'application/jsonl': 'ndjson',
+    'text/csv': 'csv',
+}
+
+# Fields a row may set (as in JobCreate); anything else is ignored
+STRING_FIELDS = ('title', 'description', 'requirements', 'location', 'salary', 'job_type', 'image')
+REQUIRED_FIELDS = ('title', 'description', 'recruiter_id')
+
+# Columns written by COPY, in order
+COPY_COLUMNS = (
+    'id', 'title', 'description', 'requirements', 'location', 'latitude', 'longitude', 'geohash',
+    'salary', 'salary_min', 'salary_max', 'salary_currency', 'salary_period', 'salary_annual_min',
+    'salary_annual_max', 'job_type',
+    'date_posted', 'expires_date', 'is_active', 'image', 'recruiter_id', 'company_id', 'duplicate_of_id',
+)
+
+
+class InvalidUpload(ValueError):
+    """Raised when the upload as a whole cannot be read; `status` is the HTTP code."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def upload_format(req, requested=None):
+    """(format, binary stream) of the upload: a raw body or a multipart 'file'."""
+    if req.mimetype == 'multipart/form-data':
+        upload = req.files.get('file')
+        if upload is None:
+            raise InvalidUpload("Multipart uploads must carry the rows in a 'file' field.")
+        extension = (upload.filename or '').rsplit('.', 1)[-1].lower()
+        fmt = requested or CONTENT_TYPES.get(upload.mimetype) or {'jsonl': 'ndjson'}.get(extension, extension)
+        stream = upload.stream
+    else:
+        fmt = requested or CONTENT_TYPES.get(req.mimetype)
+        stream = req.stream
+    if fmt not in IMPORT_FORMATS:
+        raise InvalidUpload(
+            'Send a JSON array (application/json), NDJSON (application/x-ndjson) or CSV (text/csv), '
+            'or set format=.', status=415,
+        )
+    return fmt, stream
+
+
+def read_rows(stream, fmt, max_rows):
+    """Yield (row number, dict or error message) for each row of the upload.
+
+    Rows are numbered from 1 in upload order (CSV: after the header). A row
+    that cannot be decoded is yielded with its error so the rest still go
+    in; an unreadable upload, or one over `max_rows`, raises InvalidUpload.
+    """
+    if fmt == 'json':
+        try:
+            data = json.loads(stream.read().decode('utf-8-sig'))
+        except ValueError as e:
+            raise InvalidUpload(f'Invalid JSON: {e}')
+        if not isinstance(data, list):
+            raise InvalidUpload('A JSON upload must be an array of job objects.')
+        rows = ((number, _object_or_error(row)) for number, row in enumerate(data, 1))
+    else:
+        # newline='' leaves line endings inside quoted CSV fields to the csv module
+        lines = io.TextIOWrapper(stream, encoding='utf-8-sig', errors='replace', newline='')
+        rows = _ndjson_rows(lines) if fmt == 'ndjson' else _csv_rows(lines)
+    for number, row in rows:
+        if number > max_rows:
+            raise InvalidUpload(f'At most {max_rows} rows can be imported at once.', status=413)
+        yield number, row
+
+
+def _object_or_error(row):
+    return row if isinstance(row, dict) else 'Each row must be a JSON object.'
+
+
+def _ndjson_rows(lines):
+    number = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            yield number, _object_or_error(json.loads(line))
+        except ValueError as e:
+            yield number, f'Invalid JSON: {e}'
+
+
+def _csv_rows(lines):
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None:
+        raise InvalidUpload('The CSV upload is empty.')
+    header = [name.strip() for name in header]
+    for number, values in enumerate(reader, 1):
+        if len(values) != len(header):
+            yield number, f'Expected {len(header)} columns, got {len(values)}.'
+        else:
+            yield number, dict(zip(header, values))
+
+
+# --- Validation ---
+
+def _clean(row):
+    """(values, errors) for one row: its JobCreate fields coerced, and {field: message}."""
+    values, errors = {}, {}
+    for name in STRING_FIELDS:
+        value = row.get(name)
+        if value is not None and not isinstance(value, str):
+            errors[name] = 'Must be a string.'
+            continue
+        value = (value or '').strip() or None
+        length = getattr(Job.__table__.c[name].type, 'length', None)
+        if value is not None and length and len(value) > length:
+            errors[name] = f'At most {length} characters.'
+        values[name] = value
+    for name in ('recruiter_id', 'company_id'):
+        value = row.get(name)
+        if isinstance(value, str):
+            value = value.strip() or None
+        try:
+            # bool is an int subclass, but true is no id
+            if isinstance(value, (bool, float)):
+                raise TypeError
+            values[name] = None if value is None else int(value)
+        except (TypeError, ValueError):
+            errors[name] = 'Must be an integer id.'
+    expires = row.get('expires_date')
+    if isinstance(expires, str):
+        expires = expires.strip() or None
+    try:
+        values['expires_date'] = None if expires is None else parse_datetime(expires)
+    except (TypeError, ValueError):
+        errors['expires_date'] = 'Must be an ISO 8601 date or datetime.'
+    for name in REQUIRED_FIELDS:
+        if values.get(name) is None and name not in errors:
+            errors[name] = 'Missing required field.'
+    return values, errors
+
+
+def parse_datetime(value):
+    """Naive UTC datetime from an ISO 8601 date or datetime string; raises ValueError."""
+    try:
+        parsed = inputs.datetime_from_iso8601(value)
+    except ValueError:
+        parsed = datetime.combine(inputs.date(value), datetime.min.time())
+    # Stored as naive UTC, like date_posted
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def validate_rows(rows):
+    """Split (row number, dict or error) pairs into valid and failed rows.
+
+    Returns ([(number, values)], {number: {field: message}}). Recruiter and
+    company references are checked with one IN query per table.
+    """
+    valid, failed = [], {}
+    for number, row in rows:
+        if isinstance(row, str):
+            failed[number] = {'row': row}
+            continue
+        values, errors = _clean(row)
+        if errors:
+            failed[number] = errors
+        else:
+            valid.append((number, values))
+
+    recruiter_ids = {values['recruiter_id'] for _, values in valid}
+    company_ids = {values['company_id'] for _, values in valid if values['company_id'] is not None}
+    recruiters = set(db.session.execute(
+        select(User.id).where(User.id.in_(recruiter_ids), User.is_recruiter == True)  # noqa: E712
+    ).scalars()) if recruiter_ids else set()
+    companies = set(db.session.execute(
+        select(Company.id).where(Company.id.in_(company_ids))
+    ).scalars()) if company_ids else set()
+
+    checked = []
+    for number, values in valid:
+        errors = {}
+        if values['recruiter_id'] not in recruiters:
+            errors['recruiter_id'] = 'Invalid recruiter ID or user is not a recruiter.'
+        if values['company_id'] is not None and values['company_id'] not in companies:
+            errors['company_id'] = 'Company not found.'
+        if errors:
+            failed[number] = errors
+        else:
+            checked.append((number, values))
+    return checked, failed
+
+
+def job_row(values, now):
+    """Every jobs column for validated `values`, the derived ones included
+    (bulk inserts bypass Job's @validates hooks)."""
+    return {
+        **values,
+        **location_columns(values['location']),
+        **salary_columns(values['salary']),
+        'date_posted': now,
+        'is_active': True,
+        'duplicate_of_id': values.get('duplicate_of_id'),
+    }
+
+
+# --- Inserting ---
+
+def _insert_chunk(connection, rows):
+    # ORM-enabled INSERT: one executemany (batched into multi-row VALUES ...
+    # RETURNING where the driver allows); do_orm_execute bumps the version
+    result = db.session.execute(insert(Job).returning(Job.id, sort_by_parameter_order=True), rows)
+    return result.scalars().all()
+
+
+def _copy_chunk(connection, rows):
+    # COPY cannot return ids, so take them from the sequence first
+    ids = connection.execute(
+        select(func.nextval(func.pg_get_serial_sequence('jobs', 'id')))
+        .select_from(func.generate_series(1, len(rows)))
+    ).scalars().all()
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for job_id, row in zip(ids, rows):
+        # Empty strings are already None, so an unquoted empty field is always NULL
+        writer.writerow([job_id] + [row[column] for column in COPY_COLUMNS[1:]])
+    buffer.seek(0)
+    cursor = connection.connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY jobs ({', '.join(COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buffer)
+    finally:
+        cursor.close()
+    bump_versions(connection, ['jobs'])
+    return ids
+
+
+def _uses_copy(connection):
+    return connection.dialect.name == 'postgresql' and connection.dialect.driver == 'psycopg2'
+
+
+def insert_jobs(rows, chunk_size=None):
+    """Insert validated [(number, values)] jobs, committing once per chunk.
+
+    Uses COPY on PostgreSQL (psycopg2) and executemany elsewhere. A chunk
+    the database rejects is rolled back and split in half until only the
+    rows that fail on their own are left; those are reported. (Chunks are
+    transactions rather than savepoints because pysqlite releases the first
+    savepoint as a COMMIT.) Returns ({number: job id}, {number: errors}).
+    """
+    chunk_size = chunk_size or current_app.config.get('BULK_IMPORT_CHUNK_SIZE', 500)
+    now = datetime.utcnow()
+    created, failed = {}, {}
+    pending = [[(number, job_row(values, now)) for number, values in rows[i:i + chunk_size]]
+               for i in range(0, len(rows), chunk_size)]
+    while pending:
+        chunk = pending.pop(0)
+        connection = db.session.connection()
+        try:
+            write = _copy_chunk if _uses_copy(connection) else _insert_chunk
+            ids = write(connection, [row for _, row in chunk])
+            inserted = [{**row, 'id': job_id} for (_, row), job_id in zip(chunk, ids)]
+            index_jobs(connection, inserted)
+            record_job_changes(db.session, 'insert', inserted)
+            db.session.commit()
+        except DBAPIError as e:
+            db.session.rollback()
+            if len(chunk) == 1:
+                failed[chunk[0][0]] = {'row': str(e.orig).strip().splitlines()[0]}
+            else:
+                middle = len(chunk) // 2
+                pending[:0] = [chunk[:middle], chunk[middle:]]
+            continue
+        created.update((number, job_id) for (number, _), job_id in zip(chunk, ids))
+    return created, failed
@@ -0,0 +1,267 @@
+# backend/app/cache.py
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+
+from app.serializers import dumps
+
+
+class TTLCache:
+    """A small thread-safe in-process cache whose entries expire after `ttl` seconds.
+
+    `set` may override the TTL per entry.
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def get(self, key):
+        """Return the cached value for `key`, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class MemoryBackend:
+    """Per-process LRU store bounded by entry count and total value bytes."""
+
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, value, meta)
+        self._bytes = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.time():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1], entry[2]
+
+    def set(self, key, value, meta, ttl):
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.time() + ttl, value, meta)
+            self._bytes += len(value)
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, predicate):
+        with self._lock:
+            stale = [key for key, (_, _, meta) in self._entries.items() if predicate(meta)]
+            for key in stale:
+                self._drop(key)
+            return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def size(self):
+        with self._lock:
+            return len(self._entries), self._bytes
+
+    def _drop(self, key):
+        # Caller holds self._lock
+        _, value, _ = self._entries.pop(key)
+        self._bytes -= len(value)
+
+
+class SQLiteBackend:
+    """Store shared by every worker on the host through one SQLite file.
+
+    Reads touch `last_access` so that size-based eviction drops the least
+    recently used entries, as the memory backend does.
+    """
+
+    def __init__(self, path, max_entries=10000, max_bytes=256 * 1024 * 1024):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS response_cache ("
+                " key TEXT PRIMARY KEY, value BLOB NOT NULL, meta TEXT NOT NULL,"
+                " size INTEGER NOT NULL, expires_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_response_cache_last_access ON response_cache (last_access)")
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        conn = self._connect()
+        now = time.time()
+        row = conn.execute("SELECT value, meta, expires_at FROM response_cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        if row[2] < now:
+            conn.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+            return None
+        conn.execute("UPDATE response_cache SET last_access = ? WHERE key = ?", (now, key))
+        return bytes(row[0]), json.loads(row[1])
+
+    def set(self, key, value, meta, ttl):
+        conn = self._connect()
+        now = time.time()
+        conn.execute(
+            "INSERT OR REPLACE INTO response_cache (key, value, meta, size, expires_at, last_access) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, value, json.dumps(meta), len(value), now + ttl, now),
+        )
+        self._evict(conn, now)
+
+    def _evict(self, conn, now):
+        conn.execute("DELETE FROM response_cache WHERE expires_at < ?", (now,))
+        count, total = conn.execute("SELECT count(*), coalesce(sum(size), 0) FROM response_cache").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        # Walk from least recently used until both bounds hold again
+        doomed = []
+        for key, size in conn.execute("SELECT key, size FROM response_cache ORDER BY last_access"):
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            count -= 1
+            total -= size
+        conn.executemany("DELETE FROM response_cache WHERE key = ?", doomed)
+        self.evictions += len(doomed)
+
+    def invalidate(self, predicate):
+        conn = self._connect()
+        stale = [(key,) for key, meta in conn.execute("SELECT key, meta FROM response_cache")
+                 if predicate(json.loads(meta))]
+        conn.executemany("DELETE FROM response_cache WHERE key = ?", stale)
+        return len(stale)
+
+    def clear(self):
+        self._connect().execute("DELETE FROM response_cache")
+
+    def size(self):
+        return tuple(self._connect().execute(
+            "SELECT count(*), coalesce(sum(size), 0) FROM response_cache").fetchone())
+
+
+class ResponseCache:
+    """Cache of serialized JSON responses with metadata-driven invalidation.
+
+    Each entry carries a JSON-serializable `meta` dict describing what it
+    contains (e.g. which job and company ids), so writers can invalidate
+    exactly the entries a change affects via `invalidate(predicate)`.
+    Entries stored with a `versions` value (the table versions the
+    response's ETag covers, see app.versioning.request_versions) are only
+    served to requests seeing the same versions: writes in other worker
+    processes never reach this worker's invalidation.
+    Configured from RESPONSE_CACHE_* settings by `init_app`.
+    """
+
+    def __init__(self):
+        self.backend = None
+        self.ttl = 60
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def init_app(self, app):
+        backend = app.config.get('RESPONSE_CACHE_BACKEND', 'memory')
+        max_entries = app.config.get('RESPONSE_CACHE_MAX_ENTRIES', 1024)
+        max_bytes = app.config.get('RESPONSE_CACHE_MAX_BYTES', 64 * 1024 * 1024)
+        self.ttl = app.config.get('RESPONSE_CACHE_TTL', 60)
+        if backend == 'sqlite':
+            self.backend = SQLiteBackend(app.config['RESPONSE_CACHE_PATH'], max_entries, max_bytes)
+        elif backend == 'memory':
+            self.backend = MemoryBackend(max_entries, max_bytes)
+        else:
+            self.backend = None  # caching disabled
+
+    def _count(self, attr, n=1):
+        with self._stats_lock:
+            setattr(self, attr, getattr(self, attr) + n)
+
+    def get(self, key, versions=None):
+        """Return a ready JSON response for `key`, or None on a miss (or an entry of other `versions`)."""
+        if self.backend is None:
+            return None
+        entry = self.backend.get(key)
+        if entry is None or entry[1].get('versions') != versions:
+            self._count('misses')
+            return None
+        self._count('hits')
+        return current_app.response_class(entry[0], mimetype='application/json')
+
+    def store(self, key, data, meta, versions=None):
+        """Serialize `data` as the API would, cache it and return the response."""
+        body = dumps(data)
+        if self.backend is not None:
+            self.backend.set(key, body, {**meta, 'versions': versions}, self.ttl)
+        return current_app.response_class(body, mimetype='application/json')
+
+    def invalidate(self, predicate):
+        if self.backend is None:
+            return 0
+        dropped = self.backend.invalidate(predicate)
+        self._count('invalidations', dropped)
+        return dropped
+
+    def clear(self):
+        if self.backend is not None:
+            self.backend.clear()
+
+    def stats(self):
+        entries, size = self.backend.size() if self.backend is not None else (0, 0)
+        return {
+            'backend': type(self.backend).__name__ if self.backend is not None else None,
+            'hits': self.hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+            'evictions': getattr(self.backend, 'evictions', 0),
+            'entries': entries,
+            'bytes': size,
+        }
@@ -0,0 +1,397 @@
+# backend/app/candidate_search.py
+
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import DDL, and_, column, event, func, inspect, literal_column, or_, select, table, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import with_expression
+
+from app import db
+from app.models import Application, ResumeBlob, ResumeExtraction
+from app.pagination import KeysetOrder
+from app.resume_store import blob_path
+from app.resume_text import UnsupportedResume, extract_text
+from app.search import fts5_query, tokenize
+
+# Application columns covered by candidate search
+SEARCH_COLUMNS = ('cover_letter_text', 'resume_text')
+
+_COALESCED_COLUMNS = [f"coalesce({c}, '')" for c in SEARCH_COLUMNS]
+
+# SQLite: standalone FTS5 table whose rowid mirrors applications.id
+FTS_TABLE = 'applications_fts'
+fts_table = table(FTS_TABLE, column('rowid'))
+FTS_CREATE = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+    f"USING fts5({', '.join(SEARCH_COLUMNS)}, tokenize='porter unicode61')"
+)
+
+# PostgreSQL: GIN index over the expression used in queries (see app/search.py)
+PG_TS_CONFIG = 'english'
+PG_DOCUMENT_SQL = " || ' ' || ".join(_COALESCED_COLUMNS)
+PG_GIN_INDEX = 'ix_applications_search_tsv'
+PG_GIN_CREATE = (
+    f"CREATE INDEX IF NOT EXISTS {PG_GIN_INDEX} ON applications "
+    f"USING gin (to_tsvector('{PG_TS_CONFIG}', {PG_DOCUMENT_SQL}))"
+)
+
+# Files a pool process extracts before it is replaced, so a leaky parser cannot grow without bound
+TASKS_PER_CHILD = 100
+
+
+# --- Index maintenance (SQLite only) ---
+
+def index_applications(connection, applications):
+    """Write (or rewrite) the FTS rows for `applications` (mappings or Application objects)."""
+    if connection.dialect.name != 'sqlite':
+        return
+    rows = []
+    for application in applications:
+        values = application if isinstance(application, dict) else {
+            k: getattr(application, k) for k in ('id',) + SEARCH_COLUMNS}
+        rows.append({'rowid': values['id'], **{c: values.get(c) or '' for c in SEARCH_COLUMNS}})
+    if not rows:
+        return
+    connection.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :rowid"), [{'rowid': r['rowid']} for r in rows])
+    connection.execute(
+        text(f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(SEARCH_COLUMNS)}) "
+             f"VALUES (:rowid, {', '.join(':' + c for c in SEARCH_COLUMNS)})"),
+        rows,
+    )
+
+
+def unindex_applications(connection, application_ids):
+    if connection.dialect.name != 'sqlite' or not application_ids:
+        return
+    connection.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :rowid"),
+                       [{'rowid': application_id} for application_id in application_ids])
+
+
+@event.listens_for(Application, 'after_insert')
+def _application_inserted(mapper, connection, target):
+    index_applications(connection, [target])
+
+
+@event.listens_for(Application, 'after_update')
+def _application_updated(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[c].history.has_changes() for c in SEARCH_COLUMNS):
+        index_applications(connection, [target])
+
+
+@event.listens_for(Application, 'after_delete')
+def _application_deleted(mapper, connection, target):
+    unindex_applications(connection, [target.id])
+
+
+# db.create_all() setups get the search structures with `applications`;
+# migrated databases get them from the Alembic revision
+event.listen(Application.__table__, 'after_create', DDL(FTS_CREATE).execute_if(dialect='sqlite'))
+event.listen(Application.__table__, 'after_create', DDL(PG_GIN_CREATE).execute_if(dialect='postgresql'))
+event.listen(Application.__table__, 'before_drop', DDL(f"DROP TABLE IF EXISTS {FTS_TABLE}").execute_if(dialect='sqlite'))
+
+
+def store_resume_text(session, blob_id, text_):
+    """Save a blob's extracted text and copy it to (and reindex) the applications sent with it."""
+    now = datetime.utcnow()
+    session.execute(update(ResumeBlob).where(ResumeBlob.id == blob_id).values(text=text_, extracted_at=now))
+    statement = update(Application).where(Application.resume_blob_id == blob_id).values(resume_text=text_)
+    columns = (Application.id,) + tuple(getattr(Application, c) for c in SEARCH_COLUMNS)
+    options = {'synchronize_session': False}
+    if session.get_bind().dialect.update_returning:
+        rows = session.execute(statement.returning(*columns), execution_options=options).all()
+    else:
+        session.execute(statement, execution_options=options)
+        rows = session.execute(select(*columns).where(Application.resume_blob_id == blob_id)).all()
+    index_applications(session.connection(), [row._asdict() for row in rows])
+
+
+# --- Querying ---
+
+def _pg_document():
+    # Must render as PG_GIN_CREATE does for the planner to use the index
+    parts = [func.coalesce(getattr(Application, c), literal_column("''")) for c in SEARCH_COLUMNS]
+    document = parts[0]
+    for part in parts[1:]:
+        document = document.op('||')(literal_column("' '")).op('||')(part)
+    return func.to_tsvector(literal_column(f"'{PG_TS_CONFIG}'::regconfig"), document)
+
+
+def search_applications(query, text_):
+    """Restrict an Application query to candidates matching `text_` in resume or cover letter, ranked.
+
+    Returns (query, order) like app.search.search_jobs: `order` is a
+    KeysetOrder on the relevance score, to be loaded with
+    `with_application_relevance`. (None, None) when `text_` has no terms.
+    """
+    terms = tokenize(text_)
+    if not terms:
+        return None, None
+
+    if db.session.get_bind().dialect.name == 'postgresql':
+        document = _pg_document()
+        ts_query = func.plainto_tsquery(literal_column(f"'{PG_TS_CONFIG}'::regconfig"), ' '.join(terms))
+        rank = func.ts_rank(document, ts_query)
+        query = query.filter(document.op('@@')(ts_query))
+        order = KeysetOrder('relevance', rank, Application.id, descending=True,
+                            value_type=float, attribute='search_rank')
+    else:
+        fts = literal_column(FTS_TABLE)
+        matches = (
+            select(fts_table.c.rowid.label('application_id'), func.bm25(fts).label('rank'))
+            .where(fts.op('MATCH')(fts5_query(terms)))
+            .subquery()
+        )
+        query = query.join(matches, matches.c.application_id == Application.id)
+        # bm25() is lower-is-better
+        order = KeysetOrder('relevance', matches.c.rank, Application.id, value_type=float, attribute='search_rank')
+    return query, order
+
+
+def with_application_relevance(query, order):
+    """Populate Application.search_rank from an order returned by search_applications."""
+    return query.options(with_expression(Application.search_rank, order.column))
+
+
+# --- Extraction queue ---
+
+def enqueue_extractions(session, blob_ids):
+    """Queue text extraction for `blob_ids` (once per blob) in the session's transaction; the caller commits."""
+    if not blob_ids:
+        return
+    module = postgresql if session.get_bind().dialect.name == 'postgresql' else sqlite
+    now = datetime.utcnow()
+    session.execute(
+        module.insert(ResumeExtraction)
+        .values([{'blob_id': blob_id, 'status': 'queued', 'attempts': 0, 'created_at': now} for blob_id in blob_ids])
+        .on_conflict_do_nothing(index_elements=['blob_id'])
+    )
+
+
+class ResumeExtractor:
+    """Extracts the text of queued resumes in a bounded pool of processes.
+
+    Jobs are claimed from resume_extractions (FOR UPDATE SKIP LOCKED on
+    PostgreSQL, so workers never claim the same job) RESUME_EXTRACT_WORKERS
+    at a time; parsing runs in that many spawned processes, away from the
+    web worker's threads. A job still running after RESUME_EXTRACT_TIMEOUT
+    fails its attempt and the pool is replaced (the batch's other unfinished
+    jobs are queued again at no cost to their attempts); jobs abandoned by a
+    worker that died are claimed again once twice the timeout has passed.
+    Failed jobs are retried up to RESUME_EXTRACT_MAX_ATTEMPTS times. Runs
+    from a background thread every RESUME_EXTRACT_INTERVAL seconds (sooner
+    when notify() is called) or from `flask extract-resumes`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._executor = None
+        self.extracted = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.last_run_at = None
+
+    def init_app(self, app):
+        if app.config.get('RESUME_EXTRACT_INTERVAL', 10) > 0:
+            app.before_request(lambda: self.start(app))
+
+    def start(self, app):
+        """Start the background extraction thread if it is not running yet."""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, args=(app,), name='resume-extractor', daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        self._discard_pool()
+
+    def notify(self):
+        """Have the thread (if any) look at the queue now rather than at its next interval."""
+        self._wake.set()
+
+    def _run(self, app):
+        interval = app.config['RESUME_EXTRACT_INTERVAL']
+        while not self._stop.is_set():
+            self._wake.wait(interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            with app.app_context():
+                try:
+                    self.drain()
+                except Exception:
+                    db.session.rollback()
+                    self.errors += 1
+                    app.logger.exception('Resume extraction failed')
+
+    def _pool(self, workers):
+        if self._executor is None:
+            # spawn: children start clean instead of inheriting this process's threads, locks and connections
+            self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                                 max_tasks_per_child=TASKS_PER_CHILD)
+        return self._executor
+
+    def _discard_pool(self):
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            # A stuck parser never returns; its process has to be killed
+            for process in list((getattr(executor, '_processes', None) or {}).values()):
+                process.kill()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _claim(self, limit, timeout):
+        abandoned = datetime.utcnow() - timedelta(seconds=2 * timeout)
+        rows = db.session.execute(
+            select(ResumeExtraction.id, ResumeExtraction.blob_id, ResumeExtraction.attempts, ResumeBlob.content_type)
+            .join(ResumeBlob, ResumeBlob.id == ResumeExtraction.blob_id)
+            .where(or_(ResumeExtraction.status == 'queued',
+                       and_(ResumeExtraction.status == 'running', ResumeExtraction.started_at < abandoned)))
+            .order_by(ResumeExtraction.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True, of=ResumeExtraction)
+        ).all()
+        if rows:
+            db.session.execute(
+                update(ResumeExtraction).where(ResumeExtraction.id.in_([row.id for row in rows]))
+                .values(status='running', started_at=datetime.utcnow(), attempts=ResumeExtraction.attempts + 1),
+                execution_options={'synchronize_session': False},
+            )
+        db.session.commit()
+        return rows
+
+    def drain(self, max_jobs=None):
+        """Extract queued resumes until the queue is empty (or `max_jobs` were tried); returns the number extracted."""
+        config = current_app.config
+        workers = config.get('RESUME_EXTRACT_WORKERS', 2)
+        timeout = config.get('RESUME_EXTRACT_TIMEOUT', 60)
+        extracted, tried = 0, 0
+        while max_jobs is None or tried < max_jobs:
+            jobs = self._claim(workers if max_jobs is None else min(workers, max_jobs - tried), timeout)
+            if not jobs:
+                break
+            tried += len(jobs)
+            pool = self._pool(workers)
+            deadline = time.monotonic() + timeout
+            futures = [(job, pool.submit(extract_text, blob_path(job.blob_id), job.content_type)) for job in jobs]
+            requeued = set()
+            for index, (job, future) in enumerate(futures):
+                if job.id in requeued:
+                    continue
+                try:
+                    text_ = future.result(timeout=max(0.0, deadline - time.monotonic()))
+                except TimeoutError:
+                    self._failed(job, f'Timed out after {timeout} s')
+                    with self._lock:
+                        self.timeouts += 1
+                    # Killing the pool takes down the batch's other unfinished
+                    # jobs too; they go back to the queue without losing an attempt
+                    unfinished = [other for other, other_future in futures[index + 1:] if not other_future.done()]
+                    self._discard_pool()
+                    self._requeue(unfinished)
+                    requeued.update(other.id for other in unfinished)
+                    continue
+                except UnsupportedResume as e:
+                    self._failed(job, str(e), retry=False)
+                    continue
+                except Exception as e:
+                    if isinstance(e, BrokenProcessPool):
+                        # A pool process died; a broken pool takes no more work
+                        self._discard_pool()
+                    self._failed(job, f'{type(e).__name__}: {e}')
+                    continue
+                store_resume_text(db.session, job.blob_id, text_)
+                db.session.execute(
+                    update(ResumeExtraction).where(ResumeExtraction.id == job.id)
+                    .values(status='done', finished_at=datetime.utcnow(), last_error=None),
+                    execution_options={'synchronize_session': False},
+                )
+                db.session.commit()
+                extracted += 1
+        with self._lock:
+            self.extracted += extracted
+            self.last_run_at = datetime.utcnow()
+        return extracted
+
+    def _requeue(self, jobs):
+        """Put claimed `jobs` back in the queue, taking back the attempt their claim counted."""
+        if not jobs:
+            return
+        db.session.execute(
+            update(ResumeExtraction).where(ResumeExtraction.id.in_([job.id for job in jobs]))
+            .values(status='queued', attempts=ResumeExtraction.attempts - 1),
+            execution_options={'synchronize_session': False},
+        )
+        db.session.commit()
+
+    def _failed(self, job, error, retry=True):
+        # `job.attempts` is the count before this attempt's claim
+        max_attempts = current_app.config.get('RESUME_EXTRACT_MAX_ATTEMPTS', 3)
+        give_up = not retry or job.attempts + 1 >= max_attempts
+        current_app.logger.warning('Extracting resume %s failed: %s', job.blob_id, error)
+        db.session.execute(
+            update(ResumeExtraction).where(ResumeExtraction.id == job.id)
+            .values(status='failed' if give_up else 'queued', finished_at=datetime.utcnow(), last_error=error[:1000]),
+            execution_options={'synchronize_session': False},
+        )
+        db.session.commit()
+        if give_up:
+            with self._lock:
+                self.failed += 1
+
+    def stats(self):
+        queue = dict(db.session.execute(
+            select(ResumeExtraction.status, func.count(ResumeExtraction.id)).group_by(ResumeExtraction.status)
+        ).all())
+        with self._lock:
+            return {
+                'running': self._thread is not None and self._thread.is_alive(),
+                'extracted': self.extracted,
+                'failed': self.failed,
+                'timeouts': self.timeouts,
+                'errors': self.errors,
+                'queue': {status: queue.get(status, 0) for status in ('queued', 'running', 'done', 'failed')},
+                'last_run_at': self.last_run_at,
+            }
+
+
+resume_extractor = ResumeExtractor()
+
+
+@click.command('extract-resumes')
+@click.option('--max-jobs', type=int, default=None, help='Stop after trying this many resumes')
+@click.option('--every', type=float, default=None, help='Keep extracting every N seconds')
+@click.option('--retry-failed', is_flag=True, help='Queue resumes whose extraction failed again first')
+@with_appcontext
+def extract_resumes_command(max_jobs, every, retry_failed):
+    """Extract the text of queued resumes into the candidate search index."""
+    if retry_failed:
+        db.session.execute(
+            update(ResumeExtraction).where(ResumeExtraction.status == 'failed').values(status='queued', attempts=0),
+            execution_options={'synchronize_session': False},
+        )
+        db.session.commit()
+    try:
+        while True:
+            extracted = resume_extractor.drain(max_jobs=max_jobs)
+            click.echo(f"{datetime.utcnow():%Y-%m-%d %H:%M:%S} extracted={extracted}")
+            if not every:
+                break
+            time.sleep(every)
+    finally:
+        resume_extractor.stop()
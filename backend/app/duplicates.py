@@ -0,0 +1,253 @@
+# backend/app/duplicates.py
+
+import hashlib
+import re
+import threading
+import time
+from array import array
+from collections import defaultdict
+
+from flask import current_app
+from sqlalchemy import update
+
+from app import db
+from app.job_changes import on_jobs_committed, record_job_changes
+from app.models import Job
+
+# MinHash signature length, split into BANDS bands of ROWS values for LSH.
+# Two postings share a band (and get compared) with probability
+# 1 - (1 - J^ROWS)^BANDS: 0.9996 at Jaccard 0.8, 0.10 at 0.3. Postings of
+# a dozen words or so fill few bins and fall short of that.
+NUM_HASHES = 128
+BANDS = 32
+ROWS = NUM_HASHES // BANDS
+
+# Words per shingle; postings shorter than this are shingled by word
+SHINGLE_WORDS = 3
+
+# Signature values keep 50 bits; the bits above record how far a value was
+# borrowed during densification (see signature())
+_VALUE_BITS = 50
+_VALUE_MASK = (1 << _VALUE_BITS) - 1
+
+_WORD_RE = re.compile(r'[^\W_]+', re.UNICODE)
+
+POLICIES = ('flag', 'reject', 'off')
+
+
+def shingles(title, description):
+    words = _WORD_RE.findall(f'{title or ""} {description or ""}'.lower())
+    if len(words) < SHINGLE_WORDS:
+        return set(words)
+    return {' '.join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+
+def _hash(shingle):
+    return int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def signature(title, description):
+    """MinHash signature (array of NUM_HASHES ints) of a posting, or None if it has no words.
+
+    One-permutation hashing: each shingle is hashed once, the hash picks
+    one of NUM_HASHES bins and the bin keeps its smallest value. Empty bins
+    copy the next filled bin to their right, tagged with the distance, so
+    two postings only agree on a bin when they would have agreed on the
+    value borrowed (rotation densification, Shrivastava & Li 2014).
+    """
+    hashes = {_hash(shingle) for shingle in shingles(title, description)}
+    if not hashes:
+        return None
+    bins = [None] * NUM_HASHES
+    for h in hashes:
+        index, value = h % NUM_HASHES, (h // NUM_HASHES) & _VALUE_MASK
+        if bins[index] is None or value < bins[index]:
+            bins[index] = value
+    filled = next(i for i, value in enumerate(bins) if value is not None)
+    # Walk right to left from a filled bin, so each empty bin sees its nearest filled neighbour
+    borrowed, distance = bins[filled], 0
+    for step in range(1, NUM_HASHES + 1):
+        i = (filled - step) % NUM_HASHES
+        if bins[i] is None:
+            distance += 1
+            bins[i] = (distance << _VALUE_BITS) | borrowed
+        else:
+            borrowed, distance = bins[i], 0
+    return array('Q', bins)
+
+
+def similarity(a, b):
+    """Jaccard similarity estimated from two signatures."""
+    return sum(x == y for x, y in zip(a, b)) / NUM_HASHES
+
+
+def owner_key(company_id, recruiter_id):
+    """Postings are compared within a company, or within a recruiter's jobs without one."""
+    return ('company', company_id) if company_id is not None else ('recruiter', recruiter_id)
+
+
+def _band_keys(owner, sig):
+    # Band b takes bins b, b + BANDS, ...: neighbouring bins of a short posting
+    # often borrow from the same filled bin, and would make every band agree
+    return [(owner, band, sig[band::BANDS].tobytes()) for band in range(BANDS)]
+
+
+class DuplicateJobsIndex:
+    """MinHash signatures of active jobs in a banded LSH table.
+
+    `buckets` maps (owner, band, band values) to job ids, so looking up a
+    posting is BANDS dict probes plus a signature comparison per candidate,
+    whatever the size of the catalog. Built lazily from the database,
+    rebuilt every DUPLICATE_INDEX_MAX_AGE seconds (to pick up other workers'
+    writes) and kept current from committed job changes in this process.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._built_at = 0.0
+        self._stale_ids = set()   # changed jobs whose text or owner must be re-read
+        self._reset()
+
+    def _reset(self):
+        self.signatures = {}                # job id -> (owner, signature)
+        self.buckets = defaultdict(set)     # (owner, band, band bytes) -> job ids
+
+    def _add(self, job_id, owner, sig):
+        # Caller holds self._lock
+        self._remove(job_id)
+        if sig is None:
+            return
+        self.signatures[job_id] = (owner, sig)
+        for key in _band_keys(owner, sig):
+            self.buckets[key].add(job_id)
+
+    def _remove(self, job_id):
+        # Caller holds self._lock
+        entry = self.signatures.pop(job_id, None)
+        if entry is None:
+            return
+        for key in _band_keys(*entry):
+            bucket = self.buckets.get(key)
+            if bucket is not None:
+                bucket.discard(job_id)
+                if not bucket:
+                    del self.buckets[key]
+
+    def _add_row(self, row):
+        self._add(row.id, owner_key(row.company_id, row.recruiter_id), signature(row.title, row.description))
+
+    def _build(self):
+        self._reset()
+        rows = (db.session.query(Job.id, Job.title, Job.description, Job.company_id, Job.recruiter_id)
+                .filter(Job.is_active == True)  # noqa: E712
+                .yield_per(2000))
+        for row in rows:
+            self._add_row(row)
+        self._built_at = time.time()
+
+    def _ensure_current(self):
+        # Caller holds self._lock
+        if not self._loaded or time.time() - self._built_at > current_app.config.get('DUPLICATE_INDEX_MAX_AGE', 3600):
+            self._build()
+            self._loaded = True
+            self._stale_ids.clear()
+        if self._stale_ids:
+            ids, self._stale_ids = self._stale_ids, set()
+            rows = (db.session.query(Job.id, Job.title, Job.description, Job.company_id, Job.recruiter_id)
+                    .filter(Job.id.in_(ids), Job.is_active == True)  # noqa: E712
+                    .all())
+            for job_id in ids:
+                self._remove(job_id)
+            for row in rows:
+                self._add_row(row)
+
+    def apply(self, changes):
+        """Fold committed job changes in; anything not in the change is re-read on next use."""
+        with self._lock:
+            if not self._loaded:
+                return
+            for op, values in changes:
+                job_id = values['id']
+                if op == 'delete' or values.get('is_active') is False:
+                    self._remove(job_id)
+                    self._stale_ids.discard(job_id)
+                elif values.get('is_active') is True and all(
+                        column in values for column in ('title', 'description', 'company_id', 'recruiter_id')):
+                    self._add(job_id, owner_key(values['company_id'], values['recruiter_id']),
+                              signature(values['title'], values['description']))
+                    self._stale_ids.discard(job_id)
+                else:
+                    self._stale_ids.add(job_id)
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded = False
+            self._built_at = 0.0
+
+    def _best(self, owner, sig, threshold, extra=()):
+        # Caller holds self._lock. `extra` is [(key, owner, signature)] not in the index.
+        best = None
+        candidates = set()
+        for key in _band_keys(owner, sig):
+            candidates |= self.buckets.get(key, set())
+        scored = [(similarity(sig, self.signatures[job_id][1]), job_id, None) for job_id in candidates]
+        scored += [(similarity(sig, other), None, key) for key, other_owner, other in extra if other_owner == owner]
+        for score, job_id, key in scored:
+            if score >= threshold and (best is None or score > best[0]):
+                best = (score, job_id, key)
+        return best
+
+    def find(self, title, description, company_id, recruiter_id, threshold=None):
+        """(job id, similarity) of the closest active near-duplicate from the same owner, or None."""
+        sig = signature(title, description)
+        if sig is None:
+            return None
+        threshold = threshold or current_app.config.get('DUPLICATE_JOB_THRESHOLD', 0.8)
+        with self._lock:
+            self._ensure_current()
+            best = self._best(owner_key(company_id, recruiter_id), sig, threshold)
+        return (best[1], best[0]) if best else None
+
+    def find_many(self, postings, threshold=None):
+        """Near-duplicates for [(key, values)] postings, e.g. the rows of an upload.
+
+        Each posting is checked against the active jobs and against the
+        postings before it. Returns {key: (job id, earlier key, similarity)}
+        where exactly one of job id and earlier key is set.
+        """
+        threshold = threshold or current_app.config.get('DUPLICATE_JOB_THRESHOLD', 0.8)
+        seen, matches = [], {}
+        with self._lock:
+            self._ensure_current()
+            for key, values in postings:
+                sig = signature(values.get('title'), values.get('description'))
+                if sig is None:
+                    continue
+                owner = owner_key(values.get('company_id'), values.get('recruiter_id'))
+                best = self._best(owner, sig, threshold, seen)
+                if best:
+                    matches[key] = (best[1], best[2], best[0])
+                else:
+                    # Duplicates are not originals: later copies point at the first
+                    seen.append((key, owner, sig))
+        return matches
+
+
+def duplicate_policy():
+    """What to do with a near-duplicate posting: 'flag', 'reject' or 'off'."""
+    return current_app.config.get('DUPLICATE_JOB_POLICY', 'flag')
+
+
+def flag_duplicates(pairs):
+    """Set duplicate_of_id for [(job id, original job id)] in one executemany; the caller commits."""
+    if not pairs:
+        return
+    rows = [{'id': job_id, 'duplicate_of_id': original_id} for job_id, original_id in pairs]
+    # ORM bulk UPDATE by primary key: one executemany, and the jobs version is bumped
+    db.session.execute(update(Job), rows)
+    record_job_changes(db.session, 'update', rows)
+
+
+duplicate_jobs = DuplicateJobsIndex()
+on_jobs_committed(duplicate_jobs.apply)
@@ -0,0 +1,157 @@
+# backend/app/expiry.py
+
+import threading
+import time
+from datetime import datetime
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import DDL, event, func, select, true, update
+
+from app import db
+from app.job_changes import record_job_changes
+from app.models import Job
+
+# Live-rows-only index for the default is_active=True listing on PostgreSQL.
+# SQLite cannot match `WHERE is_active` against `is_active = 1` filters, so
+# it keeps serving them from the composite ix_jobs_active_date_posted_id.
+PG_LIVE_INDEX_CREATE = "CREATE INDEX IF NOT EXISTS ix_jobs_live_date_posted ON jobs (date_posted, id) WHERE is_active"
+
+
+def expired_jobs(now):
+    """Filter matching live jobs whose expires_date is at or before `now`."""
+    return (Job.is_active == true()) & (Job.expires_date <= now)
+
+
+class ExpirySweeper:
+    """Deactivates jobs whose expires_date has passed.
+
+    Each batch of at most EXPIRY_SWEEP_BATCH_SIZE jobs is its own short
+    transaction, so a large backlog never holds long locks. Runs from the
+    `flask sweep-expired-jobs` command, or from a background thread every
+    EXPIRY_SWEEP_INTERVAL seconds once the app serves its first request.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self.runs = 0
+        self.errors = 0
+        self.deactivated_total = 0
+        self.last_run = None
+
+    def init_app(self, app):
+        if app.config.get('EXPIRY_SWEEP_INTERVAL', 0) > 0:
+            app.before_request(lambda: self.start(app))
+
+    def start(self, app):
+        """Start the background sweeper thread if it is not running yet."""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, args=(app,), name='expiry-sweeper', daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self, app):
+        interval = app.config['EXPIRY_SWEEP_INTERVAL']
+        while not self._stop.wait(interval):
+            with app.app_context():
+                try:
+                    self.sweep()
+                except Exception:
+                    db.session.rollback()
+                    self.errors += 1
+                    app.logger.exception('Expired job sweep failed')
+
+    def sweep(self, batch_size=None, max_batches=None, now=None):
+        """Deactivate expired jobs, oldest expiry first; returns this run's metrics."""
+        batch_size = batch_size or current_app.config.get('EXPIRY_SWEEP_BATCH_SIZE', 500)
+        now = now or datetime.utcnow()
+        started = time.monotonic()
+        deactivated, batches, max_lag = 0, 0, 0.0
+
+        while max_batches is None or batches < max_batches:
+            rows = db.session.execute(
+                select(Job.id, Job.expires_date).where(expired_jobs(now)).order_by(Job.expires_date).limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            ids = [row.id for row in rows]
+            result = db.session.execute(
+                update(Job).where(Job.id.in_(ids), Job.is_active == true()).values(is_active=False),
+                execution_options={'synchronize_session': False},
+            )
+            record_job_changes(db.session, 'update', [{'id': job_id, 'is_active': False} for job_id in ids])
+            db.session.commit()
+
+            batches += 1
+            deactivated += result.rowcount
+            # Rows come oldest first, so the first one waited longest
+            max_lag = max(max_lag, (now - rows[0].expires_date).total_seconds())
+            if len(rows) < batch_size:
+                break
+
+        backlog, oldest = db.session.execute(
+            select(func.count(Job.id), func.min(Job.expires_date)).where(expired_jobs(datetime.utcnow()))
+        ).one()
+        db.session.commit()
+        duration = time.monotonic() - started
+
+        run = {
+            'started_at': now,
+            'deactivated': deactivated,
+            'batches': batches,
+            'duration_seconds': round(duration, 3),
+            'jobs_per_second': round(deactivated / duration, 1) if duration else None,
+            'max_lag_seconds': round(max_lag, 1),
+            'backlog': backlog,
+            'backlog_lag_seconds': round((datetime.utcnow() - oldest).total_seconds(), 1) if oldest else 0.0,
+        }
+        with self._lock:
+            self.runs += 1
+            self.deactivated_total += deactivated
+            self.last_run = run
+        return run
+
+    def stats(self):
+        with self._lock:
+            return {
+                'running': self._thread is not None and self._thread.is_alive(),
+                'runs': self.runs,
+                'errors': self.errors,
+                'deactivated_total': self.deactivated_total,
+                'last_run': self.last_run,
+            }
+
+
+expiry_sweeper = ExpirySweeper()
+
+
+@click.command('sweep-expired-jobs')
+@click.option('--batch-size', type=int, default=None, help='Jobs per transaction (default: EXPIRY_SWEEP_BATCH_SIZE)')
+@click.option('--max-batches', type=int, default=None, help='Stop after this many batches')
+@click.option('--every', type=float, default=None, help='Keep sweeping every N seconds')
+@with_appcontext
+def sweep_expired_command(batch_size, max_batches, every):
+    """Deactivate jobs whose expires_date has passed."""
+    while True:
+        run = expiry_sweeper.sweep(batch_size=batch_size, max_batches=max_batches)
+        click.echo(
+            f"{run['started_at']:%Y-%m-%d %H:%M:%S} deactivated={run['deactivated']} batches={run['batches']} "
+            f"rate={run['jobs_per_second'] or 0}/s max_lag={run['max_lag_seconds']}s "
+            f"backlog={run['backlog']} backlog_lag={run['backlog_lag_seconds']}s"
+        )
+        if not every:
+            break
+        time.sleep(every)
+
+
+# Partial index for db.create_all() setups on PostgreSQL; migrated databases
+# get it from the Alembic revision instead.
+event.listen(Job.__table__, 'after_create', DDL(PG_LIVE_INDEX_CREATE).execute_if(dialect='postgresql'))
@@ -0,0 +1,95 @@
+# backend/app/facets.py
+
+from flask import current_app
+from sqlalchemy import case, cast, func, literal, select, String, union_all
+
+from app import db
+from app.cache import TTLCache
+from app.job_changes import on_jobs_committed
+from app.models import Company, Job
+
+# Most values returned per facet (location in particular is open-ended)
+FACET_LIMIT = 20
+
+# Bands of yearly pay (salary_annual_max, in the salary_currency filtered on),
+# as (label, lower bound inclusive, upper bound exclusive)
+SALARY_BANDS = (
+    ('0-30000', 0, 30_000),
+    ('30000-60000', 30_000, 60_000),
+    ('60000-90000', 60_000, 90_000),
+    ('90000-120000', 90_000, 120_000),
+    ('120000+', 120_000, None),
+)
+
+FACET_NAMES = ('job_type', 'location', 'company', 'salary_band')
+
+facet_cache = TTLCache(ttl=30)
+on_jobs_committed(lambda changes: facet_cache.clear())
+
+
+def _salary_band(column):
+    whens = []
+    for label, low, high in SALARY_BANDS:
+        condition = column >= low if high is None else (column >= low) & (column < high)
+        whens.append((condition, label))
+    return case(*whens, else_=None)
+
+
+def _grouped(facet, filtered, key, label, limit=FACET_LIMIT, order_by_count=True):
+    count = func.count().label('count')
+    stmt = (
+        select(literal(facet).label('facet'), cast(key, String).label('value'),
+               cast(label, String).label('label'), count)
+        .select_from(filtered)
+        .where(key.isnot(None))
+        .group_by(key, label)
+    )
+    if order_by_count:
+        stmt = stmt.order_by(count.desc(), key)
+    return select(stmt.limit(limit).subquery())
+
+
+def job_facets(query, salary_bands=True):
+    """Count jobs matched by `query` per job type, location, company and salary band.
+
+    All facets (and the total) come back from a single UNION ALL statement
+    over the filtered rows, so the sidebar costs one round trip. Salary
+    bands are only counted when `salary_bands` says `query` keeps to one
+    currency; otherwise that facet is empty.
+    """
+    filtered = query.with_entities(
+        Job.id, Job.job_type, Job.location, Job.company_id, Job.salary_annual_max,
+    ).cte('filtered_jobs')
+
+    company_join = filtered.join(Company, Company.id == filtered.c.company_id)
+    groups = [
+        select(literal('total'), cast(None, String), cast(None, String), func.count()).select_from(filtered),
+        _grouped('job_type', filtered, filtered.c.job_type, filtered.c.job_type),
+        _grouped('location', filtered, filtered.c.location, filtered.c.location),
+        _grouped('company', company_join, filtered.c.company_id, Company.name),
+    ]
+    if salary_bands:
+        band = _salary_band(filtered.c.salary_annual_max)
+        groups.append(_grouped('salary_band', filtered, band, band, limit=len(SALARY_BANDS), order_by_count=False))
+    statement = union_all(*groups)
+
+    result = {'total': 0, 'facets': {name: [] for name in FACET_NAMES}}
+    for facet, value, label, count in db.session.execute(statement):
+        if facet == 'total':
+            result['total'] = count
+        else:
+            result['facets'][facet].append({'value': value, 'label': label, 'count': count})
+
+    # Bands read best in ascending order rather than by count
+    order = {label: i for i, (label, _, _) in enumerate(SALARY_BANDS)}
+    result['facets']['salary_band'].sort(key=lambda v: order[v['value']])
+    return result
+
+
+def cached_job_facets(cache_key, query, salary_bands=True):
+    """job_facets(query, salary_bands), served from facet_cache for FACET_CACHE_TTL seconds."""
+    cached = facet_cache.get(cache_key)
+    if cached is None:
+        cached = job_facets(query, salary_bands)
+        facet_cache.set(cache_key, cached, ttl=current_app.config.get('FACET_CACHE_TTL', 30))
+    return cached
@@ -0,0 +1,263 @@
+# backend/app/geo.py
+
+import csv
+import math
+import os
+import re
+import unicodedata
+from collections import namedtuple
+from functools import lru_cache
+
+import sqlalchemy as sa
+
+Place = namedtuple('Place', ['name', 'region', 'country', 'latitude', 'longitude'])
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(__file__), 'data', 'gazetteer.csv')
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Stored on jobs; 8 characters is a cell of about 38 m x 19 m
+GEOHASH_PRECISION = 8
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+# A radius query is covered by at most this many geohash cells (at the finest
+# precision that allows it), so it turns into a handful of index range scans
+MAX_COVER_CELLS = 16
+
+# Location parts that say how, not where, the job is done
+NON_PLACE_WORDS = frozenset({
+    'remote', 'fully remote', 'anywhere', 'worldwide', 'global', 'hybrid', 'on site', 'onsite',
+    'in office', 'work from home', 'wfh', 'relocation', 'multiple locations', 'various',
+})
+
+_SPLIT_RE = re.compile(r'[,;/|()\[\]]|\s-\s')
+_POINT_RE = re.compile(r'^\s*(-?\d{1,2}(?:\.\d+)?)\s*,\s*(-?\d{1,3}(?:\.\d+)?)\s*$')
+_AFFIX_RE = re.compile(r'^(?:greater|metro|downtown|central)\s+|\s+(?:area|metro|metropolitan area|city centre|region)$')
+
+
+def normalize_place(text_):
+    """Lower-case, strip accents, punctuation and digits (postcodes), collapse whitespace."""
+    text_ = unicodedata.normalize('NFKD', text_ or '')
+    text_ = ''.join(c for c in text_ if not unicodedata.combining(c)).lower()
+    text_ = re.sub(r"[.'’]", '', text_)
+    text_ = re.sub(r'[^a-z ]+', ' ', text_)
+    return ' '.join(text_.split())
+
+
+@lru_cache(maxsize=1)
+def gazetteer():
+    """(cities, area_keys) from the bundled gazetteer.
+
+    cities maps each normalized name and alias to its Places, in file order
+    (the more prominent place first). area_keys maps (country, region) and
+    (country, '') to the normalized names, codes and aliases a location may
+    use to qualify a city, e.g. {'ca', 'california'}.
+    """
+    cities, area_keys = {}, {}
+    with open(GAZETTEER_PATH, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            names = [row['name']] + [alias for alias in row['aliases'].split('|') if alias]
+            keys = {normalize_place(name) for name in names}
+            if row['kind'] == 'city':
+                place = Place(row['name'], row['region'], row['country'],
+                              float(row['latitude']), float(row['longitude']))
+                for key in keys:
+                    cities.setdefault(key, []).append(place)
+            else:
+                code = row['region'] if row['kind'] == 'region' else ''
+                keys.add((code or row['country']).lower())
+                area_keys[(row['country'], code)] = keys
+    return cities, area_keys
+
+
+def _qualifier_score(place, hints, area_keys):
+    keys = area_keys.get((place.country, ''), set()) | area_keys.get((place.country, place.region), set())
+    return len(hints & keys)
+
+
+def geocode(text_):
+    """Resolve a free-text job location such as "New York, NY" or "Hybrid - Nairobi, Kenya".
+
+    Returns the gazetteer Place of the first part naming a known city, using
+    the other parts (state, province, country) to pick between cities of
+    the same name; None for remote-only or unknown locations.
+    """
+    if not text_:
+        return None
+    cities, area_keys = gazetteer()
+    parts = [normalize_place(part) for part in _SPLIT_RE.split(text_)]
+    parts = [part for part in parts if part and part not in NON_PLACE_WORDS]
+    for i, part in enumerate(parts):
+        candidates = cities.get(part) or cities.get(_AFFIX_RE.sub('', part))
+        if candidates:
+            hints = set(parts[:i] + parts[i + 1:])
+            # max() keeps the first (most prominent) of equally qualified places
+            return max(candidates, key=lambda place: _qualifier_score(place, hints, area_keys))
+    return None
+
+
+def parse_point(text_):
+    """(latitude, longitude) from "lat,lon" text, or None."""
+    match = _POINT_RE.match(text_ or '')
+    if not match:
+        return None
+    lat, lon = float(match.group(1)), float(match.group(2))
+    if -90 <= lat <= 90 and -180 <= lon <= 180:
+        return lat, lon
+    return None
+
+
+def resolve_point(text_):
+    """(latitude, longitude) for a "lat,lon" pair or a place name, or None."""
+    point = parse_point(text_)
+    if point is None:
+        place = geocode(text_)
+        if place is not None:
+            point = (place.latitude, place.longitude)
+    return point
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km between two points given in degrees."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(1.0, a)))
+
+
+# --- Geohash ---
+
+def geohash_encode(lat, lon, precision=GEOHASH_PRECISION):
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, value, bits, use_lon = [], 0, 0, True
+    while len(chars) < precision:
+        interval, coordinate = (lon_range, lon) if use_lon else (lat_range, lat)
+        mid = (interval[0] + interval[1]) / 2
+        if coordinate >= mid:
+            value, interval[0] = value * 2 + 1, mid
+        else:
+            value, interval[1] = value * 2, mid
+        use_lon = not use_lon
+        bits += 1
+        if bits == 5:
+            chars.append(GEOHASH_ALPHABET[value])
+            value, bits = 0, 0
+    return ''.join(chars)
+
+
+def geohash_cell_size(precision):
+    """(height, width) in degrees of a geohash cell; longitude takes the odd bit."""
+    bits = 5 * precision
+    return 180.0 / 2 ** (bits // 2), 360.0 / 2 ** ((bits + 1) // 2)
+
+
+def bounding_box(lat, lon, radius_km):
+    """(lat_min, lat_max, lon_min, lon_max) enclosing the radius.
+
+    Longitudes may run past +-180 when the circle crosses the antimeridian;
+    a circle over a pole spans every longitude.
+    """
+    angle = radius_km / EARTH_RADIUS_KM
+    dlat = math.degrees(angle)
+    lat_min, lat_max = lat - dlat, lat + dlat
+    if lat_min <= -90 or lat_max >= 90 or angle >= math.pi / 2:
+        return max(lat_min, -90.0), min(lat_max, 90.0), -180.0, 180.0
+    dlon = math.degrees(math.asin(min(1.0, math.sin(angle) / math.cos(math.radians(lat)))))
+    return lat_min, lat_max, lon - dlon, lon + dlon
+
+
+def _wrap_lon(lon):
+    return (lon + 180.0) % 360.0 - 180.0
+
+
+def _next_cell(cell):
+    """The cell after `cell` in geohash order at its precision (carrying), or None after the last."""
+    while cell:
+        index = GEOHASH_ALPHABET.index(cell[-1])
+        if index + 1 < len(GEOHASH_ALPHABET):
+            return cell[:-1] + GEOHASH_ALPHABET[index + 1]
+        cell = cell[:-1]
+    return None
+
+
+def geohash_cover(lat, lon, radius_km):
+    """Geohash ranges [(start, stop)] covering the radius' bounding box.
+
+    A job lies in a range when start <= geohash < stop (stop None: no upper
+    bound); bounds are cell prefixes, so they compare the same under any
+    collation. Cells are at the finest precision that keeps the cover within
+    MAX_COVER_CELLS, with consecutive cells merged into one range.
+    """
+    lat_min, lat_max, lon_min, lon_max = bounding_box(lat, lon, radius_km)
+    precision = 1
+    for candidate in range(GEOHASH_PRECISION, 0, -1):
+        height, width = geohash_cell_size(candidate)
+        rows = int((lat_max - lat_min) / height) + 2
+        cols = int(min(lon_max - lon_min, 360.0) / width) + 2
+        if rows * cols <= MAX_COVER_CELLS:
+            precision = candidate
+            break
+    height, width = geohash_cell_size(precision)
+
+    def steps(start, stop, size):
+        values, value = [], start
+        while value < stop:
+            values.append(value)
+            value += size
+        return values + [stop]
+
+    lats = steps(lat_min, lat_max, height)
+    lons = steps(lon_min, lon_max, width)
+    cells = sorted({geohash_encode(min(y, 90.0), _wrap_lon(x), precision) for y in lats for x in lons})
+
+    ranges = []
+    for cell in cells:
+        if ranges and ranges[-1][1] == cell:
+            ranges[-1][1] = _next_cell(cell)
+        else:
+            ranges.append([cell, _next_cell(cell)])
+    return [tuple(r) for r in ranges]
+
+
+def location_columns(location):
+    """Job latitude/longitude/geohash values for a free-text location."""
+    place = geocode(location)
+    if place is None:
+        return {'latitude': None, 'longitude': None, 'geohash': None}
+    return {
+        'latitude': place.latitude,
+        'longitude': place.longitude,
+        'geohash': geohash_encode(place.latitude, place.longitude),
+    }
+
+
+def backfill_locations(executor, jobs, batch_size=1000, only_missing=True, on_batch=None):
+    """Geocode jobs.location into latitude/longitude/geohash, one id-ordered batch at a time.
+
+    `executor` is a Connection or Session and `jobs` a table with those
+    columns. Without `only_missing`, rows already geocoded are redone too
+    (e.g. after a gazetteer update). `on_batch(rows)` runs after each
+    batch's UPDATE, with the values written. Returns the rows processed.
+    """
+    update = (
+        jobs.update()
+        .where(jobs.c.id == sa.bindparam('job_id'))
+        .values(latitude=sa.bindparam('lat'), longitude=sa.bindparam('lon'), geohash=sa.bindparam('hash'))
+    )
+    last_id, total = 0, 0
+    while True:
+        query = sa.select(jobs.c.id, jobs.c.location).where(jobs.c.id > last_id, jobs.c.location.isnot(None))
+        if only_missing:
+            query = query.where(jobs.c.geohash.is_(None))
+        rows = executor.execute(query.order_by(jobs.c.id).limit(batch_size)).fetchall()
+        if not rows:
+            break
+        values = [{'id': job_id, **location_columns(location)} for job_id, location in rows]
+        executor.execute(update, [
+            {'job_id': v['id'], 'lat': v['latitude'], 'lon': v['longitude'], 'hash': v['geohash']} for v in values
+        ])
+        if on_batch is not None:
+            on_batch(values)
+        total += len(rows)
+        last_id = rows[-1][0]
+    return total
@@ -0,0 +1,65 @@
+# backend/app/job_changes.py
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models import Job
+
+# Key under which pending changes are parked in Session.info until commit
+PENDING_KEY = 'pending_job_changes'
+
+_listeners = []
+
+
+def on_jobs_committed(listener):
+    """Register `listener(changes)` to run after every commit touching jobs.
+
+    `changes` is a list of (op, values) tuples where op is 'insert', 'update'
+    or 'delete' and values is a dict of the job's loaded column values
+    ('id' is always present). Listeners run after the transaction is durable
+    and must not use the session; they exist to keep in-process indexes and
+    caches in step with the database.
+    """
+    _listeners.append(listener)
+    return listener
+
+
+def record_job_changes(session, op, rows):
+    """Queue changes made outside the ORM unit of work (bulk INSERT/UPDATE)."""
+    session.info.setdefault(PENDING_KEY, []).extend((op, dict(values)) for values in rows)
+
+
+def _snapshot(mapper, target):
+    # Only already-loaded values: touching a deferred column here would emit
+    # a SELECT in the middle of the flush.
+    state = target.__dict__
+    return {attr.key: state[attr.key] for attr in mapper.column_attrs if attr.key in state}
+
+
+@event.listens_for(Job, 'after_insert')
+def _job_inserted(mapper, connection, target):
+    record_job_changes(Session.object_session(target), 'insert', [_snapshot(mapper, target)])
+
+
+@event.listens_for(Job, 'after_update')
+def _job_updated(mapper, connection, target):
+    record_job_changes(Session.object_session(target), 'update', [_snapshot(mapper, target)])
+
+
+@event.listens_for(Job, 'after_delete')
+def _job_deleted(mapper, connection, target):
+    record_job_changes(Session.object_session(target), 'delete', [_snapshot(mapper, target)])
+
+
+@event.listens_for(Session, 'after_commit')
+def _dispatch(session):
+    changes = session.info.pop(PENDING_KEY, None)
+    if not changes:
+        return
+    for listener in _listeners:
+        listener(changes)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard(session):
+    session.info.pop(PENDING_KEY, None)
@@ -0,0 +1,223 @@
+# backend/app/job_stats.py
+
+import atexit
+import math
+import threading
+import time
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import func, select, true
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app import db
+from app.models import Job, JobStat
+
+# Trend keys are log(decayed views) + rate * (seconds since this epoch): the
+# decay every count shares is factored out, so keys can be compared (and
+# indexed) without touching rows that were not viewed
+TREND_EPOCH = datetime(2025, 1, 1)
+
+# Jobs kept in the precomputed trending list; /jobs/trending serves at most this many
+TRENDING_POOL_SIZE = 100
+
+
+def decay_rate():
+    """Decay per second for TRENDING_HALF_LIFE_HOURS."""
+    return math.log(2) / (current_app.config.get('TRENDING_HALF_LIFE_HOURS', 24.0) * 3600)
+
+
+def trend_key(views, now, rate):
+    return math.log(views) + rate * (now - TREND_EPOCH).total_seconds()
+
+
+def trend_score(key, now, rate):
+    """Decayed view count at `now` for a stored trend key."""
+    return math.exp(key - rate * (now - TREND_EPOCH).total_seconds())
+
+
+def _upsert(dialect_name):
+    # Adding counts in log space: log(e^a + e^b) = max(a, b) + log(1 + e^-|a - b|).
+    # Done in SQL so workers flushing the same job concurrently cannot lose views.
+    module = postgresql if dialect_name == 'postgresql' else sqlite
+    greatest = func.greatest if dialect_name == 'postgresql' else func.max
+    statement = module.insert(JobStat.__table__)
+    stored, added = JobStat.__table__.c.trend_key, statement.excluded.trend_key
+    return statement.on_conflict_do_update(
+        index_elements=['job_id'],
+        set_={
+            'views': JobStat.__table__.c.views + statement.excluded.views,
+            'trend_key': greatest(stored, added) + func.ln(1 + func.exp(-func.abs(stored - added))),
+            'last_viewed_at': statement.excluded.last_viewed_at,
+        },
+    )
+
+
+def trending_query(limit=TRENDING_POOL_SIZE):
+    """(job id, trend key) of the `limit` active jobs with the highest keys."""
+    # EXISTS rather than a join: the planner then walks ix_job_stats_trend_key
+    # from the top, checking each job by primary key, and stops at `limit`
+    active = select(Job.id).where(Job.id == JobStat.job_id, Job.is_active == true()).exists()
+    return (
+        select(JobStat.job_id, JobStat.trend_key)
+        .where(active)
+        .order_by(JobStat.trend_key.desc(), JobStat.job_id.desc())
+        .limit(limit)
+    )
+
+
+class ViewCounter:
+    """Per-worker buffer of job detail views, written to job_stats in batches.
+
+    record() only bumps a dict entry under a lock. Every
+    JOB_VIEWS_FLUSH_INTERVAL seconds a background thread (started on the
+    first request) swaps the dict out and upserts all its counts in one
+    executemany; with an interval of 0 each view is written at once. Views
+    still buffered when a worker dies uncleanly are lost.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._deltas = {}
+        self._thread = None
+        self._stop = threading.Event()
+        self.flushes = 0
+        self.errors = 0
+        self.flushed_views = 0
+        self.last_flush_at = None
+
+    def init_app(self, app):
+        if app.config.get('JOB_VIEWS_FLUSH_INTERVAL', 10) > 0:
+            app.before_request(lambda: self.start(app))
+
+    def start(self, app):
+        """Start the background flush thread if it is not running yet."""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, args=(app,), name='job-views', daemon=True)
+                self._thread.start()
+                atexit.register(self._flush_at_exit, app)
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self, app):
+        interval = app.config['JOB_VIEWS_FLUSH_INTERVAL']
+        while not self._stop.wait(interval):
+            with app.app_context():
+                try:
+                    self.flush()
+                    trending_jobs.refresh_if_stale()
+                except Exception:
+                    db.session.rollback()
+                    self.errors += 1
+                    app.logger.exception('Job view flush failed')
+
+    def _flush_at_exit(self, app):
+        with app.app_context():
+            try:
+                self.flush()
+            except Exception:
+                app.logger.exception('Job view flush at exit failed')
+
+    def record(self, job_id):
+        with self._lock:
+            self._deltas[job_id] = self._deltas.get(job_id, 0) + 1
+        if current_app.config.get('JOB_VIEWS_FLUSH_INTERVAL', 10) <= 0:
+            self.flush()
+
+    def pending(self, job_id):
+        """Views of `job_id` recorded in this worker but not flushed yet."""
+        with self._lock:
+            return self._deltas.get(job_id, 0)
+
+    def flush(self):
+        """Write the buffered counts in one transaction; returns the views written."""
+        with self._lock:
+            deltas, self._deltas = self._deltas, {}
+        if not deltas:
+            return 0
+        try:
+            written = self._write(deltas)
+        except Exception:
+            # Put the counts back so the next flush retries them
+            with self._lock:
+                for job_id, count in deltas.items():
+                    self._deltas[job_id] = self._deltas.get(job_id, 0) + count
+            raise
+        self.flushes += 1
+        self.flushed_views += written
+        self.last_flush_at = datetime.utcnow()
+        return written
+
+    def _write(self, deltas):
+        # Jobs deleted since they were viewed have nothing to count against
+        existing = db.session.execute(select(Job.id).where(Job.id.in_(deltas))).scalars().all()
+        if not existing:
+            db.session.commit()
+            return 0
+        now, rate = datetime.utcnow(), decay_rate()
+        rows = [
+            {'job_id': job_id, 'views': deltas[job_id], 'trend_key': trend_key(deltas[job_id], now, rate),
+             'last_viewed_at': now}
+            for job_id in sorted(existing)   # fixed order, so concurrent flushes cannot deadlock
+        ]
+        db.session.execute(_upsert(db.session.get_bind().dialect.name), rows)
+        db.session.commit()
+        return sum(row['views'] for row in rows)
+
+    def stats(self):
+        with self._lock:
+            buffered_jobs, buffered_views = len(self._deltas), sum(self._deltas.values())
+        return {
+            'running': self._thread is not None and self._thread.is_alive(),
+            'flushes': self.flushes,
+            'errors': self.errors,
+            'flushed_views': self.flushed_views,
+            'buffered_jobs': buffered_jobs,
+            'buffered_views': buffered_views,
+            'last_flush_at': self.last_flush_at,
+        }
+
+
+class TrendingJobs:
+    """The TRENDING_POOL_SIZE active jobs with the highest decayed view counts.
+
+    Read from ix_job_stats_trend_key and kept in memory for
+    TRENDING_REFRESH_INTERVAL seconds, so requests only slice a list. Keys
+    rank the same at any moment, so scores are decayed to the time of
+    each read.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._top = []   # [(job id, trend key)], best first
+        self._refreshed_at = 0.0
+
+    def refresh(self):
+        rows = db.session.execute(trending_query()).all()
+        with self._lock:
+            self._top = [tuple(row) for row in rows]
+            self._refreshed_at = time.time()
+
+    def refresh_if_stale(self):
+        if time.time() - self._refreshed_at >= current_app.config.get('TRENDING_REFRESH_INTERVAL', 60):
+            self.refresh()
+
+    def invalidate(self):
+        with self._lock:
+            self._refreshed_at = 0.0
+
+    def top(self, n):
+        """[(job id, decayed views)] of the `n` trending jobs, best first."""
+        self.refresh_if_stale()
+        with self._lock:
+            top = self._top[:n]
+        now, rate = datetime.utcnow(), decay_rate()
+        return [(job_id, trend_score(key, now, rate)) for job_id, key in top]
+
+
+job_views = ViewCounter()
+trending_jobs = TrendingJobs()
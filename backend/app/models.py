@@ -1,6 +1,9 @@
 from app import db  # Import the db instance from the app package
 from datetime import datetime
 from sqlalchemy.ext.hybrid import hybrid_property  # For hybrid properties
+from sqlalchemy.orm import query_expression, validates  # For per-query computed attributes and field hooks
+from app.salary import salary_columns  # Structured salary parsing
+from app.geo import location_columns  # Offline geocoding of job locations
 from app import bcrypt  # For password hashing
 
 class User(db.Model):
@@ -37,6 +40,9 @@ class User(db.Model):
 
 class Company(db.Model):
     __tablename__ = 'company'  # Explicitly define table name
+    __table_args__ = (
+        db.Index('ix_company_owner_id', 'owner_id'),  # User.companies
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(120), nullable=False)  # Removed unique=True
@@ -55,13 +61,36 @@ class Company(db.Model):
 
 class Job(db.Model):
     __tablename__ = 'jobs'  # Explicitly define table name
+    __table_args__ = (
+        # Composite indexes backing the keyset sort orders of GET /api/jobs
+        db.Index('ix_jobs_active_date_posted_id', 'is_active', 'date_posted', 'id'),
+        db.Index('ix_jobs_active_currency_annual_max_id', 'is_active', 'salary_currency', 'salary_annual_max', 'id'),
+        db.Index('ix_jobs_active_currency_annual_min', 'is_active', 'salary_currency', 'salary_annual_min'),
+        db.Index('ix_jobs_active_title_id', 'is_active', 'title', 'id'),
+        # Finds expired live jobs for the expiry sweeper (app/expiry.py)
+        db.Index('ix_jobs_active_expires_date', 'is_active', 'expires_date'),
+        # recruiter_id / company_id filters, already in GET /api/jobs' default order
+        db.Index('ix_jobs_recruiter_id_date_posted_id', 'recruiter_id', 'date_posted', 'id'),
+        db.Index('ix_jobs_company_id_date_posted_id', 'company_id', 'date_posted', 'id'),
+        # near= radius search: geohash range scans, with the bounding box checked in the index
+        db.Index('ix_jobs_active_geohash', 'is_active', 'geohash', 'latitude', 'longitude'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(512), nullable=False)
     description = db.Column(db.Text, nullable=False)
     requirements = db.Column(db.Text)
     location = db.Column(db.String(120))
+    latitude = db.Column(db.Float)  # Geocoded from location against the bundled gazetteer
+    longitude = db.Column(db.Float)
+    geohash = db.Column(db.String(12))  # Of (latitude, longitude), for radius search
     salary = db.Column(db.String(80))  # Changed to String to allow ranges/text
+    salary_min = db.Column(db.Integer)  # Parsed from salary, whole currency units
+    salary_max = db.Column(db.Integer)  # Parsed from salary; equals salary_min for a single figure
+    salary_currency = db.Column(db.String(3))  # ISO 4217 code, e.g. USD, KES
+    salary_period = db.Column(db.String(10))  # hour, day, week, month or year
+    salary_annual_min = db.Column(db.BigInteger)  # salary_min as yearly pay, still in salary_currency
+    salary_annual_max = db.Column(db.BigInteger)  # salary_max as yearly pay; filtered, sorted and banded on
     job_type = db.Column(db.String(50))  # e.g., Full-time, Part-time, Contract
     date_posted = db.Column(db.DateTime, default=datetime.utcnow)
     expires_date = db.Column(db.DateTime)
@@ -70,28 +99,130 @@ class Job(db.Model):
 
     recruiter_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     company_id = db.Column(db.Integer, db.ForeignKey('company.id'), nullable=True)
+    # Active job of the same company this posting nearly duplicates when it was created (see app/duplicates.py)
+    duplicate_of_id = db.Column(db.Integer, db.ForeignKey('jobs.id', name='fk_jobs_duplicate_of_id', ondelete='SET NULL'), nullable=True)
+
+    # Relevance score, only populated by keyword searches (see app/search.py)
+    search_rank = query_expression()
+    # Distance in km from the near= point, only populated by radius searches (see app/proximity.py)
+    distance_km = query_expression()
 
     # Relationships
     applications = db.relationship('Application', backref='job', lazy=True)
 
+    @validates('salary')
+    def _parse_salary(self, key, value):
+        """Keep the structured salary columns in step with the free-text salary."""
+        for column, parsed in salary_columns(value).items():
+            setattr(self, column, parsed)
+        return value
+
+    @validates('location')
+    def _geocode_location(self, key, value):
+        """Keep latitude, longitude and geohash in step with the free-text location."""
+        for column, geocoded in location_columns(value).items():
+            setattr(self, column, geocoded)
+        return value
+
     def __repr__(self):
         return f'<Job {self.title}>'
 
 class Application(db.Model):
     __tablename__ = 'applications'
+    __table_args__ = (
+        # One application per user and job; also serves the per-user listing
+        db.Index('uq_applications_user_id_job_id', 'user_id', 'job_id', unique=True),
+        # A job's applicants newest first, all of them or by status (/jobs/<id>/applications)
+        db.Index('ix_applications_job_id_date_id', 'job_id', 'application_date', 'id'),
+        db.Index('ix_applications_job_id_status_date_id', 'job_id', 'status', 'application_date', 'id'),
+        # Who may download a resume: recruiters of the jobs it was sent to
+        db.Index('ix_applications_resume_blob_id', 'resume_blob_id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    job_id = db.Column(db.Integer, db.ForeignKey('jobs.id'), nullable=False)
-    application_date = db.Column(db.DateTime, default=datetime.utcnow)
-    status = db.Column(db.String(50), default='pending')  # e.g., 'pending', 'reviewed', 'accepted', 'rejected'
+    # active_history: the counters in app/application_stats.py need the value
+    # a change replaces, even when the attribute was expired by a commit
+    job_id = db.column_property(db.Column(db.Integer, db.ForeignKey('jobs.id'), nullable=False), active_history=True)
+    application_date = db.column_property(db.Column(db.DateTime, default=datetime.utcnow), active_history=True)
+    status = db.column_property(db.Column(db.String(50), default='pending'), active_history=True)  # e.g., 'pending', 'reviewed', 'accepted', 'rejected'
     resume_url = db.Column(db.String(512))  # URL to resume
     cover_letter_text = db.Column(db.Text)  # Optional cover letter text
+    reviewed_at = db.column_property(db.Column(db.DateTime), active_history=True)  # When the status first left 'pending' (time to first review)
+    resume_blob_id = db.Column(db.String(64), db.ForeignKey('resume_blobs.id', name='fk_applications_resume_blob_id'))  # Uploaded resume (app/resume_store.py)
+    resume_text = db.Column(db.Text)  # The resume's extracted text, for candidate search (app/candidate_search.py)
+
+    # Relevance of a candidate search match, set via with_expression()
+    search_rank = query_expression()
+
+    @validates('status')
+    def _mark_reviewed(self, key, value):
+        """Stamp reviewed_at the first time the application leaves 'pending'."""
+        if value not in (None, 'pending') and self.reviewed_at is None:
+            self.reviewed_at = datetime.utcnow()
+        return value
 
     def __repr__(self):
         return f'<Application {self.id} by User {self.user_id} for Job {self.job_id}>'
     
+class ResumeBlob(db.Model):
+    """A stored resume file, named by the SHA-256 of its content (see app/resume_store.py)."""
+    __tablename__ = 'resume_blobs'
+
+    id = db.Column(db.String(64), primary_key=True)  # Hex SHA-256 digest
+    size = db.Column(db.Integer, nullable=False)
+    content_type = db.Column(db.String(100), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    text = db.Column(db.Text)  # Extracted by app/candidate_search.py; None until then
+    extracted_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f'<ResumeBlob {self.id[:12]} {self.size} bytes>'
+
+class ResumeExtraction(db.Model):
+    """Queue of resume blobs waiting for text extraction, worked by app/candidate_search.py."""
+    __tablename__ = 'resume_extractions'
+    __table_args__ = (
+        # The next batch to claim: oldest queued (or abandoned running) jobs first
+        db.Index('ix_resume_extractions_status_id', 'status', 'id'),
+        db.Index('uq_resume_extractions_blob_id', 'blob_id', unique=True),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    blob_id = db.Column(db.String(64), db.ForeignKey('resume_blobs.id', ondelete='CASCADE'), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='queued')  # 'queued', 'running', 'done' or 'failed'
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)  # When the current or last attempt was claimed
+    finished_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f'<ResumeExtraction {self.blob_id[:12]} {self.status}>'
+
+class ResumeUpload(db.Model):
+    """A user's upload of a resume; identical files from one or more users share one blob."""
+    __tablename__ = 'resume_uploads'
+    __table_args__ = (
+        db.Index('uq_resume_uploads_user_id_blob_id', 'user_id', 'blob_id', unique=True),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    blob_id = db.Column(db.String(64), db.ForeignKey('resume_blobs.id'), nullable=False)
+    filename = db.Column(db.String(255))  # As uploaded, offered again on download
+    uploaded_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    blob = db.relationship('ResumeBlob', lazy='joined')
+
+    def __repr__(self):
+        return f'<ResumeUpload {self.blob_id[:12]} by User {self.user_id}>'
+
 class SavedJob(db.Model):
     __tablename__ = 'saved_jobs'
+    __table_args__ = (
+        db.Index('uq_saved_jobs_user_id_job_id', 'user_id', 'job_id', unique=True),
+        db.Index('ix_saved_jobs_job_id', 'job_id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -111,4 +242,81 @@ class SavedJob(db.Model):
         }
 
     def __repr__(self):
-        return f'<SavedJob User={self.user_id} Job={self.job_id}>'
\ No newline at end of file
+        return f'<SavedJob User={self.user_id} Job={self.job_id}>'
+
+class JobStat(db.Model):
+    __tablename__ = 'job_stats'
+    __table_args__ = (
+        db.Index('ix_job_stats_trend_key', 'trend_key', 'job_id'),  # /jobs/trending reads it highest first
+    )
+
+    job_id = db.Column(db.Integer, db.ForeignKey('jobs.id', ondelete='CASCADE'), primary_key=True)
+    views = db.Column(db.Integer, nullable=False, default=0)  # All-time detail views
+    # Log of the exponentially decayed view count, scaled to a fixed epoch so keys
+    # compare without decaying every row (see app/job_stats.py)
+    trend_key = db.Column(db.Float, nullable=False)
+    last_viewed_at = db.Column(db.DateTime)  # Time of the last flush that counted a view
+
+    def __repr__(self):
+        return f'<JobStat job={self.job_id} views={self.views}>'
+
+class ApplicationCounts:
+    """Counter columns shared by the per-job and per-company application stats
+    (kept current by app/application_stats.py)."""
+    applications = db.Column(db.Integer, nullable=False, default=0)
+    pending = db.Column(db.Integer, nullable=False, default=0)
+    reviewed = db.Column(db.Integer, nullable=False, default=0)
+    accepted = db.Column(db.Integer, nullable=False, default=0)
+    rejected = db.Column(db.Integer, nullable=False, default=0)
+    first_reviews = db.Column(db.Integer, nullable=False, default=0)  # Applications with a reviewed_at
+    review_seconds = db.Column(db.Float, nullable=False, default=0.0)  # Their summed time to first review
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class JobApplicationStat(ApplicationCounts, db.Model):
+    __tablename__ = 'job_application_stats'
+
+    job_id = db.Column(db.Integer, db.ForeignKey('jobs.id', ondelete='CASCADE'), primary_key=True)
+
+    def __repr__(self):
+        return f'<JobApplicationStat job={self.job_id} applications={self.applications}>'
+
+class CompanyApplicationStat(ApplicationCounts, db.Model):
+    __tablename__ = 'company_application_stats'
+
+    company_id = db.Column(db.Integer, db.ForeignKey('company.id', ondelete='CASCADE'), primary_key=True)
+
+    def __repr__(self):
+        return f'<CompanyApplicationStat company={self.company_id} applications={self.applications}>'
+
+class ApplicationEvent(db.Model):
+    """Outbox row written in the same transaction as an application change,
+    delivered to notification handlers later by app/outbox.py."""
+    __tablename__ = 'application_events'
+    __table_args__ = (
+        # The dispatcher reads undelivered events oldest first
+        db.Index('ix_application_events_dispatched_at_id', 'dispatched_at', 'id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    application_id = db.Column(db.Integer, db.ForeignKey('applications.id', ondelete='CASCADE'), nullable=False)
+    user_id = db.Column(db.Integer, nullable=False)  # The applicant, copied so delivery needs no join
+    job_id = db.Column(db.Integer, nullable=False)
+    event = db.Column(db.String(50), nullable=False)  # e.g. 'status_changed'
+    status = db.Column(db.String(50))  # Status the application moved to
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    dispatched_at = db.Column(db.DateTime)  # Null until delivered (or given up on)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text)
+
+    def __repr__(self):
+        return f'<ApplicationEvent {self.id} {self.event} application={self.application_id}>'
+
+class TableVersion(db.Model):
+    __tablename__ = 'table_versions'
+
+    table_name = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)  # Bumped in every transaction that writes the table
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)  # Time of the last bump
+
+    def __repr__(self):
+        return f'<TableVersion {self.table_name}={self.version}>'
@@ -0,0 +1,199 @@
+# backend/app/outbox.py
+
+import threading
+import time
+from datetime import datetime
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import case, func, insert, select, update
+
+from app import db
+from app.models import ApplicationEvent
+
+# Columns handed to handlers for each event
+EVENT_COLUMNS = ('id', 'application_id', 'user_id', 'job_id', 'event', 'status', 'created_at', 'attempts')
+
+_handlers = []
+
+
+def on_application_events(handler):
+    """Register `handler(events)` to receive each batch of undelivered events.
+
+    `events` is a list of dicts with EVENT_COLUMNS. A handler that raises
+    fails the whole batch, which is retried on the next run, so handlers
+    must cope with seeing an event more than once.
+    """
+    _handlers.append(handler)
+    return handler
+
+
+def record_application_events(session, event, rows):
+    """Write one outbox row per application in `rows` (dicts with id, user_id,
+    job_id and status) as part of the session's transaction; the caller commits."""
+    if not rows:
+        return
+    now = datetime.utcnow()
+    session.execute(insert(ApplicationEvent), [
+        {'application_id': row['id'], 'user_id': row['user_id'], 'job_id': row['job_id'],
+         'event': event, 'status': row['status'], 'created_at': now, 'attempts': 0}
+        for row in rows
+    ])
+
+
+@on_application_events
+def log_application_events(events):
+    """Stand-in notification channel: one log line per event."""
+    for event in events:
+        current_app.logger.info('Notify user %s: application %s for job %s %s (%s)', event['user_id'],
+                                event['application_id'], event['job_id'], event['event'], event['status'])
+
+
+class OutboxDispatcher:
+    """Delivers application_events rows to the registered handlers.
+
+    Each batch of at most OUTBOX_BATCH_SIZE undelivered events, oldest
+    first, is claimed, handed to every handler and marked delivered in one
+    transaction; on PostgreSQL the claim is FOR UPDATE SKIP LOCKED, so
+    workers never deliver the same batch concurrently. A failed batch is
+    retried on the next run, and events that failed OUTBOX_MAX_ATTEMPTS
+    times are set aside with their last error. Runs from a background
+    thread every OUTBOX_DISPATCH_INTERVAL seconds (sooner when notify() is
+    called) or from `flask dispatch-outbox`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self.batches = 0
+        self.delivered = 0
+        self.failed_batches = 0
+        self.errors = 0
+        self.last_run_at = None
+
+    def init_app(self, app):
+        if app.config.get('OUTBOX_DISPATCH_INTERVAL', 5) > 0:
+            app.before_request(lambda: self.start(app))
+
+    def start(self, app):
+        """Start the background dispatcher thread if it is not running yet."""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, args=(app,), name='outbox-dispatcher', daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def notify(self):
+        """Have the thread (if any) drain now rather than at its next interval."""
+        self._wake.set()
+
+    def _run(self, app):
+        interval = app.config['OUTBOX_DISPATCH_INTERVAL']
+        while not self._stop.is_set():
+            self._wake.wait(interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            with app.app_context():
+                try:
+                    self.drain()
+                except Exception:
+                    db.session.rollback()
+                    self.errors += 1
+                    app.logger.exception('Outbox dispatch failed')
+
+    def drain(self, batch_size=None, max_batches=None):
+        """Deliver batches until the outbox is empty or a batch fails; returns the events delivered."""
+        batch_size = batch_size or current_app.config.get('OUTBOX_BATCH_SIZE', 100)
+        delivered, batches = 0, 0
+        while max_batches is None or batches < max_batches:
+            events = db.session.execute(
+                select(*(getattr(ApplicationEvent, column) for column in EVENT_COLUMNS))
+                .where(ApplicationEvent.dispatched_at.is_(None))
+                .order_by(ApplicationEvent.id)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            ).mappings().all()
+            if not events:
+                db.session.commit()
+                break
+            events = [dict(event) for event in events]
+            ids = [event['id'] for event in events]
+            batches += 1
+            try:
+                for handler in _handlers:
+                    handler(events)
+            except Exception as e:
+                self._failed(ids, e)
+                break
+            db.session.execute(
+                update(ApplicationEvent).where(ApplicationEvent.id.in_(ids))
+                .values(dispatched_at=datetime.utcnow(), attempts=ApplicationEvent.attempts + 1, last_error=None),
+                execution_options={'synchronize_session': False},
+            )
+            db.session.commit()
+            delivered += len(events)
+            if len(events) < batch_size:
+                break
+        with self._lock:
+            self.batches += batches
+            self.delivered += delivered
+            self.last_run_at = datetime.utcnow()
+        return delivered
+
+    def _failed(self, ids, error):
+        # Count the attempt; events out of attempts leave the queue with their error
+        max_attempts = current_app.config.get('OUTBOX_MAX_ATTEMPTS', 5)
+        current_app.logger.exception('Delivering %d application events failed', len(ids))
+        db.session.execute(
+            update(ApplicationEvent).where(ApplicationEvent.id.in_(ids)).values(
+                attempts=ApplicationEvent.attempts + 1,
+                last_error=str(error)[:1000],
+                dispatched_at=case((ApplicationEvent.attempts + 1 >= max_attempts, datetime.utcnow()), else_=None),
+            ),
+            execution_options={'synchronize_session': False},
+        )
+        db.session.commit()
+        with self._lock:
+            self.failed_batches += 1
+
+    def stats(self):
+        pending = db.session.execute(
+            select(func.count(ApplicationEvent.id)).where(ApplicationEvent.dispatched_at.is_(None))
+        ).scalar()
+        with self._lock:
+            return {
+                'running': self._thread is not None and self._thread.is_alive(),
+                'batches': self.batches,
+                'delivered': self.delivered,
+                'failed_batches': self.failed_batches,
+                'errors': self.errors,
+                'pending': pending,
+                'last_run_at': self.last_run_at,
+            }
+
+
+outbox_dispatcher = OutboxDispatcher()
+
+
+@click.command('dispatch-outbox')
+@click.option('--batch-size', type=int, default=None, help='Events per transaction (default: OUTBOX_BATCH_SIZE)')
+@click.option('--max-batches', type=int, default=None, help='Stop after this many batches')
+@click.option('--every', type=float, default=None, help='Keep dispatching every N seconds')
+@with_appcontext
+def dispatch_outbox_command(batch_size, max_batches, every):
+    """Deliver pending application events to the notification handlers."""
+    while True:
+        delivered = outbox_dispatcher.drain(batch_size=batch_size, max_batches=max_batches)
+        click.echo(f"{datetime.utcnow():%Y-%m-%d %H:%M:%S} delivered={delivered}")
+        if not every:
+            break
+        time.sleep(every)
@@ -0,0 +1,118 @@
+# backend/app/pagination.py
+
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Dialects whose B-tree indexes sort NULL after every other value.
+# Everything else (SQLite, MySQL) sorts NULL first.
+NULLS_HIGH_DIALECTS = ('postgresql', 'oracle')
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client sends a cursor we did not issue."""
+
+
+class KeysetOrder:
+    """A sort order that can be paged with keyset predicates instead of OFFSET.
+
+    `column` is the (possibly nullable) sort column and `tiebreaker` a unique
+    column (normally the primary key) that makes the order total. For
+    computed sort expressions, `attribute` names where the value can be read
+    back off a result row.
+    """
+
+    def __init__(self, name, column, tiebreaker, descending=False, value_type=None, attribute=None):
+        self.name = name
+        self.column = column
+        self.tiebreaker = tiebreaker
+        self.descending = descending
+        self.value_type = value_type
+        self.attribute = attribute or column.key
+
+    def order_by(self):
+        if self.descending:
+            return [self.column.desc(), self.tiebreaker.desc()]
+        return [self.column.asc(), self.tiebreaker.asc()]
+
+    def _beyond(self, column, value):
+        return column < value if self.descending else column > value
+
+    def after(self, value, tie, dialect_name):
+        """Build the WHERE clause selecting rows strictly after (value, tie)."""
+        # Native NULL placement is kept so the ORDER BY can walk an index.
+        nulls_high = dialect_name in NULLS_HIGH_DIALECTS
+        nulls_trail = nulls_high != self.descending
+
+        if value is None:
+            clause = and_(self.column.is_(None), self._beyond(self.tiebreaker, tie))
+            if not nulls_trail:
+                clause = or_(clause, self.column.isnot(None))
+            return clause
+
+        clause = or_(
+            self._beyond(self.column, value),
+            and_(self.column == value, self._beyond(self.tiebreaker, tie)),
+        )
+        if nulls_trail:
+            clause = or_(clause, self.column.is_(None))
+        return clause
+
+    def encode(self, row):
+        """Return the opaque cursor pointing just past `row`."""
+        value = getattr(row, self.attribute)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        tie = getattr(row, self.tiebreaker.key)
+        payload = json.dumps({'s': self.name, 'v': value, 'k': tie}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+    def decode(self, cursor):
+        """Return the (value, tie) pair stored in `cursor`."""
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            if payload['s'] != self.name:
+                raise InvalidCursor("Cursor was issued for a different sort order.")
+            value = payload['v']
+            if value is not None and self.value_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif value is not None and self.value_type is not None:
+                value = self.value_type(value)
+            return value, payload['k']
+        except InvalidCursor:
+            raise
+        except (binascii.Error, UnicodeError, ValueError, TypeError, KeyError) as e:
+            raise InvalidCursor(f"Malformed cursor: {e}")
+
+
+def clamp_page_size(limit):
+    """Clamp a client-supplied page size to [1, MAX_PAGE_SIZE]."""
+    if limit is None:
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def paginate(query, order, limit, cursor=None):
+    """Fetch one keyset page of `query`.
+
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    Raises InvalidCursor if `cursor` cannot be decoded for `order`.
+    """
+    limit = clamp_page_size(limit)
+    if cursor:
+        value, tie = order.decode(cursor)
+        dialect_name = query.session.get_bind().dialect.name
+        query = query.filter(order.after(value, tie, dialect_name))
+
+    rows = query.order_by(*order.order_by()).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, order.encode(rows[-1])
@@ -0,0 +1,99 @@
+# backend/app/proximity.py
+
+import math
+import sqlite3
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import and_, event, func, literal, or_
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import with_expression
+
+from app import db
+from app.geo import EARTH_RADIUS_KM, backfill_locations, bounding_box, geohash_cover
+from app.job_changes import record_job_changes
+from app.models import Job
+from app.pagination import KeysetOrder
+
+DEFAULT_RADIUS_KM = 25.0
+MAX_RADIUS_KM = 1000.0
+
+
+def distance_km(lat, lon, dialect_name):
+    """SQL haversine distance in km from (lat, lon) to each job's coordinates."""
+    phi = func.radians(Job.latitude)
+    phi0 = math.radians(lat)
+    a = (func.power(func.sin((phi - literal(phi0)) * 0.5), 2)
+         + literal(math.cos(phi0)) * func.cos(phi)
+         * func.power(func.sin((func.radians(Job.longitude) - literal(math.radians(lon))) * 0.5), 2))
+    # Rounding can push a a hair above 1 for antipodal points, outside asin's domain
+    clamp = func.least if dialect_name == 'postgresql' else func.min
+    return literal(2 * EARTH_RADIUS_KM) * func.asin(func.sqrt(clamp(literal(1.0), a)))
+
+
+def filter_near(query, lat, lon, radius_km, is_active=None):
+    """Restrict a Job query to jobs within `radius_km` of (lat, lon).
+
+    Returns (query, order) where `order` is a KeysetOrder on the distance;
+    load it with `with_distance`. Geohash ranges and the bounding box are
+    answered from ix_jobs_active_geohash; only the rows left are checked
+    with the exact haversine distance. Pass the query's `is_active` filter
+    so every range can seek on the index's leading column.
+    """
+    dialect_name = db.session.get_bind().dialect.name
+    distance = distance_km(lat, lon, dialect_name)
+    lat_min, lat_max, lon_min, lon_max = bounding_box(lat, lon, radius_km)
+    cells = []
+    for start, stop in geohash_cover(lat, lon, radius_km):
+        cell = [Job.geohash >= start] + ([Job.geohash < stop] if stop is not None else [])
+        # Inside each arm rather than once outside: SQLite only turns the OR
+        # into index range scans when every arm constrains the leading column
+        if is_active is not None:
+            cell.insert(0, Job.is_active == is_active)
+        cells.append(and_(*cell))
+    clauses = [or_(*cells), Job.latitude.between(lat_min, lat_max)]
+    # Past the antimeridian the box wraps around; the geohash cells still bound it
+    if lon_min >= -180 and lon_max <= 180:
+        clauses.append(Job.longitude.between(lon_min, lon_max))
+    query = query.filter(*clauses, distance <= radius_km)
+    order = KeysetOrder('distance', distance, Job.id, value_type=float, attribute='distance_km')
+    return query, order
+
+
+def with_distance(query, order):
+    """Populate Job.distance_km from a distance order returned by filter_near."""
+    return query.options(with_expression(Job.distance_km, order.column))
+
+
+@event.listens_for(Engine, 'connect')
+def _sqlite_math_functions(dbapi_connection, connection_record):
+    # SQLite only has sin(), radians() etc. when built with math functions
+    # (the default since 3.35); register Python ones where they are missing.
+    # ln() and exp() are for the trend keys in app/job_stats.py.
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    try:
+        dbapi_connection.execute('SELECT radians(sin(0)) + ln(exp(0))')
+    except sqlite3.OperationalError:
+        for name, nargs, func_ in (('radians', 1, math.radians), ('sin', 1, math.sin), ('cos', 1, math.cos),
+                                   ('asin', 1, math.asin), ('sqrt', 1, math.sqrt), ('power', 2, math.pow),
+                                   ('ln', 1, math.log), ('exp', 1, math.exp)):
+            dbapi_connection.create_function(
+                name, nargs, lambda *args, f=func_: None if None in args else f(*args), deterministic=True,
+            )
+
+
+@click.command('geocode-jobs')
+@click.option('--batch-size', type=int, default=1000, show_default=True, help='Jobs per transaction')
+@click.option('--all', 'redo_all', is_flag=True, help='Re-geocode every job, e.g. after a gazetteer update')
+@with_appcontext
+def geocode_jobs_command(batch_size, redo_all):
+    """Fill in latitude/longitude/geohash for jobs from their location text."""
+    def commit(rows):
+        record_job_changes(db.session, 'update', rows)
+        db.session.commit()
+
+    total = backfill_locations(db.session, Job.__table__, batch_size=batch_size,
+                               only_missing=not redo_all, on_batch=commit)
+    located = db.session.query(func.count(Job.id)).filter(Job.geohash.isnot(None)).scalar()
+    click.echo(f'Geocoded {total} job(s); {located} job(s) have coordinates.')
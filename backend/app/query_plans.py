@@ -0,0 +1,184 @@
+# backend/app/query_plans.py
+
+import re
+import sys
+from datetime import datetime
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import text
+
+from app import db
+from app.models import Application, ApplicationEvent, Company, Job, ResumeExtraction, ResumeUpload, SavedJob
+
+# Tables on which a full scan or an unindexed sort counts as a regression
+CHECKED_TABLES = ('users', 'company', 'jobs', 'applications', 'saved_jobs', 'job_stats', 'application_events',
+                  'resume_uploads', 'resume_extractions')
+
+# SQLite EXPLAIN QUERY PLAN details; joined eager loads alias tables as company_1 etc.
+_SQLITE_SCAN_RE = re.compile(r'^SCAN (\w+?)(?:_\d+)?$')
+_SQLITE_SORT_RE = re.compile(r'USE TEMP B-TREE FOR (?:RIGHT PART OF )?ORDER BY')
+
+# Queries ordered by a computed value no index can hold (the rows sorted are
+# bounded by the query's own filter); only full scans count against them
+SORTS_ALLOWED = ('jobs: near, sort=distance',)
+
+# Queries that must be served by a particular index: a seek on is_active
+# alone is not a full scan, but is no better than one
+REQUIRED_INDEXES = {
+    'jobs: near, sort=distance': 'ix_jobs_active_geohash',
+    'job_stats: trending': 'ix_job_stats_trend_key',
+    'applications: job pipeline': 'ix_applications_job_id_date_id',
+    'applications: job pipeline by status': 'ix_applications_job_id_status_date_id',
+}
+
+
+def route_queries():
+    """[(name, statement)] for the queries behind the filtered API endpoints.
+
+    Statements are built with the routes' own helpers, so a change in how
+    an endpoint queries is checked as soon as it lands.
+    """
+    from app.application_stats import aggregate_query
+    from app.expiry import expired_jobs
+    from app.job_stats import trending_query
+    from app.routes.application_routes import APPLICANT_SORTS, filter_applications, filter_job_applications
+    from app.routes.job_routes import filter_jobs, job_list_parser, sorted_jobs
+    from app.routes.resume_routes import resume_access
+
+    defaults = {arg.name: arg.default for arg in job_list_parser.args}
+
+    def job_list(limit=21, **args):
+        query, orders = filter_jobs({**defaults, **args})
+        query, order = sorted_jobs(query, orders, args.get('sort'), None)
+        return query.order_by(*order.order_by()).limit(limit).statement
+
+    def next_job_page(sort, value, **args):
+        query, order = sorted_jobs(filter_jobs({**defaults, **args})[0], {}, sort, None)
+        query = query.filter(order.after(value, 1000, db.engine.dialect.name))
+        return query.order_by(*order.order_by()).limit(21).statement
+
+    def job_pipeline(statuses=(), after=None):
+        order = APPLICANT_SORTS['newest']
+        query = filter_job_applications(1, statuses)
+        if after is not None:
+            query = query.filter(order.after(after, 1000, db.engine.dialect.name))
+        return query.order_by(*order.order_by()).limit(21).statement
+
+    return [
+        ('jobs: default list', job_list()),
+        ('jobs: next page by date_posted', next_job_page('date_posted', datetime(2025, 1, 1))),
+        ('jobs: sort=salary', job_list(sort='salary', salary_currency='USD')),
+        ('jobs: next page by salary', next_job_page('salary', 50_000, salary_currency='USD')),
+        ('jobs: salary_min filter, sort=salary', job_list(sort='salary', salary_min=50_000, salary_currency='USD')),
+        ('jobs: sort=title', job_list(sort='title')),
+        ('jobs: recruiter_id filter', job_list(recruiter_id=1)),
+        ('jobs: company_id filter', job_list(company_id=1)),
+        ('jobs: near, sort=distance', job_list(near='Nairobi', radius_km=25)),
+        ('jobs: expiry sweep batch',
+         db.select(Job.id).where(expired_jobs(datetime.utcnow())).order_by(Job.expires_date).limit(500)),
+        ('job_stats: trending', trending_query()),
+        ('applications: own list', filter_applications({}, 1).statement),
+        ('applications: own list by job', filter_applications({'job_id': 1}, 1).statement),
+        ('applications: own list by status', filter_applications({'status': 'pending'}, 1).statement),
+        ('applications: per job', Application.query.filter_by(job_id=1).statement),
+        ('applications: per job and status', Application.query.filter_by(job_id=1, status='pending').statement),
+        ('applications: job pipeline', job_pipeline()),
+        ('applications: job pipeline next page', job_pipeline(after=datetime(2025, 1, 1))),
+        ('applications: job pipeline by status', job_pipeline(['pending'])),
+        ('applications: job stats refresh', aggregate_query(db.engine.dialect.name, [1, 2])),
+        ('application_events: next outbox batch',
+         db.select(ApplicationEvent.id).where(ApplicationEvent.dispatched_at.is_(None))
+         .order_by(ApplicationEvent.id).limit(100)),
+        ('resume_uploads: user and blob', ResumeUpload.query.filter_by(user_id=1, blob_id='0' * 64).statement),
+        ('applications: resume access', db.select(resume_access(1, '0' * 64))),
+        ('resume_extractions: next batch',
+         db.select(ResumeExtraction.id).where(ResumeExtraction.status == 'queued').order_by(ResumeExtraction.id).limit(2)),
+        ('saved_jobs: per user', SavedJob.query.filter_by(user_id=1).statement),
+        ('saved_jobs: user and job', SavedJob.query.filter_by(user_id=1, job_id=1).statement),
+        ('saved_jobs: per job', SavedJob.query.filter_by(job_id=1).statement),
+        ('company: per owner', Company.query.filter_by(owner_id=1).statement),
+    ]
+
+
+def _sqlite_plan(sql):
+    lines = [row[3] for row in db.session.execute(text('EXPLAIN QUERY PLAN ' + sql))]
+    problems = []
+    for line in lines:
+        scan = _SQLITE_SCAN_RE.match(line)
+        if scan and scan.group(1) in CHECKED_TABLES:
+            problems.append(f'full scan of {scan.group(1)}')
+        elif _SQLITE_SORT_RE.search(line):
+            problems.append('sort not served by an index')
+    return lines, problems
+
+
+def _postgres_plan(sql):
+    # Disabling seq scans and sorts makes the planner pick an index whenever
+    # one applies, even on the tiny tables of a test database
+    db.session.execute(text('SET LOCAL enable_seqscan = off'))
+    db.session.execute(text('SET LOCAL enable_sort = off'))
+    plan = db.session.execute(text('EXPLAIN (FORMAT JSON) ' + sql)).scalar()[0]['Plan']
+    lines, problems = [], []
+
+    def walk(node, depth):
+        relation = node.get('Relation Name')
+        lines.append('  ' * depth + node['Node Type'] + (f' on {relation}' if relation else '')
+                     + (f" using {node['Index Name']}" if 'Index Name' in node else ''))
+        if node['Node Type'] == 'Seq Scan' and relation in CHECKED_TABLES:
+            problems.append(f'full scan of {relation}')
+        elif node['Node Type'] in ('Sort', 'Incremental Sort'):
+            problems.append('sort not served by an index')
+        for child in node.get('Plans', ()):
+            walk(child, depth + 1)
+
+    walk(plan, 0)
+    return lines, problems
+
+
+def explain(statement):
+    """Return (plan lines, problems) for `statement` on the current database."""
+    dialect = db.engine.dialect
+    sql = str(statement.compile(dialect=dialect, compile_kwargs={'literal_binds': True}))
+    try:
+        if dialect.name == 'postgresql':
+            return _postgres_plan(sql)
+        return _sqlite_plan(sql)
+    finally:
+        db.session.rollback()
+
+
+def check_query_plans():
+    """Explain every route query; returns [(name, plan lines, problems)]."""
+    results = []
+    for name, statement in route_queries():
+        lines, problems = explain(statement)
+        if name in SORTS_ALLOWED:
+            problems = [problem for problem in problems if not problem.startswith('sort')]
+        index = REQUIRED_INDEXES.get(name)
+        if index and not any(index in line for line in lines):
+            problems.append(f'{index} not used')
+        results.append((name, lines, problems))
+    return results
+
+
+@click.command('check-query-plans')
+@click.option('--verbose', '-v', is_flag=True, help='Print every plan, not only regressions')
+@with_appcontext
+def check_query_plans_command(verbose):
+    """Fail if a route query plans a full table scan or an unindexed sort.
+
+    Run against a database at the current migration head (e.g. in CI after
+    `flask db upgrade`).
+    """
+    failures = 0
+    for name, lines, problems in check_query_plans():
+        status = 'FAIL' if problems else 'ok'
+        click.echo(f"{status:4} {name}" + (f" ({'; '.join(problems)})" if problems else ''))
+        if problems or verbose:
+            for line in lines:
+                click.echo(f'       {line}')
+        failures += bool(problems)
+    click.echo(f'{failures} regression(s)' if failures else 'All query plans use indexes.')
+    if failures:
+        sys.exit(1)
@@ -0,0 +1,88 @@
+# backend/app/recommendations.py
+
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import db
+from app.cache import TTLCache
+from app.models import Application, SavedJob
+from app.similarity import similar_jobs
+
+# How much each kind of interaction pulls the profile towards a job
+APPLIED_WEIGHT = 2.0
+SAVED_WEIGHT = 1.0
+
+# Most recent saves and applications (each) that make up a profile
+HISTORY_LIMIT = 100
+
+# Ranked jobs kept per user; a response takes the first k still active
+POOL_SIZE = 100
+
+# Key under which users with new saves/applications are parked in Session.info until commit
+PENDING_KEY = 'pending_recommendation_users'
+
+recommendation_cache = TTLCache(ttl=300)
+
+
+def _history(model, date_column, user_id):
+    return [row.job_id for row in db.session.query(model.job_id)
+            .filter(model.user_id == user_id)
+            .order_by(date_column.desc())
+            .limit(HISTORY_LIMIT)]
+
+
+def profile_vector(saved_ids, applied_ids):
+    """L2-normalized weighted sum of the TF-IDF vectors of a user's jobs."""
+    weights = {}
+    for job_id in saved_ids:
+        weights[job_id] = weights.get(job_id, 0.0) + SAVED_WEIGHT
+    for job_id in applied_ids:
+        weights[job_id] = weights.get(job_id, 0.0) + APPLIED_WEIGHT
+    profile = {}
+    for job_id, vector in similar_jobs.job_vectors(list(weights)).items():
+        for term, value in vector.items():
+            profile[term] = profile.get(term, 0.0) + weights[job_id] * value
+    norm = sum(value * value for value in profile.values()) ** 0.5
+    return {term: value / norm for term, value in profile.items()} if norm else {}
+
+
+def recommend(user_id):
+    """[(job id, score)] of active jobs closest to the user's saved and applied
+    jobs, best first, excluding jobs the user already applied to or saved."""
+    saved_ids = _history(SavedJob, SavedJob.saved_at, user_id)
+    applied_ids = _history(Application, Application.application_date, user_id)
+    if not saved_ids and not applied_ids:
+        return []
+    # Exclude all of them, not only the recent ones that make up the profile
+    seen = db.session.query(Application.job_id).filter(Application.user_id == user_id).union(
+        db.session.query(SavedJob.job_id).filter(SavedJob.user_id == user_id))
+    return similar_jobs.top_k(profile_vector(saved_ids, applied_ids), POOL_SIZE, exclude={row[0] for row in seen})
+
+
+def cached_recommendations(user_id):
+    """recommend(user_id), cached per user until they save or apply to a job."""
+    cached = recommendation_cache.get(user_id)
+    if cached is None:
+        cached = recommend(user_id)
+        recommendation_cache.set(user_id, cached, ttl=current_app.config.get('RECOMMENDATION_CACHE_TTL', 300))
+    return cached
+
+
+def invalidate_recommendations(session, user_ids):
+    """Drop the users' cached recommendations once `session` commits."""
+    session.info.setdefault(PENDING_KEY, set()).update(user_ids)
+
+
+@event.listens_for(SavedJob, 'after_insert')
+@event.listens_for(SavedJob, 'after_delete')
+@event.listens_for(Application, 'after_insert')
+@event.listens_for(Application, 'after_delete')
+def _history_changed(mapper, connection, target):
+    invalidate_recommendations(Session.object_session(target), [target.user_id])
+
+
+@event.listens_for(Session, 'after_commit')
+def _dispatch(session):
+    for user_id in session.info.pop(PENDING_KEY, ()):
+        recommendation_cache.delete(user_id)
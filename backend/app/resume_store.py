@@ -0,0 +1,121 @@
+# backend/app/resume_store.py
+
+import hashlib
+import os
+import re
+import tempfile
+
+from flask import current_app, send_file
+
+# Bytes read from an upload (and hashed) at a time
+CHUNK_SIZE = 64 * 1024
+
+DOCX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+
+# Accepted files, by their leading bytes; what the client says the type is does not count
+SIGNATURES = (
+    (b'%PDF-', 'application/pdf'),
+    (b'PK\x03\x04', DOCX_MIMETYPE),
+    (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', 'application/msword'),
+)
+
+_DIGEST_RE = re.compile(r'^[0-9a-f]{64}$')
+
+
+class InvalidResume(Exception):
+    """An upload the store refuses; `status` is the HTTP status to answer with."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def valid_digest(digest):
+    return bool(_DIGEST_RE.match(digest or ''))
+
+
+def storage_root():
+    return current_app.config['RESUME_STORAGE_DIR']
+
+
+def blob_path(digest):
+    """Where the blob with hex SHA-256 `digest` lives: two levels of 256 directories."""
+    return os.path.join(storage_root(), digest[:2], digest[2:4], digest)
+
+
+def sniff(head):
+    for signature, content_type in SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    return None
+
+
+def store(stream, max_bytes=None):
+    """Copy `stream` into the store; returns (digest, size, content type).
+
+    The upload is read CHUNK_SIZE bytes at a time into a temporary file in
+    the store, hashed on the way, and renamed to its digest's path, so a
+    worker never holds more than a chunk and readers never see a partial
+    file. Content already stored is not written again.
+    """
+    max_bytes = max_bytes or current_app.config.get('RESUME_MAX_BYTES', 10 * 1024 * 1024)
+    staging = os.path.join(storage_root(), 'tmp')
+    os.makedirs(staging, exist_ok=True)
+    digest, size, head = hashlib.sha256(), 0, b''
+    with tempfile.NamedTemporaryFile(dir=staging, delete=False) as temp:
+        try:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise InvalidResume(f'Resumes are limited to {max_bytes} bytes.', status=413)
+                if len(head) < 8:
+                    head += chunk[:8]
+                digest.update(chunk)
+                temp.write(chunk)
+            if size == 0:
+                raise InvalidResume('The upload is empty.')
+            content_type = sniff(head)
+            if content_type is None:
+                raise InvalidResume('Resumes must be PDF, DOCX or DOC files.', status=415)
+            temp.flush()
+            os.fsync(temp.fileno())
+        except BaseException:
+            temp.close()
+            os.unlink(temp.name)
+            raise
+
+    digest = digest.hexdigest()
+    path = blob_path(digest)
+    if os.path.exists(path):
+        # Identical content is already stored
+        os.unlink(temp.name)
+    else:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Atomic; two workers storing the same content both rename identical bytes
+        os.replace(temp.name, path)
+    return digest, size, content_type
+
+
+def send_blob(blob, download_name=None):
+    """Response for a stored blob, sent by the WSGI server's file wrapper (sendfile).
+
+    Range, If-Range and If-None-Match are answered by send_file; the digest
+    is a strong ETag, since a blob's content never changes. Cache-Control
+    is private: resumes must not be kept by shared caches.
+    """
+    response = send_file(
+        blob_path(blob.id),
+        mimetype=blob.content_type,
+        as_attachment=download_name is not None,
+        download_name=download_name,
+        conditional=True,
+        etag=blob.id,
+        max_age=current_app.config.get('RESUME_CACHE_MAX_AGE', 365 * 24 * 3600),
+    )
+    response.cache_control.public = False
+    response.cache_control.private = True
+    response.cache_control.immutable = True
+    return response
@@ -0,0 +1,130 @@
+# backend/app/resume_text.py
+
+# Text extraction from stored resumes. Runs in the worker processes of
+# app/candidate_search.py, so it imports nothing that needs an app or a
+# database.
+
+import re
+import zipfile
+import zlib
+from xml.etree import ElementTree
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # optional; without it PDFs go through the simple extractor below
+    PdfReader = None
+
+from app.resume_store import DOCX_MIMETYPE
+
+# Longest text kept per resume
+MAX_TEXT_CHARS = 200_000
+
+# Largest uncompressed document.xml read from a DOCX (guards against zip bombs)
+MAX_DOCX_XML_BYTES = 50 * 1024 * 1024
+
+_WORD_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+_PDF_STREAM_RE = re.compile(rb'<<(.*?)>>\s*stream\r?\n(.*?)\r?\nendstream', re.S)
+# A string, hex string or array operand followed by a text-showing operator,
+# or a text-positioning operator that starts a new line
+_PDF_TEXT_RE = re.compile(rb'(\((?:\\.|[^\\)])*\)|<[0-9A-Fa-f\s]*>|\[(?:\\.|[^\\\]])*\])\s*(Tj|TJ|\'|")|(T\*|Td|TD|ET)(?![A-Za-z])', re.S)
+_PDF_ESCAPES = {b'n': b'\n', b'r': b'\r', b't': b'\t', b'b': b'\b', b'f': b'\f'}
+_WHITESPACE_RE = re.compile(r'[ \t\f\v]+')
+
+
+class UnsupportedResume(Exception):
+    """A stored file no extractor can read; retrying will not help."""
+
+
+def extract_text(path, content_type):
+    """Plain text of the resume at `path`, whitespace-normalised and at most MAX_TEXT_CHARS long."""
+    if content_type == 'application/pdf':
+        text = _pdf_text(path)
+    elif content_type == DOCX_MIMETYPE:
+        text = _docx_text(path)
+    else:
+        raise UnsupportedResume(f'No text extractor for {content_type}')
+    lines = (_WHITESPACE_RE.sub(' ', line).strip() for line in text.splitlines())
+    return '\n'.join(line for line in lines if line)[:MAX_TEXT_CHARS]
+
+
+def _docx_text(path):
+    try:
+        with zipfile.ZipFile(path) as archive:
+            info = archive.getinfo('word/document.xml')
+            if info.file_size > MAX_DOCX_XML_BYTES:
+                raise UnsupportedResume('The document is too large to index')
+            parts = []
+            with archive.open(info) as document:
+                for _, element in ElementTree.iterparse(document):
+                    if element.tag == _WORD_NS + 't':
+                        parts.append(element.text or '')
+                    elif element.tag == _WORD_NS + 'tab':
+                        parts.append('\t')
+                    elif element.tag in (_WORD_NS + 'br', _WORD_NS + 'cr', _WORD_NS + 'p'):
+                        parts.append('\n')
+                    if element.tag == _WORD_NS + 'p':
+                        element.clear()
+            return ''.join(parts)
+    except (KeyError, zipfile.BadZipFile, ElementTree.ParseError) as e:
+        raise UnsupportedResume(f'Not a readable DOCX file: {e}')
+
+
+def _pdf_text(path):
+    if PdfReader is not None:
+        return '\n'.join(page.extract_text() or '' for page in PdfReader(path).pages)
+    with open(path, 'rb') as f:
+        return _simple_pdf_text(f.read())
+
+
+def _simple_pdf_text(data):
+    # Reads the text operators of each (Flate-compressed or plain) content
+    # stream. Fonts with custom encodings come out as noise: install pypdf
+    # for those.
+    parts = []
+    for dictionary, stream in _PDF_STREAM_RE.findall(data):
+        if b'/FlateDecode' in dictionary:
+            try:
+                stream = zlib.decompress(stream)
+            except zlib.error:
+                continue
+        elif b'/Filter' in dictionary:
+            continue  # images and other encodings hold no text we can read
+        for operand, operator, positioning in _PDF_TEXT_RE.findall(stream):
+            if positioning:
+                parts.append('\n')
+            elif operand.startswith(b'['):
+                for item in re.findall(rb'\((?:\\.|[^\\)])*\)|<[0-9A-Fa-f\s]*>|-?\d+\.?\d*', operand[1:-1]):
+                    if item[:1] in (b'(', b'<'):
+                        parts.append(_pdf_string(item))
+                    elif float(item) < -200:
+                        parts.append(' ')  # a wide negative kern separates words
+            else:
+                if operator in (b"'", b'"'):
+                    parts.append('\n')
+                parts.append(_pdf_string(operand))
+    text = ''.join(parts)
+    printable = sum(ch.isprintable() or ch.isspace() for ch in text)
+    return text if text and printable / len(text) > 0.9 else ''
+
+
+def _pdf_string(token):
+    if token.startswith(b'<'):
+        digits = re.sub(rb'\s', b'', token[1:-1])
+        raw = bytes.fromhex((digits + b'0' * (len(digits) % 2)).decode('ascii'))
+    else:
+        raw = re.sub(rb'\\([nrtbf()\\]|[0-7]{1,3}|\r?\n)', _pdf_escape, token[1:-1])
+    if raw.startswith(b'\xfe\xff'):
+        return raw[2:].decode('utf-16-be', errors='replace')
+    return raw.decode('latin-1')
+
+
+def _pdf_escape(match):
+    escape = match.group(1)
+    if escape in _PDF_ESCAPES:
+        return _PDF_ESCAPES[escape]
+    if escape[:1].isdigit():
+        return bytes([int(escape, 8) & 0xFF])
+    if escape.strip(b'\r\n') == b'':
+        return b''  # line continuation
+    return escape
@@ -100,6 +100,7 @@ from .job_routes import job_ns            # Handles job posting routes
 from .auth_routes import auth_ns          # Handles login, registration, JWT auth
 from .application_routes import application_ns  # Handles job application submissions
 from .saved_job_routes import saved_ns
+from .resume_routes import resume_ns      # Resume upload and download
 
 
 # --- CREATE THE API BLUEPRINT ---
@@ -124,3 +125,4 @@ api.add_namespace(job_ns, path='/jobs')                # e.g. /api/jobs
 api.add_namespace(auth_ns, path='/auth')               # e.g. /api/auth
 api.add_namespace(application_ns, path='/applications')  # e.g. /api/applications
 api.add_namespace(saved_ns, path='/saved_jobs')
+api.add_namespace(resume_ns, path='/resumes')             # e.g. /api/resumes
@@ -1,8 +1,18 @@
 from flask import request
-from flask_restx import Namespace, Resource, fields, reqparse
+from flask_restx import Namespace, Resource, fields, inputs, reqparse
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
-from app.models import Application, Job, User
+from app.models import Application, Job, JobApplicationStat, ResumeBlob, ResumeUpload, User
+from app.versioning import conditional
+from app.pagination import KeysetOrder
+from app.serializers import serialize_with
+from app.export import EXPORT_FORMATS, MIMETYPES, export_response
+from app.application_stats import APPLICATION_STATUSES, count_inserted, refresh_jobs
+from app.candidate_search import index_applications
+from app.outbox import outbox_dispatcher, record_application_events
+from app.recommendations import invalidate_recommendations
+from sqlalchemy import String, Text, func, literal, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import joinedload
 from datetime import datetime
 
@@ -17,6 +27,7 @@ application_model = application_ns.model('Application', {
     'application_date': fields.DateTime(dt_format='iso8601', description='Date the application was submitted'),
     'status': fields.String(description='Status of the application (e.g., pending, accepted, rejected)'),
     'resume_url': fields.String(description='URL to the applicant\'s resume'),
+    'resume_blob_id': fields.String(description='Uploaded resume, at /api/resumes/<resume_blob_id>'),
     'cover_letter_text': fields.String(description='Text of the cover letter'),
     'job': fields.Nested(application_ns.model('JobNested', {
         'id': fields.Integer,
@@ -40,6 +51,7 @@ application_create_model = application_ns.model('ApplicationCreate', {
     'user_id': fields.Integer(required=True),
     'job_id': fields.Integer(required=True),
     'resume_url': fields.String,
+    'resume_blob_id': fields.String(description='id returned by POST /api/resumes'),
     'cover_letter_text': fields.String,
 })
 
@@ -50,27 +62,217 @@ application_list_parser.add_argument('job_id', type=int, help='Filter applicatio
 application_list_parser.add_argument('status', type=str, help='Filter applications by status', location='args')
 application_list_parser.add_argument('_expand', type=str, help='Expand related resources (e.g., job, applicant)', location='args', action='append')
 
+# Orders for a job's applicant pipeline (/jobs/<id>/applications), paged by keyset
+APPLICANT_SORTS = {
+    'newest': KeysetOrder('newest', Application.application_date, Application.id, descending=True, value_type=datetime),
+    'oldest': KeysetOrder('oldest', Application.application_date, Application.id, value_type=datetime),
+}
+
+# An application as its job's recruiter sees it; the job itself is the one in the URL
+applicant_model = application_ns.model('Applicant', {
+    name: application_model[name]
+    for name in ('id', 'user_id', 'job_id', 'application_date', 'status', 'resume_url', 'resume_blob_id',
+                 'cover_letter_text')
+})
+applicant_expanded_model = application_ns.model('ApplicantExpanded', {
+    **applicant_model,
+    'applicant': application_model['applicant'],
+})
+
+applicant_page_model = application_ns.model('ApplicantPage', {
+    'items': fields.List(fields.Nested(applicant_expanded_model)),
+    'next_cursor': fields.String(description='Opaque cursor for the next page; null on the last page'),
+    'limit': fields.Integer(description='Page size actually used'),
+    'counts': fields.Raw(description='Applications to the job per status, whatever the status filter'),
+    'total': fields.Integer(description='Applications to the job'),
+})
+
+# Page envelopes by whether `applicant` was expanded, so unexpanded pages never touch it
+APPLICANT_PAGE_MODELS = {
+    expand: {**applicant_page_model, 'items': fields.List(fields.Nested(item))}
+    for expand, item in ((False, applicant_model), (True, applicant_expanded_model))
+}
+
+# PATCH /jobs/<id>/applications/status: one status for many applications
+application_status_filter_model = application_ns.model('ApplicationStatusFilter', {
+    'status': fields.List(fields.String, description='Only applications currently in these statuses'),
+    'applied_before': fields.String(description='ISO 8601; only applications submitted before this'),
+    'applied_after': fields.String(description='ISO 8601; only applications submitted at or after this'),
+})
+
+application_status_update_model = application_ns.model('ApplicationStatusUpdate', {
+    'ids': fields.List(fields.Integer, description='Applications to change'),
+    'filter': fields.Nested(application_status_filter_model, description='Applications to change'),
+    'status': fields.String(required=True, enum=list(APPLICATION_STATUSES), description='Status to move them to'),
+})
+
+application_status_result_model = application_ns.model('ApplicationStatusResult', {
+    'matched': fields.Integer(description='Applications selected by ids and filter'),
+    'updated': fields.Integer(description='Selected applications moved to the status, one event queued for each'),
+    'unchanged': fields.Integer(description='Selected applications already in the status'),
+})
+
+outbox_stats_model = application_ns.model('OutboxStats', {
+    'running': fields.Boolean(description='Whether the background dispatcher thread runs in this worker'),
+    'batches': fields.Integer(),
+    'delivered': fields.Integer(description='Events delivered by this worker'),
+    'failed_batches': fields.Integer(),
+    'errors': fields.Integer(),
+    'pending': fields.Integer(description='Undelivered events in the outbox (all workers)'),
+    'last_run_at': fields.DateTime(dt_format='iso8601'),
+})
+
+# Dashboard counters, kept current by app/application_stats.py
+application_stats_model = application_ns.model('ApplicationStats', {
+    'applications': fields.Integer(description='Applications received'),
+    **{status: fields.Integer(description=f'Applications now {status}') for status in APPLICATION_STATUSES},
+    'first_reviews': fields.Integer(description='Applications that have left pending at least once'),
+    'avg_hours_to_first_review': fields.Float(description='Mean hours from applying to leaving pending'),
+    'updated_at': fields.DateTime(dt_format='iso8601'),
+})
+
+job_applications_parser = reqparse.RequestParser()
+job_applications_parser.add_argument('status', type=str, location='args', action='append',
+                                     help='Only these statuses (repeat or comma-separate)')
+job_applications_parser.add_argument('q', type=str, location='args',
+                                     help='Search resumes and cover letters; ranks candidates by relevance')
+job_applications_parser.add_argument('sort', type=str, location='args', choices=tuple(APPLICANT_SORTS) + ('relevance',),
+                                     help='Sort order (default: relevance when q is given, else newest)')
+job_applications_parser.add_argument('limit', type=int, location='args', help='Page size (max 100)')
+job_applications_parser.add_argument('cursor', type=str, location='args', help='next_cursor from the previous page')
+job_applications_parser.add_argument('_expand', type=str, location='args', action='append',
+                                     help="'applicant' embeds each applicant's username and email")
+
+application_export_parser = application_list_parser.copy()
+application_export_parser.remove_argument('_expand')
+application_export_parser.add_argument('format', type=str, location='args', choices=EXPORT_FORMATS, default='ndjson')
+application_export_parser.add_argument('gzip', type=inputs.boolean, location='args', default=False, help='gzip-encode the stream')
+
+
+def filter_applications(args, current_user_id):
+    """The caller's applications, narrowed by application_list_parser filters."""
+    requested_user_id = args.get('user_id')
+    if requested_user_id and requested_user_id != current_user_id:
+        application_ns.abort(403, message="Forbidden: You can only view your own applications.")
+
+    query = Application.query.filter_by(user_id=current_user_id)
+    if args.get('job_id'):
+        query = query.filter_by(job_id=args['job_id'])
+    if args.get('status'):
+        query = query.filter_by(status=args['status'])
+    return query
+
+
+def parse_statuses(values):
+    """Sorted distinct statuses from repeated and/or comma-separated `status` args."""
+    return sorted({status.strip() for value in values or () for status in value.split(',') if status.strip()})
+
+
+def filter_job_applications(job_id, statuses=()):
+    """Applications to `job_id`, narrowed to `statuses` if any."""
+    query = Application.query.filter_by(job_id=job_id)
+    if len(statuses) == 1:
+        # Equality keeps the keyset walk on ix_applications_job_id_status_date_id
+        query = query.filter(Application.status == statuses[0])
+    elif statuses:
+        query = query.filter(Application.status.in_(statuses))
+    return query
+
+
+def application_status_counts(job_id):
+    """({status: applications}, total) for `job_id`, read from its job_application_stats row.
+
+    Applications in other statuses count towards the total only.
+    """
+    stats = db.session.get(JobApplicationStat, job_id)
+    if stats is None:
+        return {status: 0 for status in APPLICATION_STATUSES}, 0
+    return {status: getattr(stats, status) for status in APPLICATION_STATUSES}, stats.applications
+
+
+def application_stats(stats):
+    """Dashboard dict for a JobApplicationStat or CompanyApplicationStat row (None: nothing received yet)."""
+    if stats is None:
+        return {counter: 0 for counter in ('applications', *APPLICATION_STATUSES, 'first_reviews')}
+    return {
+        'applications': stats.applications,
+        **{status: getattr(stats, status) for status in APPLICATION_STATUSES},
+        'first_reviews': stats.first_reviews,
+        'avg_hours_to_first_review': stats.review_seconds / stats.first_reviews / 3600 if stats.first_reviews else None,
+        'updated_at': stats.updated_at,
+    }
+
+
+def insert_application(user_id, job_id, resume_url=None, cover_letter_text=None, resume_blob_id=None):
+    """Insert a pending application in one statement; returns its row, or None.
+
+    INSERT ... SELECT from jobs (and an EXISTS on users) inserts nothing for
+    a missing job or user, and ON CONFLICT DO NOTHING on
+    uq_applications_user_id_job_id nothing for a repeat, so concurrent
+    submits cannot create two applications. An inserted application is
+    counted in its job's stats and indexed for candidate search, with the
+    resume's text if it was already extracted. The caller commits.
+    """
+    module = postgresql if db.session.get_bind().dialect.name == 'postgresql' else sqlite
+    resume_text = select(ResumeBlob.text).where(ResumeBlob.id == resume_blob_id).scalar_subquery()
+    source = select(
+        literal(user_id), Job.id, literal('pending'), literal(datetime.utcnow()),
+        literal(resume_url, String), literal(cover_letter_text, Text), literal(resume_blob_id, String), resume_text,
+    ).where(Job.id == job_id, select(User.id).where(User.id == user_id).exists())
+    statement = (
+        module.insert(Application)
+        .from_select(['user_id', 'job_id', 'status', 'application_date', 'resume_url', 'cover_letter_text',
+                      'resume_blob_id', 'resume_text'], source)
+        .on_conflict_do_nothing(index_elements=['user_id', 'job_id'])
+        .returning(*Application.__table__.c)
+    )
+    row = db.session.execute(statement).first()
+    if row is not None:
+        count_inserted(db.session.connection(), [row])
+        index_applications(db.session.connection(), [row._asdict()])
+    return row
+
+
+def update_application_statuses(query, status):
+    """Move the applications of `query` not yet in `status` to it with one UPDATE.
+
+    Each changed application gets a 'status_changed' outbox event in the
+    same transaction, for app/outbox.py to deliver after the commit, and
+    the jobs' application stats are recomputed. Returns (matched, changed
+    rows); the caller commits.
+    """
+    matched = query.with_entities(func.count(Application.id)).scalar()
+    where = [query.whereclause, Application.status.is_distinct_from(status)]
+    values = {'status': status}
+    if status != 'pending':
+        # What Application._mark_reviewed does for a single application
+        values['reviewed_at'] = func.coalesce(Application.reviewed_at, datetime.utcnow())
+    options = {'synchronize_session': False}
+    columns = (Application.id, Application.user_id, Application.job_id)
+    if db.session.get_bind().dialect.update_returning:
+        statement = update(Application).where(*where).values(**values).returning(*columns)
+        rows = db.session.execute(statement, execution_options=options).all()
+    else:
+        rows = db.session.execute(select(*columns).where(*where)).all()
+        db.session.execute(update(Application).where(Application.id.in_([row.id for row in rows]))
+                           .values(**values), execution_options=options)
+    record_application_events(db.session, 'status_changed', [{**row._asdict(), 'status': status} for row in rows])
+    # The UPDATE does not report the previous statuses, so the counters are recomputed
+    refresh_jobs(db.session.connection(), {row.job_id for row in rows})
+    return matched, rows
+
 
 @application_ns.route('/', strict_slashes=False)
 class ApplicationList(Resource):
     @jwt_required()
     @application_ns.expect(application_list_parser)
-    @application_ns.marshal_list_with(application_model)
+    @conditional('applications', 'jobs', 'company', 'users')
+    @serialize_with(application_model, as_list=True)
     def get(self):
         """List all applications for the authenticated user"""
         current_user_id = int(get_jwt_identity())
         args = application_list_parser.parse_args()
-        requested_user_id = args.get('user_id')
-
-        if requested_user_id and requested_user_id != current_user_id:
-            application_ns.abort(403, message="Forbidden: You can only view your own applications.")
-
-        query = Application.query.filter_by(user_id=current_user_id)
-
-        if args.get('job_id'):
-            query = query.filter_by(job_id=args['job_id'])
-        if args.get('status'):
-            query = query.filter_by(status=args['status'])
+        query = filter_applications(args, current_user_id)
 
         expand_options = args.get('_expand')
         if expand_options:
@@ -84,7 +286,7 @@ class ApplicationList(Resource):
 
     @jwt_required()
     @application_ns.expect(application_create_model, validate=True)
-    @application_ns.marshal_with(application_model, code=201)
+    @application_ns.marshal_with(applicant_model, code=201)
     def post(self):
         """Submit a new job application"""
         data = request.get_json()
@@ -93,26 +295,46 @@ class ApplicationList(Resource):
         if data['user_id'] != current_user_id:
             application_ns.abort(403, message="You are not allowed to apply on behalf of another user.")
 
-        user = User.query.get(data['user_id'])
-        job = Job.query.get(data['job_id'])
+        blob_id = data.get('resume_blob_id')
+        if blob_id and not db.session.query(
+                ResumeUpload.query.filter_by(user_id=current_user_id, blob_id=blob_id).exists()).scalar():
+            application_ns.abort(400, message="Upload the resume with POST /api/resumes before applying with it.")
 
-        if not user or not job:
+        new_app = insert_application(current_user_id, data['job_id'], data.get('resume_url'),
+                                     data.get('cover_letter_text'), blob_id)
+        if new_app is None:
+            db.session.rollback()
+            # Only a failed submit pays for finding out why
+            if db.session.query(Application.query.filter_by(user_id=current_user_id, job_id=data['job_id']).exists()).scalar():
+                application_ns.abort(400, message="You have already applied for this job.")
             application_ns.abort(404, message="User or Job not found.")
+        # The bulk INSERT skips the mapper events that drop cached recommendations
+        invalidate_recommendations(db.session, [current_user_id])
+        db.session.commit()
+        return new_app._asdict(), 201
 
-        existing_application = Application.query.filter_by(user_id=user.id, job_id=job.id).first()
-        if existing_application:
-            application_ns.abort(400, message="You have already applied for this job.")
-
-        new_app = Application(
-            user_id=user.id,
-            job_id=job.id,
-            resume_url=data.get('resume_url'),
-            cover_letter_text=data.get('cover_letter_text'),
-            status='pending',
-            application_date=datetime.utcnow()
+
+@application_ns.route('/export', strict_slashes=False)
+class ApplicationExport(Resource):
+    @jwt_required()
+    @application_ns.expect(application_export_parser)
+    @application_ns.produces([MIMETYPES['ndjson'], MIMETYPES['csv']])
+    @application_ns.response(200, 'Matching applications, one per line (NDJSON) or row (CSV)')
+    @conditional('applications', 'jobs', 'company', 'users')
+    def get(self):
+        """Stream the authenticated user's applications as NDJSON or CSV"""
+        args = application_export_parser.parse_args()
+        query = filter_applications(args, int(get_jwt_identity())).options(
+            joinedload(Application.job).joinedload(Job.company),
+            joinedload(Application.applicant),
         )
+        return export_response(query.order_by(Application.id), application_model,
+                               args['format'], 'applications', args['gzip'])
 
-        db.session.add(new_app)
-        db.session.commit()
 
-        return new_app, 201
+@application_ns.route('/outbox/stats', strict_slashes=False)
+class ApplicationOutboxStats(Resource):
+    @application_ns.marshal_with(outbox_stats_model)
+    def get(self):
+        """Delivery counters of the application event outbox (this worker) and its backlog"""
+        return outbox_dispatcher.stats()
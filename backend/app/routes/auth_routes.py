@@ -5,6 +5,7 @@ from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity # Import JWT functions
 from app import db, bcrypt # Import db and bcrypt
 from app.models import User, Company # Import User and Company models
+from app.versioning import conditional # ETag / Last-Modified support
 from sqlalchemy.exc import IntegrityError
 
 # Create a Namespace for authentication-related routes
@@ -141,6 +142,7 @@ class UserLogin(Resource):
 class CurrentUser(Resource):
     @auth_ns.doc('get_current_user')
     @jwt_required() # Requires a valid JWT token
+    @conditional('users', 'company') # Runs after the JWT check so bad tokens still get 401
     @auth_ns.marshal_with(user_payload_model) # Returns just the user payload, not the full login response
     def get(self):
         """Get details of the currently authenticated user"""
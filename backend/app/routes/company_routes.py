@@ -2,8 +2,13 @@
 
 from flask import request
 from flask_restx import Namespace, Resource, fields
+from flask_jwt_extended import get_jwt_identity, jwt_required
 from app import db
-from app.models import Company, Job, User # Import User for owner_id validation
+from app.models import Company, CompanyApplicationStat, Job, User # Import User for owner_id validation
+from app.routes.job_routes import invalidate_cached_company # Cached jobs embed company_name
+from app.routes.application_routes import application_stats, application_stats_model # Dashboard counters
+from app.versioning import conditional # ETag / Last-Modified support
+from app.serializers import serialize_with # Compiled company_model serializer
 from sqlalchemy.exc import IntegrityError, DataError
 
 # Create a Namespace for company-related routes
@@ -44,7 +49,8 @@ company_update_model = company_ns.model('CompanyUpdate', {
 class CompanyList(Resource):
     @company_ns.doc(description='Get a list of all companies. Can be filtered by name.',
                     responses={200: 'Success', 500: 'Internal Server Error'})
-    @company_ns.marshal_list_with(company_model)
+    @conditional('company')
+    @serialize_with(company_model, as_list=True)
     def get(self):
         """Get all companies with optional name filter"""
         name = request.args.get('name')
@@ -120,7 +126,8 @@ class CompanyList(Resource):
 class CompanyResource(Resource):
     @company_ns.doc(description='Get a company by ID.',
                     responses={200: 'Success', 404: 'Company not found', 500: 'Internal Server Error'})
-    @company_ns.marshal_with(company_model)
+    @conditional('company')
+    @serialize_with(company_model)
     def get(self, company_id):
         """Get a company by ID"""
         company = Company.query.get(company_id)
@@ -163,12 +170,16 @@ class CompanyResource(Resource):
             setattr(company, 'owner_id', new_owner_id) # Set owner_id explicitly
             data.pop('owner_id', None) # Remove from data to avoid processing in the loop below
 
+        # A rename changes company_name on every cached job of this company
+        renamed = 'name' in data and data['name'] != company.name
 
         try:
             for key, value in data.items():
                 if hasattr(company, key):
                     setattr(company, key, value)
             db.session.commit()
+            if renamed:
+                invalidate_cached_company(company_id)
             return company
         except IntegrityError as e:
             db.session.rollback()
@@ -206,4 +217,21 @@ class CompanyResource(Resource):
             return '', 204
         except Exception as e:
             db.session.rollback()
-            company_ns.abort(500, message=f"An error occurred: {str(e)}")
\ No newline at end of file
+            company_ns.abort(500, message=f"An error occurred: {str(e)}")
+
+@company_ns.route('/<int:company_id>/applications/stats')
+@company_ns.param('company_id', 'The company unique identifier')
+class CompanyApplicationStats(Resource):
+    @company_ns.doc(description='Application counters across the company\'s jobs; owner only.',
+                    responses={200: 'Success', 403: 'Not the company owner', 404: 'Company not found'})
+    @jwt_required()
+    @conditional('applications', 'jobs', 'company')
+    @company_ns.marshal_with(application_stats_model)
+    def get(self, company_id):
+        """Get a company's application counters (one company_application_stats row)"""
+        company = db.session.get(Company, company_id)
+        if not company:
+            company_ns.abort(404, message="Company not found")
+        if company.owner_id != int(get_jwt_identity()):
+            company_ns.abort(403, message="Only the company owner can see its application stats.")
+        return application_stats(db.session.get(CompanyApplicationStat, company_id))
@@ -1,9 +1,37 @@
-from flask import request
-from flask_restx import Namespace, Resource, fields, reqparse
-from app import db
-from app.models import Job, User, Company
+import json
+
+from flask import current_app, request
+from flask_restx import Namespace, Resource, fields, inputs, reqparse
+from app import db, response_cache
+from app.models import Application, Job, JobApplicationStat, JobStat, User, Company
+from app.job_changes import on_jobs_committed, record_job_changes
+from app.versioning import conditional, request_versions
+from app.pagination import KeysetOrder, InvalidCursor, paginate, clamp_page_size
+from app.search import search_jobs, with_relevance
+from app.candidate_search import search_applications, with_application_relevance
+from app.geo import haversine_km, resolve_point
+from app.proximity import DEFAULT_RADIUS_KM, MAX_RADIUS_KM, filter_near, with_distance
+from app.trigram import filter_substring, suggest_values, normalize_text
+from app.facets import cached_job_facets, facet_cache
+from app.serializers import json_response, serialize
+from app.export import EXPORT_FORMATS, MIMETYPES, export_response
+from app.expiry import expiry_sweeper
+from app.similarity import similar_jobs
+from app.duplicates import duplicate_jobs, duplicate_policy, flag_duplicates
+from app.routes.application_routes import (APPLICANT_PAGE_MODELS, APPLICANT_SORTS, applicant_page_model,
+                                           application_stats, application_stats_model, application_status_counts,
+                                           application_status_result_model, application_status_update_model,
+                                           filter_job_applications, job_applications_parser, parse_statuses,
+                                           update_application_statuses)
+from app.outbox import outbox_dispatcher
+from app.application_stats import move_jobs
+from app.job_stats import TRENDING_POOL_SIZE, decay_rate, job_views, trend_score, trending_jobs
+from app.bulk_import import (IMPORT_FORMATS, InvalidUpload, insert_jobs, parse_datetime, read_rows, upload_format,
+                             validate_rows)
+from flask_jwt_extended import get_jwt_identity, jwt_required
+from sqlalchemy import func, null, or_, select, update
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, load_only, selectinload, with_expression
 from datetime import datetime
 
 # Namespace
@@ -27,7 +55,111 @@ job_model = job_ns.model('Job', {
     'company_name': fields.String(attribute='company.name', readOnly=True),
     'recruiter_username': fields.String(attribute='recruiter.username', readOnly=True),
     'salary_range': fields.String(attribute='salary', readOnly=True),
+    'salary_min': fields.Integer(readOnly=True, description='Lower bound parsed from salary'),
+    'salary_max': fields.Integer(readOnly=True, description='Upper bound parsed from salary'),
+    'salary_currency': fields.String(readOnly=True, description='ISO 4217 currency parsed from salary'),
+    'salary_period': fields.String(readOnly=True, description='Pay period parsed from salary (hour, day, week, month, year)'),
+    'salary_annual_min': fields.Integer(readOnly=True, description='salary_min as yearly pay, in salary_currency'),
+    'salary_annual_max': fields.Integer(readOnly=True, description='salary_max as yearly pay, in salary_currency'),
     'type': fields.String(attribute='job_type', readOnly=True),
+    'latitude': fields.Float(readOnly=True, description='Geocoded from location (null if unknown or remote)'),
+    'longitude': fields.Float(readOnly=True, description='Geocoded from location (null if unknown or remote)'),
+    'distance_km': fields.Float(readOnly=True, description='Distance from the near= point (radius searches only)'),
+    'duplicate_of': fields.Integer(attribute='duplicate_of_id', readOnly=True,
+                                   description='Active job of the same company this posting nearly duplicated when created'),
+})
+
+# Envelope returned when the client asks for a page (limit/cursor)
+job_page_model = job_ns.model('JobPage', {
+    'items': fields.List(fields.Nested(job_model)),
+    'next_cursor': fields.String(description='Opaque cursor for the next page; null on the last page'),
+    'limit': fields.Integer(description='Page size actually used'),
+})
+
+# Sidebar facet counts
+facet_value_model = job_ns.model('FacetValue', {
+    'value': fields.String(description='Filter value (company facet: company id)'),
+    'label': fields.String(description='Display label'),
+    'count': fields.Integer(description='Matching jobs'),
+})
+
+job_facets_model = job_ns.model('JobFacets', {
+    'total': fields.Integer(description='Jobs matching the filters'),
+    'facets': fields.Nested(job_ns.model('JobFacetGroups', {
+        'job_type': fields.List(fields.Nested(facet_value_model)),
+        'location': fields.List(fields.Nested(facet_value_model)),
+        'company': fields.List(fields.Nested(facet_value_model)),
+        'salary_band': fields.List(fields.Nested(facet_value_model)),
+    })),
+})
+
+response_cache_stats_model = job_ns.model('ResponseCacheStats', {
+    'backend': fields.String(description='Active cache backend, null when disabled'),
+    'hits': fields.Integer(description='Lookups served from cache (this worker)'),
+    'misses': fields.Integer(description='Lookups that ran the query (this worker)'),
+    'invalidations': fields.Integer(description='Entries dropped because jobs changed'),
+    'evictions': fields.Integer(description='Entries dropped for size'),
+    'entries': fields.Integer(),
+    'bytes': fields.Integer(),
+})
+
+expiry_sweep_run_model = job_ns.model('ExpirySweepRun', {
+    'started_at': fields.DateTime(dt_format='iso8601'),
+    'deactivated': fields.Integer(description='Jobs deactivated by the run'),
+    'batches': fields.Integer(description='Transactions used'),
+    'duration_seconds': fields.Float(),
+    'jobs_per_second': fields.Float(description='Sweep throughput'),
+    'max_lag_seconds': fields.Float(description='Longest time a swept job stayed active past its expiry'),
+    'backlog': fields.Integer(description='Expired jobs still active after the run'),
+    'backlog_lag_seconds': fields.Float(description='Age of the oldest expiry still in the backlog'),
+})
+
+expiry_sweep_stats_model = job_ns.model('ExpirySweepStats', {
+    'running': fields.Boolean(description='Whether the background sweeper thread runs in this worker'),
+    'runs': fields.Integer(),
+    'errors': fields.Integer(),
+    'deactivated_total': fields.Integer(),
+    'last_run': fields.Nested(expiry_sweep_run_model, allow_null=True),
+})
+
+job_view_stats_model = job_ns.model('JobViewStats', {
+    'running': fields.Boolean(description='Whether the background flush thread runs in this worker'),
+    'flushes': fields.Integer(),
+    'errors': fields.Integer(),
+    'flushed_views': fields.Integer(description='Views written to job_stats by this worker'),
+    'buffered_jobs': fields.Integer(description='Jobs with views waiting for the next flush'),
+    'buffered_views': fields.Integer(),
+    'last_flush_at': fields.DateTime(dt_format='iso8601'),
+})
+
+# Per-job view counters
+job_stat_model = job_ns.model('JobStat', {
+    'job_id': fields.Integer(),
+    'views': fields.Integer(description='All-time detail views'),
+    'trend_score': fields.Float(description='Views decayed with TRENDING_HALF_LIFE_HOURS'),
+    'last_viewed_at': fields.DateTime(dt_format='iso8601'),
+})
+
+# "Did you mean" location suggestions
+location_suggestion_model = job_ns.model('LocationSuggestion', {
+    'location': fields.String(description='Location as stored on job postings'),
+    'score': fields.Float(description='Trigram similarity to the query (0-1)'),
+    'jobs': fields.Integer(description='Number of postings using this location'),
+})
+
+location_suggestions_model = job_ns.model('LocationSuggestions', {
+    'query': fields.String(),
+    'suggestions': fields.List(fields.Nested(location_suggestion_model)),
+})
+
+# Job returned by /jobs/<id>/similar
+similar_job_model = job_ns.inherit('SimilarJob', job_model, {
+    'score': fields.Float(description='Cosine similarity of title, description and requirements (TF-IDF, 0-1)'),
+})
+
+# Job returned by /jobs/trending
+trending_job_model = job_ns.inherit('TrendingJob', job_model, {
+    'score': fields.Float(description='Detail views, exponentially decayed (see TRENDING_HALF_LIFE_HOURS)'),
 })
 
 # Swagger input models
@@ -58,36 +190,428 @@ job_update_model = job_ns.model('JobUpdate', {
     'image': fields.String(description='Image URL for job'),
 })
 
-# Query parser
-job_list_parser = reqparse.RequestParser()
-job_list_parser.add_argument('location', type=str, location='args')
-job_list_parser.add_argument('job_type', type=str, location='args')
-job_list_parser.add_argument('company_id', type=int, location='args')
-job_list_parser.add_argument('recruiter_id', type=int, location='args')
-job_list_parser.add_argument('is_active', type=bool, location='args', default=True)
+# Outcome of each row of a /jobs/bulk upload
+job_import_row_model = job_ns.model('JobImportRow', {
+    'row': fields.Integer(description='1-based position in the upload (CSV: after the header)'),
+    'status': fields.String(description="'created' or 'failed'"),
+    'id': fields.Integer(description='Id of the created job'),
+    'duplicate_of': fields.Integer(description='Job this row nearly duplicates (flagged, or the reason it was rejected)'),
+    'errors': fields.Raw(description='Field name (or "row") to error message, for failed rows'),
+})
+
+job_import_model = job_ns.model('JobImport', {
+    'created': fields.Integer(),
+    'failed': fields.Integer(),
+    'results': fields.List(fields.Nested(job_import_row_model)),
+})
+
+# PATCH /jobs: a change set applied to many jobs at once
+job_batch_filter_model = job_ns.model('JobBatchFilter', {
+    'location': fields.String(),
+    'job_type': fields.String(),
+    'company_id': fields.Integer(),
+    'recruiter_id': fields.Integer(),
+    'is_active': fields.Boolean(),
+    'salary_min': fields.Integer(),
+    'salary_max': fields.Integer(),
+    'salary_currency': fields.String(),
+    'q': fields.String(),
+    'near': fields.String(),
+    'radius_km': fields.Float(),
+})
+
+job_batch_changes_model = job_ns.model('JobBatchChanges', {
+    'is_active': fields.Boolean(description='Close (false) or reopen (true)'),
+    'expires_date': fields.DateTime(dt_format='iso8601', description='New expiry; null for none'),
+    'company_id': fields.Integer(description='Move to this company; null to detach'),
+})
+
+job_batch_update_model = job_ns.model('JobBatchUpdate', {
+    'ids': fields.List(fields.Integer, description='Jobs to change'),
+    'filter': fields.Nested(job_batch_filter_model, description='Jobs to change, as the GET /jobs filters'),
+    'changes': fields.Nested(job_batch_changes_model, required=True),
+})
+
+job_batch_result_model = job_ns.model('JobBatchResult', {
+    'matched': fields.Integer(description='Jobs selected by ids and filter'),
+    'updated': fields.Integer(description="Selected jobs the caller owns, all of which were changed"),
+    'not_owned': fields.Integer(description='Selected jobs left alone because the caller does not own them'),
+})
+
+# Query parsers: filters shared by every job listing endpoint...
+job_filter_parser = reqparse.RequestParser()
+job_filter_parser.add_argument('location', type=str, location='args')
+job_filter_parser.add_argument('job_type', type=str, location='args')
+job_filter_parser.add_argument('company_id', type=int, location='args')
+job_filter_parser.add_argument('recruiter_id', type=int, location='args')
+job_filter_parser.add_argument('is_active', type=bool, location='args', default=True)
+job_filter_parser.add_argument('salary_min', type=int, location='args',
+                               help='Only jobs paying at least this much a year (requires salary_currency)')
+job_filter_parser.add_argument('salary_max', type=int, location='args',
+                               help='Only jobs whose yearly pay starts at or below this (requires salary_currency)')
+job_filter_parser.add_argument('salary_currency', type=str, location='args',
+                               help='ISO 4217 currency code, e.g. USD; required by the salary filters and sort')
+job_filter_parser.add_argument('q', type=str, location='args', help='Keyword search over title, description and requirements')
+job_filter_parser.add_argument('near', type=str, location='args', help='Only jobs near this place: a city name or "lat,lon"')
+job_filter_parser.add_argument('radius_km', type=float, location='args',
+                               help=f'Search radius around near (default {DEFAULT_RADIUS_KM:g}, max {MAX_RADIUS_KM:g})')
+
+# ...plus ordering and paging for the list itself
+job_list_parser = job_filter_parser.copy()
+job_list_parser.add_argument('sort', type=str, location='args',
+                             choices=('relevance', 'distance', 'date_posted', 'salary', 'title'),
+                             help='Sort order (default: relevance when q is given, distance when near is, else date_posted); '
+                                  'salary is by yearly pay and requires salary_currency')
+job_list_parser.add_argument('limit', type=int, location='args', help='Page size (max 100); enables paging')
+job_list_parser.add_argument('cursor', type=str, location='args', help='next_cursor from the previous page')
+job_list_parser.add_argument('fields', type=str, location='args', help='Comma-separated Job fields to return (default: all)')
+
+# Export streams every match, so it takes the list args minus paging
+job_export_parser = job_list_parser.copy()
+job_export_parser.remove_argument('limit')
+job_export_parser.remove_argument('cursor')
+job_export_parser.add_argument('format', type=str, location='args', choices=EXPORT_FORMATS, default='ndjson')
+job_export_parser.add_argument('gzip', type=inputs.boolean, location='args', default=False, help='gzip-encode the stream')
+
+job_import_parser = reqparse.RequestParser()
+job_import_parser.add_argument('format', type=str, location='args', choices=IMPORT_FORMATS,
+                               help='Upload format (default: from the Content-Type)')
+
+trending_jobs_parser = reqparse.RequestParser()
+trending_jobs_parser.add_argument('limit', type=int, location='args', default=20,
+                                  help=f'Number of jobs (max {TRENDING_POOL_SIZE})')
+
+similar_jobs_parser = reqparse.RequestParser()
+similar_jobs_parser.add_argument('k', type=int, location='args', default=10, help='Number of similar jobs (max 50)')
+
+job_item_parser = reqparse.RequestParser()
+job_item_parser.add_argument('fields', type=str, location='args', help='Comma-separated Job fields to return (default: all)')
+
+# Keyset sort orders, each backed by a composite index on Job
+JOB_SORTS = {
+    'date_posted': KeysetOrder('date_posted', Job.date_posted, Job.id, descending=True, value_type=datetime),
+    # Yearly pay; only within one salary_currency (see filter_jobs)
+    'salary': KeysetOrder('salary', Job.salary_annual_max, Job.id, descending=True),
+    'title': KeysetOrder('title', Job.title, Job.id),
+}
+
+# List filters compared case-insensitively, so normalized in cache keys
+CASE_INSENSITIVE_ARGS = ('location', 'job_type', 'q', 'salary_currency', 'near')
+
+# job_model fields computed per query rather than loaded from a column
+COMPUTED_FIELDS = ('distance_km',)
+
+
+def filter_jobs(args):
+    """Build the Job query selected by job_filter_parser args.
+
+    Returns (query, orders) where orders maps 'relevance' and 'distance' to
+    the KeysetOrder of a keyword or radius search, when one was applied.
+    """
+    query = Job.query
+
+    if args['location']:
+        query = filter_substring(query, Job.location, args['location'])
+    if args['job_type']:
+        query = filter_substring(query, Job.job_type, args['job_type'])
+    if args['company_id']:
+        query = query.filter_by(company_id=args['company_id'])
+    if args['recruiter_id']:
+        query = query.filter_by(recruiter_id=args['recruiter_id'])
+    # A radius search applies is_active inside each of its geohash ranges instead
+    if args['is_active'] is not None and not args.get('near'):
+        query = query.filter_by(is_active=args['is_active'])
+    # Amounts are compared as yearly pay, and only in one currency: there
+    # are no exchange rates to convert with
+    if not args['salary_currency'] and (
+            args['salary_min'] is not None or args['salary_max'] is not None or args.get('sort') == 'salary'):
+        job_ns.abort(400, message='salary_min, salary_max and sort=salary require salary_currency.')
+    # Yearly salary ranges overlap the requested [salary_min, salary_max] band
+    if args['salary_min'] is not None:
+        query = query.filter(Job.salary_annual_max >= args['salary_min'])
+    if args['salary_max'] is not None:
+        query = query.filter(Job.salary_annual_min <= args['salary_max'])
+    if args['salary_currency']:
+        query = query.filter(Job.salary_currency == args['salary_currency'].upper())
+
+    orders = {}
+    if args.get('near'):
+        point = resolve_point(args['near'])
+        if point is None:
+            job_ns.abort(400, message=f"Unknown place '{args['near']}'. Use a city name or \"lat,lon\".")
+        radius = args.get('radius_km')
+        radius = DEFAULT_RADIUS_KM if radius is None else radius
+        if not 0 < radius <= MAX_RADIUS_KM:
+            job_ns.abort(400, message=f"radius_km must be greater than 0 and at most {MAX_RADIUS_KM:g}.")
+        query, orders['distance'] = filter_near(query, *point, radius, args['is_active'])
+    if args['q']:
+        searched, relevance = search_jobs(query, args['q'])
+        if searched is None:
+            job_ns.abort(400, message="'q' has no searchable words.")
+        query, orders['relevance'] = searched, relevance
+    return query, orders
+
+
+def sorted_jobs(query, orders, sort, field_names):
+    """Apply the requested sort's loader options; returns (query, KeysetOrder).
+
+    `orders` comes from filter_jobs. The caller orders (or paginates) by the
+    returned KeysetOrder. Radius searches always load Job.distance_km.
+    """
+    sort = sort or next((name for name in ('relevance', 'distance') if name in orders), 'date_posted')
+    order = orders.get(sort) or JOB_SORTS.get(sort, JOB_SORTS['date_posted'])
+    if 'distance' in orders:
+        query = with_distance(query, orders['distance'])
+    else:
+        # with_expression() for search_rank alone would leave distance_km
+        # expired on jobs already in the session, and serializing it then fails
+        query = query.options(with_expression(Job.distance_km, null()))
+    if order is orders.get('relevance'):
+        return with_relevance(query.options(*job_load_options(field_names)), order), order
+    if order is orders.get('distance'):
+        return query.options(*job_load_options(field_names)), order
+    return query.options(*job_load_options(field_names, order.column)), order
+
+
+# --- Sparse fieldsets ---
+
+# Marshalling models per requested field set, built on first use
+_sparse_models = {}
+
+
+def parse_job_fields(raw):
+    """Return the job_model field names listed in `raw` (in model order), or None for all."""
+    if not raw:
+        return None
+    requested = {name.strip() for name in raw.split(',') if name.strip()}
+    unknown = requested - set(job_model)
+    if unknown:
+        job_ns.abort(400, message=f"Unknown fields: {', '.join(sorted(unknown))}. "
+                                  f"Valid fields: {', '.join(job_model)}")
+    return tuple(name for name in job_model if name in requested)
+
+
+def sparse_job_models(field_names):
+    """Return (item model, page model) restricted to `field_names`."""
+    if field_names is None:
+        return job_model, job_page_model
+    models = _sparse_models.get(field_names)
+    if models is None:
+        item = {name: job_model[name] for name in field_names}
+        page = {
+            'items': fields.List(fields.Nested(item)),
+            'next_cursor': job_page_model['next_cursor'],
+            'limit': job_page_model['limit'],
+        }
+        models = _sparse_models[field_names] = (item, page)
+    return models
+
+
+def job_load_options(field_names, *extra_columns):
+    """Loader options that fetch only the columns and joins `field_names` need.
+
+    id and company_id are always loaded (identity and cache bookkeeping),
+    plus any `extra_columns` the caller sorts on.
+    """
+    if field_names is None:
+        return [joinedload(Job.company), joinedload(Job.recruiter)]
+    columns = {Job.id, Job.company_id, *extra_columns}
+    joins = []
+    for name in field_names:
+        source = (job_model[name].attribute or name).split('.')[0]
+        if source in COMPUTED_FIELDS:
+            continue
+        if source == 'company':
+            joins.append(joinedload(Job.company).load_only(Company.name))
+        elif source == 'recruiter':
+            joins.append(joinedload(Job.recruiter).load_only(User.username))
+        else:
+            columns.add(getattr(Job, source))
+    return [load_only(*columns)] + joins
+
+
+def scored_jobs(matches, limit=None, active_only=False):
+    """Serialize [(job id, score)] matches in order, each job with its score.
+
+    Jobs are fetched in one query; ids that no longer exist (or are
+    inactive, with `active_only`) are skipped before `limit` applies.
+    """
+    query = Job.query.options(*job_load_options(None)).filter(Job.id.in_([job_id for job_id, _ in matches]))
+    if active_only:
+        query = query.filter(Job.is_active == True)  # noqa: E712
+    jobs = {job.id: job for job in query}
+    matches = [(job_id, score) for job_id, score in matches if job_id in jobs][:limit]
+    return [dict(serialize(jobs[job_id], job_model), score=round(score, 4)) for job_id, score in matches]
+
+
+# --- Response caching ---
+
+def normalized_list_args(args):
+    """The non-empty list args, with case-insensitive text filters normalized."""
+    return {
+        key: normalize_text(value) if key in CASE_INSENSITIVE_ARGS and isinstance(value, str) else value
+        for key, value in args.items() if value is not None
+    }
+
+
+def list_cache_key(normalized_args):
+    return 'jobs:list:' + json.dumps(normalized_args, sort_keys=True)
+
+
+def item_cache_key(job_id, field_names=None):
+    return f'jobs:item:{job_id}:' + ','.join(field_names or ('*',))
+
+
+def cache_meta(kind, jobs, args=None):
+    """Describe a cached response so writers can tell whether it is affected."""
+    return {
+        'kind': kind,
+        'args': args,
+        'job_ids': [job.id for job in jobs],
+        'company_ids': sorted({job.company_id for job in jobs if job.company_id}),
+        'recruiter_ids': sorted({job.recruiter_id for job in jobs}),
+    }
+
+
+# Columns PATCH /jobs may change
+BATCH_CHANGE_FIELDS = ('is_active', 'expires_date', 'company_id')
+
+
+def owned_by(user_id):
+    """SQL condition: the job was posted by `user_id` or belongs to a company they own."""
+    return or_(Job.recruiter_id == user_id, Job.company_id.in_(select(Company.id).where(Company.owner_id == user_id)))
+
+
+def require_job_owner(job_id):
+    """Abort with 404 if the job does not exist, or 403 if the caller does not own it."""
+    owned = db.session.execute(select(owned_by(int(get_jwt_identity()))).where(Job.id == job_id)).scalar()
+    if owned is None:
+        job_ns.abort(404, message="Job not found")
+    if not owned:
+        job_ns.abort(403, message="You can only manage applicants to your own jobs.")
+
+
+def update_jobs(query, changes, user_id):
+    """Apply `changes` to the jobs of `query` that `user_id` owns, in one UPDATE.
+
+    Returns (matched, updated ids). The change is recorded for the caches
+    and indexes, and jobs moved to another company take their application
+    stats along; the caller commits.
+    """
+    owned = owned_by(user_id)
+    matched = query.with_entities(func.count(Job.id)).scalar()
+    # correlate(None): the subquery must read jobs itself, not the row being updated
+    selected = query.filter(owned).with_entities(Job.id).statement.correlate(None)
+    if 'company_id' in changes:
+        previous = dict(db.session.execute(select(Job.id, Job.company_id).where(Job.id.in_(selected))).all())
+    statement = update(Job).where(Job.id.in_(selected)).values(**changes)
+    options = {'synchronize_session': False}
+    if db.session.get_bind().dialect.update_returning:
+        ids = db.session.execute(statement.returning(Job.id), execution_options=options).scalars().all()
+    else:
+        ids = db.session.execute(selected).scalars().all()
+        db.session.execute(update(Job).where(Job.id.in_(ids)).values(**changes), execution_options=options)
+    record_job_changes(db.session, 'update', [{'id': job_id, **changes} for job_id in ids])
+    if 'company_id' in changes:
+        move_jobs(db.session.connection(), [(job_id, previous.get(job_id), changes['company_id']) for job_id in ids])
+    return matched, ids
+
+
+def job_matches_filters(args, values):
+    """Whether a job with column `values` could belong to a list filtered by `args`.
+
+    Answers True for anything it cannot decide from `values` alone (keyword
+    searches, columns not loaded), so callers over-invalidate rather than
+    serve stale lists.
+    """
+    for key in ('location', 'job_type'):
+        if args.get(key) and key in values and args[key] not in normalize_text(values[key]):
+            return False
+    for key in ('company_id', 'recruiter_id'):
+        if args.get(key) and key in values and values[key] != args[key]:
+            return False
+    if args.get('is_active') is not None and 'is_active' in values and bool(values['is_active']) != args['is_active']:
+        return False
+    if args.get('salary_min') is not None and 'salary_annual_max' in values:
+        if values['salary_annual_max'] is None or values['salary_annual_max'] < args['salary_min']:
+            return False
+    if args.get('salary_max') is not None and 'salary_annual_min' in values:
+        if values['salary_annual_min'] is None or values['salary_annual_min'] > args['salary_max']:
+            return False
+    if args.get('salary_currency') and 'salary_currency' in values:
+        if (values['salary_currency'] or '').lower() != args['salary_currency']:
+            return False
+    if args.get('near') and 'latitude' in values and 'longitude' in values:
+        point = resolve_point(args['near'])
+        if values['latitude'] is None or point is not None and haversine_km(
+                *point, values['latitude'], values['longitude']) > args.get('radius_km', DEFAULT_RADIUS_KM):
+            return False
+    return True
+
+
+@on_jobs_committed
+def invalidate_cached_jobs(changes):
+    """Drop cached responses that contain a changed job or that it now matches."""
+    changed_ids = {values['id'] for _, values in changes}
+
+    def affected(meta):
+        if changed_ids.intersection(meta['job_ids']):
+            return True
+        return meta['kind'] == 'list' and any(
+            op != 'delete' and job_matches_filters(meta['args'], values) for op, values in changes
+        )
+
+    response_cache.invalidate(affected)
+
+
+def invalidate_cached_company(company_id):
+    """Drop cached job responses that embed `company_id`'s details (e.g. after a rename)."""
+    response_cache.invalidate(lambda meta: company_id in meta['company_ids'])
+    facet_cache.clear()
+
+
+def invalidate_cached_recruiter(user_id):
+    """Drop cached job responses that embed `user_id`'s details (e.g. recruiter_username after a rename)."""
+    response_cache.invalidate(lambda meta: user_id in meta.get('recruiter_ids', ()))
+
 
 # /jobs
 @job_ns.route('/', strict_slashes=False)
 class JobList(Resource):
     @job_ns.expect(job_list_parser)
-    @job_ns.marshal_list_with(job_model)
+    @job_ns.response(200, 'Success', job_page_model)
+    @conditional('jobs', 'company', 'users')
     def get(self):
-        """Fetch list of jobs with optional filters."""
+        """Fetch list of jobs with optional filters.
+
+        Without `limit`/`cursor` the full list is returned as before; with
+        either, a JobPage envelope is returned and paged by keyset.
+        """
         args = job_list_parser.parse_args()
-        query = Job.query.options(joinedload(Job.company), joinedload(Job.recruiter))
+        cache_args = normalized_list_args(args)
+        cache_key = list_cache_key(cache_args)
+        cached = response_cache.get(cache_key, request_versions())
+        if cached is not None:
+            return cached
 
-        if args['location']:
-            query = query.filter(Job.location.ilike(f"%{args['location']}%"))
-        if args['job_type']:
-            query = query.filter(Job.job_type.ilike(f"%{args['job_type']}%"))
-        if args['company_id']:
-            query = query.filter_by(company_id=args['company_id'])
-        if args['recruiter_id']:
-            query = query.filter_by(recruiter_id=args['recruiter_id'])
-        if args['is_active'] is not None:
-            query = query.filter_by(is_active=args['is_active'])
+        field_names = parse_job_fields(args['fields'])
+        item_model, page_model = sparse_job_models(field_names)
 
-        return query.all()
+        query, orders = filter_jobs(args)
+        query, order = sorted_jobs(query, orders, args['sort'], field_names)
+
+        if args['limit'] is None and not args['cursor']:
+            jobs = query.order_by(*order.order_by()).all()
+            data = serialize(jobs, item_model)
+        else:
+            try:
+                jobs, next_cursor = paginate(query, order, args['limit'], args['cursor'])
+            except InvalidCursor as e:
+                job_ns.abort(400, message=str(e))
+            page = {'items': jobs, 'next_cursor': next_cursor, 'limit': clamp_page_size(args['limit'])}
+            data = serialize(page, page_model)
+
+        return response_cache.store(cache_key, data, cache_meta('list', jobs, cache_args), request_versions())
 
     @job_ns.expect(job_create_model, validate=True)
     @job_ns.marshal_with(job_model, code=201)
@@ -104,6 +628,14 @@ class JobList(Resource):
             if not company:
                 job_ns.abort(404, message="Company not found.")
 
+        duplicate_of = None
+        if duplicate_policy() != 'off':
+            match = duplicate_jobs.find(data['title'], data['description'], data.get('company_id'), data['recruiter_id'])
+            if match and duplicate_policy() == 'reject':
+                job_ns.abort(409, message=f"Near-duplicate of active job {match[0]} ({match[1]:.0%} similar).",
+                             duplicate_of=match[0], similarity=match[1])
+            duplicate_of = match[0] if match else None
+
         try:
             new_job = Job(
                 title=data['title'],
@@ -117,7 +649,8 @@ class JobList(Resource):
                 company_id=data.get('company_id'),
                 image=data.get('image'),
                 date_posted=datetime.utcnow(),
-                is_active=True
+                is_active=True,
+                duplicate_of_id=duplicate_of,
             )
             db.session.add(new_job)
             db.session.commit()
@@ -126,17 +659,206 @@ class JobList(Resource):
             db.session.rollback()
             job_ns.abort(500, message=f"Error creating job: {str(e)}")
 
+    @jwt_required()
+    @job_ns.expect(job_batch_update_model, validate=True)
+    @job_ns.marshal_with(job_batch_result_model)
+    def patch(self):
+        """Close, reopen, extend or move many of the caller's jobs, selected by ids and/or a filter."""
+        user_id = int(get_jwt_identity())
+        data = request.get_json()
+        if data.get('ids') is None and data.get('filter') is None:
+            job_ns.abort(400, message="Select jobs with 'ids', 'filter' or both.")
+        changes = {key: value for key, value in data['changes'].items() if key in BATCH_CHANGE_FIELDS}
+        if not changes:
+            job_ns.abort(400, message=f"'changes' must set at least one of: {', '.join(BATCH_CHANGE_FIELDS)}.")
+        if 'is_active' in changes and changes['is_active'] is None:
+            job_ns.abort(400, message="'is_active' cannot be null.")
+        if changes.get('expires_date') is not None:
+            try:
+                changes['expires_date'] = parse_datetime(changes['expires_date'])
+            except ValueError:
+                job_ns.abort(400, message="'expires_date' must be an ISO 8601 date or datetime.")
+        if changes.get('company_id') is not None and not db.session.get(Company, changes['company_id']):
+            job_ns.abort(404, message="Company not found.")
+
+        query = Job.query
+        if data.get('filter') is not None:
+            args = {arg.name: None for arg in job_filter_parser.args}
+            args.update(data['filter'])
+            query, _ = filter_jobs(args)
+        if data.get('ids') is not None:
+            query = query.filter(Job.id.in_(data['ids']))
+
+        try:
+            matched, ids = update_jobs(query, changes, user_id)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            job_ns.abort(500, message=f"Error updating jobs: {str(e)}")
+        return {'matched': matched, 'updated': len(ids), 'not_owned': matched - len(ids)}
+
+# /jobs/bulk
+@job_ns.route('/bulk', strict_slashes=False)
+class JobBulkImport(Resource):
+    @job_ns.expect(job_import_parser)
+    @job_ns.response(201, 'Every row was created', job_import_model)
+    @job_ns.response(207, 'Some rows failed; see each result', job_import_model)
+    @job_ns.marshal_with(job_import_model)
+    def post(self):
+        """Create many job listings from a JSON array, NDJSON or CSV upload (raw body or multipart 'file')."""
+        args = job_import_parser.parse_args()
+        try:
+            fmt, stream = upload_format(request, args['format'])
+            rows, failed = validate_rows(read_rows(stream, fmt, current_app.config.get('BULK_IMPORT_MAX_ROWS', 5000)))
+        except InvalidUpload as e:
+            job_ns.abort(e.status, message=str(e))
+        if not rows and not failed:
+            job_ns.abort(400, message='The upload has no rows.')
+
+        # {row number: (existing job id, earlier row number, similarity)}
+        duplicates = duplicate_jobs.find_many(rows) if duplicate_policy() != 'off' else {}
+        if duplicate_policy() == 'reject':
+            for number, (job_id, earlier, _) in duplicates.items():
+                original = f'job {job_id}' if job_id is not None else f'row {earlier}'
+                failed[number] = {'row': f'Near-duplicate of {original}.'}
+            rows = [(number, values) for number, values in rows if number not in duplicates]
+        else:
+            for number, values in rows:
+                if number in duplicates:
+                    values['duplicate_of_id'] = duplicates[number][0]
+        created, rejected = insert_jobs(rows)
+        failed.update(rejected)
+        # Rows duplicating an earlier row of the upload are flagged once both have ids
+        pairs = [(created[number], created[earlier]) for number, (job_id, earlier, _) in duplicates.items()
+                 if earlier is not None and number in created and earlier in created]
+        if pairs:
+            try:
+                flag_duplicates(pairs)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                current_app.logger.exception('Flagging duplicate rows of a job import failed')
+
+        def duplicate_of(number):
+            job_id, earlier, _ = duplicates.get(number, (None, None, None))
+            return job_id if job_id is not None else created.get(earlier)
+
+        results = [{'row': number, 'status': 'created', 'id': job_id, 'duplicate_of': duplicate_of(number)}
+                   for number, job_id in created.items()]
+        results += [{'row': number, 'status': 'failed', 'errors': errors, 'duplicate_of': duplicate_of(number)}
+                    for number, errors in failed.items()]
+        results.sort(key=lambda result: result['row'])
+        body = {'created': len(created), 'failed': len(failed), 'results': results}
+        return body, 207 if failed else 201
+
+# /jobs/export
+@job_ns.route('/export', strict_slashes=False)
+class JobExport(Resource):
+    @job_ns.expect(job_export_parser)
+    @job_ns.produces([MIMETYPES['ndjson'], MIMETYPES['csv']])
+    @job_ns.response(200, 'Matching jobs, one per line (NDJSON) or row (CSV)')
+    @conditional('jobs', 'company', 'users')
+    def get(self):
+        """Stream every job matching the list filters as NDJSON or CSV."""
+        args = job_export_parser.parse_args()
+        field_names = parse_job_fields(args['fields'])
+        item_model, _ = sparse_job_models(field_names)
+        query, orders = filter_jobs(args)
+        query, order = sorted_jobs(query, orders, args['sort'], field_names)
+        return export_response(query.order_by(*order.order_by()), item_model, args['format'], 'jobs', args['gzip'])
+
+# /jobs/facets
+@job_ns.route('/facets', strict_slashes=False)
+class JobFacets(Resource):
+    @job_ns.expect(job_filter_parser)
+    @conditional('jobs', 'company')
+    @job_ns.marshal_with(job_facets_model)
+    def get(self):
+        """Count matching jobs per job type, location, company and salary band (with salary_currency)."""
+        args = job_filter_parser.parse_args()
+        query, _ = filter_jobs(args)
+        # Keyed on the table versions too, so counts are never older than the ETag
+        cache_key = (tuple(sorted(args.items())), tuple(map(tuple, request_versions())))
+        return cached_job_facets(cache_key, query, salary_bands=bool(args['salary_currency']))
+
+# /jobs/cache/stats
+@job_ns.route('/cache/stats', strict_slashes=False)
+class JobCacheStats(Resource):
+    @job_ns.marshal_with(response_cache_stats_model)
+    def get(self):
+        """Hit/miss counters for the job response cache."""
+        return response_cache.stats()
+
+# /jobs/expiry/stats
+@job_ns.route('/expiry/stats', strict_slashes=False)
+class JobExpiryStats(Resource):
+    @job_ns.marshal_with(expiry_sweep_stats_model)
+    def get(self):
+        """Throughput and lag of the expired job sweeper (this worker)."""
+        return expiry_sweeper.stats()
+
+# /jobs/views/stats
+@job_ns.route('/views/stats', strict_slashes=False)
+class JobViewStats(Resource):
+    @job_ns.marshal_with(job_view_stats_model)
+    def get(self):
+        """Flush counters of the buffered job view counts (this worker)."""
+        return job_views.stats()
+
+# /jobs/trending
+@job_ns.route('/trending', strict_slashes=False)
+class TrendingJobList(Resource):
+    @job_ns.expect(trending_jobs_parser)
+    @job_ns.response(200, 'Success', [trending_job_model])
+    def get(self):
+        """Active jobs with the most recent detail views, best first (refreshed every TRENDING_REFRESH_INTERVAL)."""
+        limit = max(1, min(trending_jobs_parser.parse_args()['limit'] or 20, TRENDING_POOL_SIZE))
+        return scored_jobs(trending_jobs.top(limit), active_only=True)
+
+location_suggest_parser = reqparse.RequestParser()
+location_suggest_parser.add_argument('q', type=str, location='args', required=True, help='Location text, possibly misspelled')
+location_suggest_parser.add_argument('limit', type=int, location='args', default=5)
+
+# /jobs/locations/suggest
+@job_ns.route('/locations/suggest', strict_slashes=False)
+class LocationSuggestions(Resource):
+    @job_ns.expect(location_suggest_parser)
+    @conditional('jobs')
+    @job_ns.marshal_with(location_suggestions_model)
+    def get(self):
+        """Suggest known job locations similar to the given text."""
+        args = location_suggest_parser.parse_args()
+        limit = max(1, min(args['limit'] or 5, 20))
+        matches = suggest_values(Job.location, args['q'], limit=limit)
+        return {
+            'query': args['q'],
+            'suggestions': [{'location': value, 'score': score, 'jobs': count} for value, score, count in matches],
+        }
+
 # /jobs/<job_id>
 @job_ns.route('/<int:job_id>', strict_slashes=False)
 @job_ns.param('job_id', 'The job ID')
 class JobResource(Resource):
-    @job_ns.marshal_with(job_model)
+    @job_ns.expect(job_item_parser)
+    @job_ns.response(200, 'Success', job_model)
+    # A browser revalidating its cached copy is still a view
+    @conditional('jobs', 'company', 'users', on_not_modified=lambda self, job_id: job_views.record(job_id))
     def get(self, job_id):
         """Retrieve a single job by ID."""
-        job = Job.query.options(joinedload(Job.company), joinedload(Job.recruiter)).get(job_id)
+        field_names = parse_job_fields(job_item_parser.parse_args()['fields'])
+        cache_key = item_cache_key(job_id, field_names)
+        cached = response_cache.get(cache_key, request_versions())
+        if cached is not None:
+            job_views.record(job_id)
+            return cached
+
+        job = Job.query.options(*job_load_options(field_names)).get(job_id)
         if not job:
             job_ns.abort(404, message="Job not found")
-        return job
+        job_views.record(job_id)
+        item_model, _ = sparse_job_models(field_names)
+        return response_cache.store(cache_key, serialize(job, item_model), cache_meta('item', [job]),
+                                    request_versions())
 
     @job_ns.expect(job_update_model, validate=True)
     @job_ns.marshal_with(job_model)
@@ -188,3 +910,130 @@ class JobResource(Resource):
         except Exception as e:
             db.session.rollback()
             job_ns.abort(500, message=f"Error deleting job: {str(e)}")
+
+# /jobs/<job_id>/stats
+@job_ns.route('/<int:job_id>/stats', strict_slashes=False)
+@job_ns.param('job_id', 'The job ID')
+class JobStats(Resource):
+    @job_ns.marshal_with(job_stat_model)
+    def get(self, job_id):
+        """View counts of a job, including views this worker has not flushed yet."""
+        if not db.session.get(Job, job_id):
+            job_ns.abort(404, message="Job not found")
+        stat = db.session.get(JobStat, job_id)
+        pending = job_views.pending(job_id)
+        now = datetime.utcnow()
+        score = trend_score(stat.trend_key, now, decay_rate()) if stat else 0.0
+        return {
+            'job_id': job_id,
+            'views': (stat.views if stat else 0) + pending,
+            'trend_score': round(score + pending, 4),
+            'last_viewed_at': stat.last_viewed_at if stat else None,
+        }
+
+# /jobs/<job_id>/similar
+@job_ns.route('/<int:job_id>/similar', strict_slashes=False)
+@job_ns.param('job_id', 'The job ID')
+class SimilarJobs(Resource):
+    @job_ns.expect(similar_jobs_parser)
+    @job_ns.response(200, 'Success', [similar_job_model])
+    @conditional('jobs', 'company', 'users')
+    def get(self, job_id):
+        """Active jobs most similar to this one, best match first."""
+        k = max(1, min(similar_jobs_parser.parse_args()['k'] or 10, 50))
+        matches = similar_jobs.similar(job_id, k)
+        if matches is None:
+            job_ns.abort(404, message="Job not found")
+        return scored_jobs(matches)
+
+# /jobs/<job_id>/applications
+@job_ns.route('/<int:job_id>/applications', strict_slashes=False)
+@job_ns.param('job_id', 'The job ID')
+class JobApplicationList(Resource):
+    @jwt_required()
+    @job_ns.expect(job_applications_parser)
+    @job_ns.response(200, 'Success', applicant_page_model)
+    @conditional('applications', 'jobs', 'company', 'users')
+    def get(self, job_id):
+        """Applicants to one of the caller's jobs, a keyset page at a time, with counts per status.
+
+        With q, only candidates whose resume or cover letter match, best first.
+        """
+        require_job_owner(job_id)
+        args = job_applications_parser.parse_args()
+        expand = 'applicant' in (args['_expand'] or ())
+        query = filter_job_applications(job_id, parse_statuses(args['status']))
+        sort = args['sort'] or ('relevance' if args['q'] else 'newest')
+        if args['q']:
+            query, relevance = search_applications(query, args['q'])
+            if query is None:
+                job_ns.abort(400, message="'q' has no searchable words.")
+            if sort == 'relevance':
+                query = with_application_relevance(query, relevance)
+        elif sort == 'relevance':
+            job_ns.abort(400, message="sort=relevance needs a 'q' search.")
+        order = relevance if sort == 'relevance' else APPLICANT_SORTS[sort]
+        if expand:
+            # One IN query for the page's applicants instead of a lazy load per row
+            query = query.options(selectinload(Application.applicant).load_only(User.username, User.email))
+        try:
+            applications, next_cursor = paginate(query, order, args['limit'], args['cursor'])
+        except InvalidCursor as e:
+            job_ns.abort(400, message=str(e))
+        counts, total = application_status_counts(job_id)
+        page = {
+            'items': applications,
+            'next_cursor': next_cursor,
+            'limit': clamp_page_size(args['limit']),
+            'counts': counts,
+            'total': total,
+        }
+        return json_response(serialize(page, APPLICANT_PAGE_MODELS[expand]))
+
+# /jobs/<job_id>/applications/stats
+@job_ns.route('/<int:job_id>/applications/stats', strict_slashes=False)
+@job_ns.param('job_id', 'The job ID')
+class JobApplicationStats(Resource):
+    @jwt_required()
+    @conditional('applications', 'jobs')
+    @job_ns.marshal_with(application_stats_model)
+    def get(self, job_id):
+        """Application counters of one of the caller's jobs, read from job_application_stats."""
+        require_job_owner(job_id)
+        return application_stats(db.session.get(JobApplicationStat, job_id))
+
+# /jobs/<job_id>/applications/status
+@job_ns.route('/<int:job_id>/applications/status', strict_slashes=False)
+@job_ns.param('job_id', 'The job ID')
+class JobApplicationStatus(Resource):
+    @jwt_required()
+    @job_ns.expect(application_status_update_model, validate=True)
+    @job_ns.marshal_with(application_status_result_model)
+    def patch(self, job_id):
+        """Move many applicants to one of the caller's jobs to a status at once; notifications follow asynchronously."""
+        require_job_owner(job_id)
+        data = request.get_json()
+        if data.get('ids') is None and data.get('filter') is None:
+            job_ns.abort(400, message="Select applications with 'ids', 'filter' or both.")
+
+        selection = data.get('filter') or {}
+        query = filter_job_applications(job_id, parse_statuses(selection.get('status')))
+        try:
+            if selection.get('applied_before') is not None:
+                query = query.filter(Application.application_date < parse_datetime(selection['applied_before']))
+            if selection.get('applied_after') is not None:
+                query = query.filter(Application.application_date >= parse_datetime(selection['applied_after']))
+        except ValueError:
+            job_ns.abort(400, message="'applied_before' and 'applied_after' must be ISO 8601 dates or datetimes.")
+        if data.get('ids') is not None:
+            query = query.filter(Application.id.in_(data['ids']))
+
+        try:
+            matched, rows = update_application_statuses(query, data['status'])
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            job_ns.abort(500, message=f"Error updating applications: {str(e)}")
+        if rows:
+            outbox_dispatcher.notify()
+        return {'matched': matched, 'updated': len(rows), 'unchanged': matched - len(rows)}
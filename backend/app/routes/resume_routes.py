@@ -0,0 +1,143 @@
+# backend/app/routes/resume_routes.py
+
+import os
+
+from flask import current_app, request
+from flask_restx import Namespace, Resource, fields
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app import db
+from app.models import Application, Job, ResumeBlob, ResumeUpload
+from app.candidate_search import enqueue_extractions, resume_extractor
+from app.resume_store import InvalidResume, blob_path, send_blob, store, valid_digest
+from app.routes.job_routes import owned_by
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+
+resume_ns = Namespace('resumes', description='Resume upload and download')
+
+resume_upload_model = resume_ns.model('ResumeUpload', {
+    'id': fields.String(attribute='blob_id', description='SHA-256 of the file; pass as resume_blob_id when applying'),
+    'size': fields.Integer(attribute='blob.size', description='Bytes'),
+    'content_type': fields.String(attribute='blob.content_type'),
+    'filename': fields.String(description='Name the file was uploaded with'),
+    'uploaded_at': fields.DateTime(dt_format='iso8601'),
+})
+
+resume_extraction_stats_model = resume_ns.model('ResumeExtractionStats', {
+    'running': fields.Boolean(description='Whether the background extraction thread runs in this worker'),
+    'extracted': fields.Integer(description='Resumes extracted by this worker'),
+    'failed': fields.Integer(description='Resumes this worker gave up on'),
+    'timeouts': fields.Integer(),
+    'errors': fields.Integer(),
+    'queue': fields.Raw(description='Jobs in resume_extractions by status (all workers)'),
+    'last_run_at': fields.DateTime(dt_format='iso8601'),
+})
+
+
+def upload_stream(req):
+    """(binary stream, filename) of the upload: a raw body or a multipart 'file'.
+
+    Werkzeug spools multipart file parts over 500 KB to a temporary file,
+    and a raw body is read from the socket as it arrives, so neither is
+    held in memory whole.
+    """
+    max_bytes = current_app.config.get('RESUME_MAX_BYTES', 10 * 1024 * 1024)
+    # Refuse what is announced too large before reading any of it
+    if req.content_length is not None and req.content_length > max_bytes:
+        raise InvalidResume(f'Resumes are limited to {max_bytes} bytes.', status=413)
+    if req.mimetype == 'multipart/form-data':
+        upload = req.files.get('file')
+        if upload is None:
+            raise InvalidResume("Multipart uploads must carry the resume in a 'file' field.")
+        return upload.stream, upload.filename
+    return req.stream, req.args.get('filename')
+
+
+def record_upload(user_id, digest, size, content_type, filename):
+    """Insert the blob (if new) and the user's upload of it (if new); returns (upload, created).
+
+    Both are INSERT ... ON CONFLICT DO NOTHING, so concurrent uploads of
+    the same file cannot collide. A new blob is queued for text
+    extraction. The caller commits.
+    """
+    module = postgresql if db.session.get_bind().dialect.name == 'postgresql' else sqlite
+    new_blob = db.session.execute(
+        module.insert(ResumeBlob).values(id=digest, size=size, content_type=content_type)
+        .on_conflict_do_nothing(index_elements=['id'])
+        .returning(ResumeBlob.id)
+    ).first() is not None
+    if new_blob:
+        enqueue_extractions(db.session, [digest])
+    filename = os.path.basename(filename)[:255] if filename else None
+    created = db.session.execute(
+        module.insert(ResumeUpload).values(user_id=user_id, blob_id=digest, filename=filename)
+        .on_conflict_do_nothing(index_elements=['user_id', 'blob_id'])
+        .returning(ResumeUpload.id)
+    ).first() is not None
+    upload = ResumeUpload.query.filter_by(user_id=user_id, blob_id=digest).one()
+    return upload, created
+
+
+def resume_access(user_id, digest):
+    """SQL condition: `user_id` uploaded the resume or owns a job it was sent to."""
+    uploaded = select(ResumeUpload.id).where(ResumeUpload.user_id == user_id, ResumeUpload.blob_id == digest)
+    received = (select(Application.id).join(Job, Job.id == Application.job_id)
+                .where(Application.resume_blob_id == digest, owned_by(user_id)))
+    return uploaded.exists() | received.exists()
+
+
+@resume_ns.route('', strict_slashes=False)
+class ResumeList(Resource):
+    @jwt_required()
+    @resume_ns.doc(description='Upload a PDF, DOCX or DOC resume as the raw body (optionally ?filename=) '
+                               "or as a multipart 'file'. Identical files are stored once.",
+                   responses={200: 'Already uploaded by the caller', 413: 'Too large', 415: 'Not a PDF, DOCX or DOC'})
+    @resume_ns.marshal_with(resume_upload_model, code=201)
+    def post(self):
+        """Upload a resume"""
+        user_id = int(get_jwt_identity())
+        try:
+            stream, filename = upload_stream(request)
+            digest, size, content_type = store(stream)
+        except InvalidResume as e:
+            resume_ns.abort(e.status, message=str(e))
+        upload, created = record_upload(user_id, digest, size, content_type, filename)
+        db.session.commit()
+        resume_extractor.notify()
+        return upload, 201 if created else 200
+
+    @jwt_required()
+    @resume_ns.marshal_list_with(resume_upload_model)
+    def get(self):
+        """The caller's uploaded resumes, newest first"""
+        return (ResumeUpload.query.filter_by(user_id=int(get_jwt_identity()))
+                .order_by(ResumeUpload.uploaded_at.desc(), ResumeUpload.id.desc()).all())
+
+
+@resume_ns.route('/<string:blob_id>')
+@resume_ns.param('blob_id', 'SHA-256 of the resume')
+class ResumeFile(Resource):
+    @jwt_required()
+    @resume_ns.produces(['application/pdf', 'application/octet-stream'])
+    @resume_ns.doc(description='Download a resume the caller uploaded or received with an application. '
+                               'Supports Range requests and If-None-Match; cacheable privately for good.',
+                   responses={200: 'The file', 206: 'The requested range', 304: 'Not modified',
+                              404: 'Not found (or not yours)'})
+    def get(self, blob_id):
+        """Download a resume"""
+        user_id = int(get_jwt_identity())
+        # Unreadable and missing resumes look the same, so ids cannot be probed
+        blob = db.session.get(ResumeBlob, blob_id) if valid_digest(blob_id) else None
+        if blob is None or not os.path.exists(blob_path(blob_id)) \
+                or not db.session.execute(select(resume_access(user_id, blob_id))).scalar():
+            resume_ns.abort(404, message="Resume not found")
+        upload = ResumeUpload.query.filter_by(blob_id=blob_id, user_id=user_id).first()
+        return send_blob(blob, upload.filename if upload is not None else None)
+
+
+@resume_ns.route('/extraction/stats', strict_slashes=False)
+class ResumeExtractionStats(Resource):
+    @resume_ns.marshal_with(resume_extraction_stats_model)
+    def get(self):
+        """Counters of resume text extraction (this worker) and its queue"""
+        return resume_extractor.stats()
@@ -1,7 +1,12 @@
 from flask import request
 from flask_restx import Namespace, Resource, fields
+from datetime import datetime
 from app import db
-from app.models import SavedJob
+from app.models import Job, SavedJob
+from app.recommendations import invalidate_recommendations
+from app.versioning import conditional
+from sqlalchemy import literal, select
+from sqlalchemy.dialects import postgresql, sqlite
 
 saved_ns = Namespace('saved_jobs', description='Saved Jobs operations', strict_slashes=False)
 
@@ -19,6 +24,24 @@ saved_output = saved_ns.model('SavedJobOut', {
     'saved_at': fields.String(attribute='saved_at.isoformat'),
 })
 
+def insert_saved_job(user_id, job_id):
+    """Save the job in one INSERT ... SELECT ... ON CONFLICT DO NOTHING; returns the new row, or None
+    if the job does not exist or was already saved. The caller commits."""
+    module = postgresql if db.session.get_bind().dialect.name == 'postgresql' else sqlite
+    source = select(literal(user_id), Job.id, literal(datetime.utcnow())).where(Job.id == job_id)
+    statement = (
+        module.insert(SavedJob)
+        .from_select(['user_id', 'job_id', 'saved_at'], source)
+        .on_conflict_do_nothing(index_elements=['user_id', 'job_id'])
+        .returning(SavedJob.id, SavedJob.user_id, SavedJob.job_id, SavedJob.saved_at)
+    )
+    return db.session.execute(statement).first()
+
+
+def saved_job_dict(row):
+    return {"id": row.id, "user_id": row.user_id, "job_id": row.job_id, "saved_at": row.saved_at.isoformat()}
+
+
 # Allow both `/saved_jobs` and `/saved_jobs/`
 @saved_ns.route('/')
 @saved_ns.route('')
@@ -27,6 +50,7 @@ class SavedJobList(Resource):
         return {}, 200
 
     @saved_ns.doc(params={'user_id': 'ID of the user to fetch saved jobs for'})
+    @conditional('saved_jobs')
     @saved_ns.marshal_list_with(saved_output)
     def get(self):
         user_id = request.args.get('user_id', type=int)
@@ -45,14 +69,18 @@ class SavedJobList(Resource):
         if not user_id or not job_id:
             return {"message": "user_id and job_id are required"}, 400
 
-        existing = SavedJob.query.filter_by(user_id=user_id, job_id=job_id).first()
-        if existing:
-            return existing.to_dict(), 200
+        new_saved = insert_saved_job(user_id, job_id)
+        if new_saved is None:
+            db.session.rollback()
+            existing = SavedJob.query.filter_by(user_id=user_id, job_id=job_id).first()
+            if existing:
+                return existing.to_dict(), 200
+            return {"message": "Job not found"}, 404
 
-        new_saved = SavedJob(user_id=user_id, job_id=job_id)
-        db.session.add(new_saved)
+        # The bulk INSERT skips the mapper events that drop cached recommendations
+        invalidate_recommendations(db.session, [user_id])
         db.session.commit()
-        return new_saved.to_dict(), 201
+        return saved_job_dict(new_saved), 201
 
 # Also allow both `/saved_jobs/<job_id>` and `/saved_jobs/<job_id>/`
 @saved_ns.route('/<int:job_id>')
@@ -1,9 +1,13 @@
 # backend/app/routes/user_routes.py
 
 from flask import request
-from flask_restx import Namespace, Resource, fields
+from flask_jwt_extended import get_jwt_identity, jwt_required
+from flask_restx import Namespace, Resource, fields, reqparse
 from app import db
 from app.models import User # Make sure User is imported
+from app.versioning import conditional # ETag / Last-Modified support
+from app.recommendations import cached_recommendations
+from app.routes.job_routes import invalidate_cached_recruiter, job_model, scored_jobs # Cached jobs embed recruiter_username
 from sqlalchemy.exc import IntegrityError, DataError
 
 user_ns = Namespace('users', description='User operations')
@@ -32,10 +36,19 @@ user_update_model = user_ns.model('UserUpdate', {
     'is_recruiter': fields.Boolean(description='Whether the user is a recruiter')
 })
 
+# Job recommended to a user, with how closely it matches their history
+recommended_job_model = user_ns.inherit('RecommendedJob', job_model, {
+    'score': fields.Float(description='Cosine similarity to the saved/applied jobs profile (TF-IDF, 0-1)'),
+})
+
+recommendations_parser = reqparse.RequestParser()
+recommendations_parser.add_argument('k', type=int, location='args', default=20, help='Number of jobs (max 50)')
+
 
 @user_ns.route('/')
 class UserList(Resource):
     @user_ns.doc('list_users')
+    @conditional('users')
     @user_ns.marshal_list_with(user_model)
     def get(self):
         """List all users"""
@@ -80,6 +93,7 @@ class UserList(Resource):
 @user_ns.param('user_id', 'The user unique identifier')
 class UserResource(Resource):
     @user_ns.doc('get_user')
+    @conditional('users')
     @user_ns.marshal_with(user_model)
     def get(self, user_id):
         """Get a user by ID"""
@@ -110,6 +124,9 @@ class UserResource(Resource):
                User.query.filter_by(email=data['email']).first():
                 user_ns.abort(409, message="Email already exists.")
 
+            # A rename changes recruiter_username on every cached job the user posted
+            renamed = 'username' in data and data['username'] != user.username
+
             for key, value in data.items():
                 if key == 'password':
                     user.password_hash = value # Use the setter
@@ -117,6 +134,8 @@ class UserResource(Resource):
                     setattr(user, key, value)
             
             db.session.commit()
+            if renamed:
+                invalidate_cached_recruiter(user_id)
             return user
         except IntegrityError as e:
             db.session.rollback()
@@ -145,4 +164,19 @@ class UserResource(Resource):
             return '', 204
         except Exception as e:
             db.session.rollback()
-            user_ns.abort(500, message=f"An error occurred: {str(e)}")
\ No newline at end of file
+            user_ns.abort(500, message=f"An error occurred: {str(e)}")
+
+
+@user_ns.route('/<int:user_id>/recommendations')
+@user_ns.param('user_id', 'The user unique identifier')
+class UserRecommendations(Resource):
+    @jwt_required()
+    @user_ns.doc('get_recommendations')
+    @user_ns.expect(recommendations_parser)
+    @user_ns.response(200, 'Success', [recommended_job_model])
+    def get(self, user_id):
+        """Active jobs matching what the user saved and applied to, best first"""
+        if user_id != int(get_jwt_identity()):
+            user_ns.abort(403, message="You can only view your own recommendations.")
+        k = max(1, min(recommendations_parser.parse_args()['k'] or 20, 50))
+        return scored_jobs(cached_recommendations(user_id), limit=k, active_only=True)
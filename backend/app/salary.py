@@ -0,0 +1,114 @@
+# backend/app/salary.py
+
+import re
+from collections import namedtuple
+
+ParsedSalary = namedtuple('ParsedSalary', ['min', 'max', 'currency', 'period'])
+
+EMPTY_SALARY = ParsedSalary(None, None, None, None)
+
+CURRENCY_SYMBOLS = {
+    '$': 'USD',
+    '£': 'GBP',
+    '€': 'EUR',
+    '₹': 'INR',
+    '¥': 'JPY',
+    '₦': 'NGN',
+}
+
+# Codes and local abbreviations we see on postings
+CURRENCY_CODES = {
+    'USD': 'USD', 'GBP': 'GBP', 'EUR': 'EUR', 'INR': 'INR', 'JPY': 'JPY',
+    'KES': 'KES', 'KSH': 'KES', 'KSHS': 'KES', 'NGN': 'NGN', 'ZAR': 'ZAR',
+    'UGX': 'UGX', 'TZS': 'TZS', 'CAD': 'CAD', 'AUD': 'AUD',
+}
+
+PERIOD_WORDS = {
+    'hour': 'hour', 'hourly': 'hour', 'hr': 'hour', 'h': 'hour',
+    'day': 'day', 'daily': 'day',
+    'week': 'week', 'weekly': 'week', 'wk': 'week',
+    'month': 'month', 'monthly': 'month', 'mo': 'month', 'pm': 'month',
+    'year': 'year', 'yearly': 'year', 'yr': 'year', 'annum': 'year',
+    'annual': 'year', 'annually': 'year', 'pa': 'year',
+}
+
+MULTIPLIERS = {'k': 1_000, 'm': 1_000_000}
+
+# Paid periods in a year (40-hour, 5-day weeks), to compare pay quoted per
+# hour, day, week or month with yearly pay
+PERIODS_PER_YEAR = {'hour': 2080, 'day': 260, 'week': 52, 'month': 12, 'year': 1}
+
+_AMOUNT_RE = re.compile(r'(\d[\d,]*(?:\.\d+)?)\s*([km])?(?![a-z])', re.IGNORECASE)
+_CODE_RE = re.compile(r'\b([A-Za-z]{3,4})\b')
+_PERIOD_RE = re.compile(r'(?:/|\bper\b|\ban?\b)\s*([a-z]+)|\b(hourly|daily|weekly|monthly|yearly|annually|annual|pa|pm)\b',
+                        re.IGNORECASE)
+
+
+def _currency(text_):
+    for symbol, code in CURRENCY_SYMBOLS.items():
+        if symbol in text_:
+            return code
+    for word in _CODE_RE.findall(text_):
+        code = CURRENCY_CODES.get(word.upper())
+        if code:
+            return code
+    return None
+
+
+def _period(text_):
+    for match in _PERIOD_RE.finditer(text_):
+        word = (match.group(1) or match.group(2)).lower()
+        if word in PERIOD_WORDS:
+            return PERIOD_WORDS[word]
+    return None
+
+
+def parse_salary(text_):
+    """Parse a free-text salary such as "$70,000 - $90,000" or "KES 80k/month".
+
+    Returns a ParsedSalary of whole currency units; fields that cannot be
+    determined are None. A single figure sets both min and max.
+    """
+    if not text_:
+        return EMPTY_SALARY
+
+    amounts = []
+    for number, suffix in _AMOUNT_RE.findall(text_):
+        try:
+            amounts.append((float(number.replace(',', '')), suffix.lower()))
+        except ValueError:
+            continue
+    if not amounts:
+        return EMPTY_SALARY
+
+    # "70 - 90k": a suffix on the upper bound applies to the lower bound too
+    if len(amounts) >= 2 and not amounts[0][1] and amounts[1][1] and amounts[0][0] < 1_000:
+        amounts[0] = (amounts[0][0], amounts[1][1])
+
+    values = [value * MULTIPLIERS.get(suffix, 1) for value, suffix in amounts[:2]]
+    low, high = min(values), max(values)
+    return ParsedSalary(int(round(low)), int(round(high)), _currency(text_), _period(text_))
+
+
+def annualise(amount, period):
+    """`amount` per `period` as yearly pay; a salary that states no period is taken as yearly."""
+    if amount is None:
+        return None
+    return int(round(amount * PERIODS_PER_YEAR[period or 'year']))
+
+
+def salary_columns(text_):
+    """Job salary_* values for a free-text salary.
+
+    salary_annual_min/max are the parsed bounds annualised but left in
+    salary_currency: amounts in different currencies are never compared.
+    """
+    parsed = parse_salary(text_)
+    return {
+        'salary_min': parsed.min,
+        'salary_max': parsed.max,
+        'salary_currency': parsed.currency,
+        'salary_period': parsed.period,
+        'salary_annual_min': annualise(parsed.min, parsed.period),
+        'salary_annual_max': annualise(parsed.max, parsed.period),
+    }
@@ -0,0 +1,171 @@
+# backend/app/search.py
+
+import re
+
+from sqlalchemy import DDL, column, event, func, inspect, literal_column, select, table, text
+from sqlalchemy.orm import with_expression
+
+from app import db
+from app.models import Job
+from app.pagination import KeysetOrder
+
+# Job columns covered by keyword search
+SEARCH_COLUMNS = ('title', 'description', 'requirements')
+
+_COALESCED_COLUMNS = [f"coalesce({c}, '')" for c in SEARCH_COLUMNS]
+
+# SQLite: standalone FTS5 table whose rowid mirrors jobs.id
+FTS_TABLE = 'jobs_fts'
+fts_table = table(FTS_TABLE, column('rowid'))
+FTS_CREATE = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+    f"USING fts5({', '.join(SEARCH_COLUMNS)}, tokenize='porter unicode61')"
+)
+
+# PostgreSQL: GIN index over the same expression used in queries, so the
+# planner can match it. Postgres keeps it current on every write by itself.
+PG_TS_CONFIG = 'english'
+PG_DOCUMENT_SQL = " || ' ' || ".join(_COALESCED_COLUMNS)
+PG_GIN_INDEX = 'ix_jobs_search_tsv'
+PG_GIN_CREATE = (
+    f"CREATE INDEX IF NOT EXISTS {PG_GIN_INDEX} ON jobs "
+    f"USING gin (to_tsvector('{PG_TS_CONFIG}', {PG_DOCUMENT_SQL}))"
+)
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def _dialect_name(bind):
+    return bind.dialect.name
+
+
+def tokenize(text_):
+    """Split user input into plain search terms."""
+    return _TOKEN_RE.findall(text_ or '')
+
+
+def fts5_query(terms):
+    # Quote every term so user input can never be parsed as FTS5 syntax
+    return ' '.join('"{}"'.format(t.replace('"', '""')) for t in terms)
+
+
+# --- Index maintenance (SQLite only) ---
+
+def index_jobs(connection, jobs):
+    """Write (or rewrite) the FTS rows for `jobs` (mappings or Job objects)."""
+    if _dialect_name(connection) != 'sqlite':
+        return
+    rows = []
+    for job in jobs:
+        values = job if isinstance(job, dict) else {k: getattr(job, k) for k in ('id',) + SEARCH_COLUMNS}
+        rows.append({'rowid': values['id'], **{c: values.get(c) or '' for c in SEARCH_COLUMNS}})
+    if not rows:
+        return
+    connection.execute(
+        text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :rowid"),
+        [{'rowid': r['rowid']} for r in rows],
+    )
+    connection.execute(
+        text(f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(SEARCH_COLUMNS)}) "
+             f"VALUES (:rowid, {', '.join(':' + c for c in SEARCH_COLUMNS)})"),
+        rows,
+    )
+
+
+def unindex_jobs(connection, job_ids):
+    """Remove the FTS rows for `job_ids`."""
+    if _dialect_name(connection) != 'sqlite' or not job_ids:
+        return
+    connection.execute(
+        text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :rowid"),
+        [{'rowid': job_id} for job_id in job_ids],
+    )
+
+
+def rebuild_index(connection):
+    """Repopulate the FTS table from scratch (used by migrations/backfills)."""
+    if _dialect_name(connection) != 'sqlite':
+        return
+    connection.execute(text(f"DELETE FROM {FTS_TABLE}"))
+    connection.execute(text(
+        f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(SEARCH_COLUMNS)}) "
+        f"SELECT id, {', '.join(_COALESCED_COLUMNS)} FROM jobs"
+    ))
+
+
+@event.listens_for(Job, 'after_insert')
+def _job_inserted(mapper, connection, target):
+    index_jobs(connection, [target])
+
+
+@event.listens_for(Job, 'after_update')
+def _job_updated(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[c].history.has_changes() for c in SEARCH_COLUMNS):
+        index_jobs(connection, [target])
+
+
+@event.listens_for(Job, 'after_delete')
+def _job_deleted(mapper, connection, target):
+    unindex_jobs(connection, [target.id])
+
+
+# Create the search structures alongside `jobs` for db.create_all() setups;
+# migrated databases get them from the Alembic revision instead.
+event.listen(Job.__table__, 'after_create', DDL(FTS_CREATE).execute_if(dialect='sqlite'))
+event.listen(Job.__table__, 'after_create', DDL(PG_GIN_CREATE).execute_if(dialect='postgresql'))
+event.listen(Job.__table__, 'before_drop', DDL(f"DROP TABLE IF EXISTS {FTS_TABLE}").execute_if(dialect='sqlite'))
+
+
+# --- Querying ---
+
+def _pg_ts_config():
+    return literal_column(f"'{PG_TS_CONFIG}'::regconfig")
+
+
+def _pg_document():
+    # Must render as the same expression as PG_GIN_CREATE (literals, not
+    # bound parameters) or the planner will not match the index.
+    parts = [func.coalesce(getattr(Job, c), literal_column("''")) for c in SEARCH_COLUMNS]
+    document = parts[0]
+    for part in parts[1:]:
+        document = document.op('||')(literal_column("' '")).op('||')(part)
+    return func.to_tsvector(_pg_ts_config(), document)
+
+
+def search_jobs(query, text_):
+    """Restrict a Job query to rows matching `text_`, ranked by relevance.
+
+    Returns (query, order) where `order` is a KeysetOrder on the relevance
+    score; load it with `with_relevance` to page by it. Returns
+    (None, None) when `text_` contains no searchable terms.
+    """
+    terms = tokenize(text_)
+    if not terms:
+        return None, None
+
+    if _dialect_name(db.session.get_bind()) == 'postgresql':
+        document = _pg_document()
+        ts_query = func.plainto_tsquery(_pg_ts_config(), ' '.join(terms))
+        rank = func.ts_rank(document, ts_query)
+        query = query.filter(document.op('@@')(ts_query))
+        order = KeysetOrder('relevance', rank, Job.id, descending=True,
+                            value_type=float, attribute='search_rank')
+    else:
+        fts = literal_column(FTS_TABLE)
+        matches = (
+            select(fts_table.c.rowid.label('job_id'), func.bm25(fts).label('rank'))
+            .where(fts.op('MATCH')(fts5_query(terms)))
+            .subquery()
+        )
+        query = query.join(matches, matches.c.job_id == Job.id)
+        rank = matches.c.rank
+        # bm25() is lower-is-better
+        order = KeysetOrder('relevance', rank, Job.id, value_type=float, attribute='search_rank')
+
+    return query, order
+
+
+def with_relevance(query, order):
+    """Populate Job.search_rank from a relevance order returned by search_jobs."""
+    return query.options(with_expression(Job.search_rank, order.column))
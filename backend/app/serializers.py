@@ -0,0 +1,214 @@
+# backend/app/serializers.py
+
+from datetime import datetime
+from functools import wraps
+from http import HTTPStatus
+
+from flask import current_app, request
+from flask_restx import fields, marshal
+from flask_restx.fields import MarshallingError, get_value
+from flask_restx.representations import dumps as restx_dumps
+from flask_restx.utils import merge, unpack
+
+try:
+    import orjson
+except ImportError:  # optional, only used when RESPONSE_JSON_ENCODER = 'orjson'
+    orjson = None
+
+# Field classes whose format() is inlined, with the value type they pass through unchanged
+PASSTHROUGH_TYPES = {
+    fields.String: str,
+    fields.Integer: int,
+    fields.Boolean: bool,
+    fields.Float: float,
+}
+
+_compiled = {}      # (id(model), skip_none) -> (model, row function)
+_plain_types = {}   # class -> whether restx's get_value reads it with getattr alone
+
+
+def is_plain(cls):
+    """Whether get_value() would read attributes of `cls` instances via getattr only."""
+    plain = _plain_types.get(cls)
+    if plain is None:
+        indexable = not hasattr(cls, 'strip') and hasattr(cls, '__iter__')
+        plain = _plain_types[cls] = not indexable
+    return plain
+
+
+def _format(field, key, value):
+    # Same error wrapping as fields.Raw.output
+    try:
+        return field.format(value)
+    except MarshallingError as e:
+        raise MarshallingError(f'Unable to marshal field "{key}" value "{value}": {e}')
+
+
+def _read(path, lines):
+    parts = path.split('.')
+    lines.append(f"    v = getattr(obj, {parts[0]!r}, None) if plain else get_value({parts[0]!r}, obj)")
+    for part in parts[1:]:
+        lines.append(f"    v = getattr(v, {part!r}, None) if is_plain(type(v)) else get_value({part!r}, v)")
+
+
+def _null_expr(field, i, namespace):
+    """Expression for a Nested field whose value is None, as Nested.output decides."""
+    if field.allow_null:
+        return 'None'
+    if field.default is not None:
+        namespace[f'd{i}'] = field.default
+        return f'd{i}'
+    return f'n{i}(None)'
+
+
+def _compile_field(i, key, field, lines, namespace):
+    """Append the statements computing output value v<i>; False if `field` is not inlinable."""
+    if field.mask or not isinstance(field.attribute or key, str):
+        return False
+    kind = type(field)
+
+    if kind is fields.Nested:
+        namespace[f'n{i}'] = compile_model(field.model, skip_none=field.skip_none)
+        _read(field.attribute or key, lines)
+        null = _null_expr(field, i, namespace)
+        lines.append(f"    v{i} = n{i}(v)" if null == f'n{i}(None)' else f"    v{i} = {null} if v is None else n{i}(v)")
+        return True
+
+    if kind is fields.List and type(field.container) is fields.Nested and field.default is None \
+            and field.container.attribute is None:
+        item = field.container
+        namespace[f'n{i}'] = compile_model(item.model, skip_none=item.skip_none)
+        _read(field.attribute or key, lines)
+        lines.append("    if isinstance(v, (list, tuple)):")
+        null = _null_expr(item, i, namespace)
+        lines.append(f"        v{i} = [n{i}(x) for x in v]" if null == f'n{i}(None)' else
+                     f"        v{i} = [{null} if x is None else n{i}(x) for x in v]")
+        lines.append("    else:")
+        lines.append(f"        v{i} = f{i}.output({key!r}, obj)")
+        return True
+
+    if field.default is not None:
+        return False
+    if kind in PASSTHROUGH_TYPES:
+        namespace[f't{i}'] = PASSTHROUGH_TYPES[kind]
+        _read(field.attribute or key, lines)
+        lines.append(f"    v{i} = v if v is None or type(v) is t{i} else _format(f{i}, {key!r}, v)")
+        return True
+    if kind is fields.DateTime and field.dt_format == 'iso8601':
+        _read(field.attribute or key, lines)
+        lines.append(f"    v{i} = v if v is None else v.isoformat() if type(v) is datetime else _format(f{i}, {key!r}, v)")
+        return True
+    if kind is fields.Raw:
+        _read(field.attribute or key, lines)
+        lines.append(f"    v{i} = v")
+        return True
+    return False
+
+
+def _build(model, skip_none):
+    resolved = getattr(model, 'resolved', model)
+    if getattr(model, '__mask__', None) or any(
+            isinstance(f, dict) or isinstance(f, fields.Wildcard) or f is fields.Wildcard for f in resolved.values()):
+        # Masks, inline dicts and wildcards keep marshal()'s own handling
+        return lambda data: marshal(data, model, skip_none=skip_none)
+
+    namespace = {
+        'get_value': get_value, 'is_plain': is_plain, '_format': _format, 'datetime': datetime,
+    }
+    lines = [
+        "def row(obj):",
+        "    if isinstance(obj, (list, tuple)):",
+        "        return [row(o) for o in obj]",
+        "    plain = is_plain(type(obj))",
+    ]
+    for i, (key, field) in enumerate(resolved.items()):
+        field = namespace[f'f{i}'] = field() if isinstance(field, type) else field
+        if not _compile_field(i, key, field, lines, namespace):
+            lines.append(f"    v{i} = f{i}.output({key!r}, obj)")
+
+    items = ', '.join(f'{key!r}: v{i}' for i, key in enumerate(resolved))
+    if skip_none:
+        lines.append(f"    return {{k: v for k, v in {{{items}}}.items() if v is not None and v != {{}}}}")
+    else:
+        lines.append(f"    return {{{items}}}")
+
+    source = '\n'.join(lines)
+    exec(compile(source, f"<serializer {getattr(model, 'name', 'fields')}>", 'exec'), namespace)
+    row = namespace['row']
+    row.source = source
+    return row
+
+
+def compile_model(model, skip_none=False):
+    """Return a function producing what marshal(data, model, skip_none=...) would.
+
+    Field lookups, dotted attributes and formatting are resolved once into
+    generated Python, so per row only the attribute reads and type checks
+    remain. Fields it cannot inline fall back to their own output().
+    """
+    entry = _compiled.get((id(model), skip_none))
+    if entry is None or entry[0] is not model:
+        entry = _compiled[(id(model), skip_none)] = (model, _build(model, skip_none))
+    return entry[1]
+
+
+def serialize(data, model, skip_none=False):
+    """marshal(data, model) through the compiled serializer; lists give lists."""
+    return compile_model(model, skip_none)(data)
+
+
+def use_orjson():
+    """Whether responses are encoded with orjson (RESPONSE_JSON_ENCODER, if installed)."""
+    return orjson is not None and current_app.config.get('RESPONSE_JSON_ENCODER') == 'orjson'
+
+
+def dumps(data):
+    """Encode `data` as the API's JSON body (bytes).
+
+    The default 'json' encoder produces exactly flask-restx's output_json
+    bytes. RESPONSE_JSON_ENCODER = 'orjson' is faster but emits compact
+    separators and raw UTF-8, so bodies are equivalent JSON, not identical.
+    """
+    if use_orjson():
+        return orjson.dumps(data) + b'\n'
+    settings = current_app.config.get('RESTX_JSON', {})
+    if current_app.debug:
+        settings.setdefault('indent', 4)
+    return (restx_dumps(data, **settings) + '\n').encode('utf-8')
+
+
+def json_response(data, code=HTTPStatus.OK, headers=None):
+    response = current_app.response_class(dumps(data), status=code, mimetype='application/json')
+    response.headers.extend(headers or {})
+    return response
+
+
+def serialize_with(model, as_list=False, code=HTTPStatus.OK, description=None, **kwargs):
+    """Drop-in for Namespace.marshal_with / marshal_list_with on read endpoints.
+
+    Documents the response exactly as marshal_with does, so Swagger is
+    unchanged, but serializes with compile_model and returns the encoded
+    response. Requests carrying an X-Fields mask go through marshal().
+    """
+    skip_none = kwargs.get('skip_none', False)
+
+    def wrapper(func):
+        doc = {
+            'responses': {str(code): (description, [model] if as_list else model, kwargs)},
+            '__mask__': kwargs.get('mask', True),
+        }
+        func.__apidoc__ = merge(getattr(func, '__apidoc__', {}), doc)
+
+        @wraps(func)
+        def serialized(*args, **kw):
+            data, status, headers = unpack(func(*args, **kw))
+            mask = request.headers.get(current_app.config['RESTX_MASK_HEADER']) or kwargs.get('mask')
+            if mask:
+                data = marshal(data, model, skip_none=skip_none, mask=mask)
+            else:
+                data = serialize(data, model, skip_none)
+            return json_response(data, status, headers)
+
+        return serialized
+
+    return wrapper
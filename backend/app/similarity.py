@@ -0,0 +1,508 @@
+# backend/app/similarity.py
+
+import heapq
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from app import db
+from app.job_changes import on_jobs_committed
+from app.models import Job
+
+# Text columns a job's vector is built from; title terms count double
+TEXT_COLUMNS = ('title', 'description', 'requirements')
+TITLE_WEIGHT = 2
+
+# Only the heaviest query terms are scored; the tail adds little but walks long postings
+MAX_QUERY_TERMS = 64
+
+# Changed jobs kept in a snapshot's overlay before the background thread merges them
+OVERLAY_LIMIT = 1000
+
+FILE_FORMAT = 1
+
+_TOKEN_RE = re.compile(r'[^\W_]{2,}', re.UNICODE)
+
+STOP_WORDS = frozenset("""
+    a about above after all also an and any are as at be been being both but by can could did do does doing
+    for from had has have having he her here hers him his how i if in into is it its just me more most my no
+    nor not of off on once only or other our ours out over own same she should so some such than that the
+    their theirs them then there these they this those through to too under until up very was we were what
+    when where which while who whom why will with would you your yours
+""".split())
+
+
+def tokenize(text_):
+    return [t for t in _TOKEN_RE.findall((text_ or '').lower()) if t not in STOP_WORDS and not t.isdigit()]
+
+
+def term_counts(values):
+    """Term frequencies of a job from its TEXT_COLUMNS `values` (a dict)."""
+    counts = Counter()
+    for column in TEXT_COLUMNS:
+        weight = TITLE_WEIGHT if column == 'title' else 1
+        for term in tokenize(values.get(column)):
+            counts[term] += weight
+    return counts
+
+
+def _weigh(counts, idf):
+    vector = {term: (1 + math.log(count)) * idf(term) for term, count in counts.items()}
+    norm = math.sqrt(sum(w * w for w in vector.values()))
+    return {term: w / norm for term, w in vector.items()} if norm else {}
+
+
+class IndexSnapshot:
+    """One state of the similar-jobs index. Never modified once published,
+    so requests score against it without a lock.
+
+    Each job is a sparse, L2-normalized vector of sublinear TF times smoothed
+    IDF; `postings` holds the same weights per term (the matrix by column),
+    so scoring a query vector against every job is one pass over the
+    postings of its terms.
+
+    Jobs changed since the last build live in a small overlay (`changes`,
+    with their own `changed_postings` and `df_delta`) that readers consult
+    before the base; a write copies only the overlay, and the background
+    thread merges it into a new base once it grows past OVERLAY_LIMIT.
+    """
+
+    def __init__(self, vectors, postings, df, n_docs, built_at):
+        self.vectors = vectors      # job id -> {term: weight}
+        self.postings = postings    # term -> {job id: weight}
+        self.df = df                # term -> number of indexed jobs using it
+        self.n_docs = n_docs
+        self.built_at = built_at
+        self.changes = {}           # job id -> vector, or None if dropped since the build
+        self.changed_postings = {}  # term -> {job id: weight} of the jobs in `changes`
+        self.df_delta = Counter()
+        self._owned = set()         # changed_postings entries this snapshot copied
+
+    def idf(self, term):
+        df = self.df.get(term, 0) + self.df_delta.get(term, 0)
+        return math.log((1 + self.n_docs) / (1 + df)) + 1
+
+    def weigh(self, counts):
+        """L2-normalized TF-IDF vector for `counts` under this snapshot's IDF."""
+        return _weigh(counts, self.idf)
+
+    def vector(self, job_id):
+        """The indexed vector of `job_id`, or None."""
+        if job_id in self.changes:
+            return self.changes[job_id]
+        return self.vectors.get(job_id)
+
+    @classmethod
+    def build(cls, rows):
+        """Snapshot of the jobs in `rows` of (id, *TEXT_COLUMNS)."""
+        counts, df = {}, Counter()
+        for row in rows:
+            counts[row[0]] = term_counts(dict(zip(TEXT_COLUMNS, row[1:])))
+            df.update(counts[row[0]].keys())
+        snapshot = cls({}, defaultdict(dict), df, len(counts), time.time())
+        idf = {term: snapshot.idf(term) for term in df}
+        for job_id, job_counts in counts.items():
+            vector = snapshot.vectors[job_id] = _weigh(job_counts, idf.__getitem__)
+            for term, weight in vector.items():
+                snapshot.postings[term][job_id] = weight
+        snapshot.postings = dict(snapshot.postings)
+        return snapshot
+
+    def changed(self, added, removed):
+        """A new snapshot with `added` ({job id: term counts}) (re)indexed and
+        `removed` job ids dropped. Only the overlay is copied; the base is shared.
+
+        An added job is weighed with the IDF at the time it is indexed; the
+        next rebuild refreshes them all.
+        """
+        snapshot = self._fork()
+        for job_id in set(removed) | added.keys():
+            snapshot._put(job_id, None)
+        for job_id, counts in added.items():
+            snapshot._put(job_id, snapshot.weigh(counts))
+        return snapshot
+
+    def _fork(self):
+        snapshot = IndexSnapshot(self.vectors, self.postings, self.df, self.n_docs, self.built_at)
+        snapshot.changes = dict(self.changes)
+        snapshot.changed_postings = dict(self.changed_postings)
+        snapshot.df_delta = Counter(self.df_delta)
+        return snapshot
+
+    def _put(self, job_id, vector):
+        # Only on a snapshot that is not published yet
+        old = self.vector(job_id)
+        if old is not None:
+            self.n_docs -= 1
+            for term in old:
+                self.df_delta[term] -= 1
+                if not self.df_delta[term]:
+                    del self.df_delta[term]
+                if job_id in self.changed_postings.get(term, ()):
+                    entries = self._changed_posting(term)
+                    del entries[job_id]
+                    if not entries:
+                        del self.changed_postings[term]
+        if vector is None and job_id not in self.vectors:
+            self.changes.pop(job_id, None)
+            return
+        self.changes[job_id] = vector
+        if vector is None:
+            return
+        self.n_docs += 1
+        for term, weight in vector.items():
+            self.df_delta[term] += 1
+            if not self.df_delta[term]:
+                del self.df_delta[term]
+            self._changed_posting(term)[job_id] = weight
+
+    def _changed_posting(self, term):
+        if term not in self._owned:
+            self.changed_postings[term] = dict(self.changed_postings.get(term, ()))
+            self._owned.add(term)
+        return self.changed_postings[term]
+
+    def merged(self):
+        """A snapshot with the overlay folded into the base (copies the base)."""
+        if not self.changes:
+            return self
+        vectors, postings, df = dict(self.vectors), dict(self.postings), Counter(self.df)
+        copied = set()
+
+        def posting(term):
+            if term not in copied:
+                postings[term] = dict(postings.get(term, ()))
+                copied.add(term)
+            return postings[term]
+
+        for job_id, vector in self.changes.items():
+            for term in vectors.pop(job_id, None) or ():
+                entries = posting(term)
+                del entries[job_id]
+                if not entries:
+                    del postings[term]
+                    copied.discard(term)
+            if vector is not None:
+                vectors[job_id] = vector
+                for term, weight in vector.items():
+                    posting(term)[job_id] = weight
+        df.update(self.df_delta)
+        for term in [term for term, count in self.df_delta.items() if df[term] <= 0]:
+            del df[term]
+        return IndexSnapshot(vectors, postings, df, self.n_docs, self.built_at)
+
+    def top_k(self, vector, k, exclude=()):
+        terms = heapq.nlargest(MAX_QUERY_TERMS, vector.items(), key=lambda item: item[1])
+        scores = defaultdict(float)
+        for term, weight in terms:
+            for job_id, job_weight in self.postings.get(term, {}).items():
+                scores[job_id] += weight * job_weight
+        # Base weights of changed jobs are stale; score them from the overlay
+        for job_id in self.changes:
+            scores.pop(job_id, None)
+        for term, weight in terms:
+            for job_id, job_weight in self.changed_postings.get(term, {}).items():
+                scores[job_id] += weight * job_weight
+        for job_id in exclude:
+            scores.pop(job_id, None)
+        return heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
+
+    def save(self, path):
+        """Write the snapshot to `path` (atomically) so other workers start warm."""
+        if self.changes:
+            return self.merged().save(path)
+        state = {
+            'format': FILE_FORMAT,
+            'built_at': self.built_at,
+            'n_docs': self.n_docs,
+            'df': self.df,
+            'vectors': {str(job_id): vector for job_id, vector in self.vectors.items()},
+        }
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        # json.dumps rather than json.dump: only the former uses the C encoder
+        with open(tmp, 'w') as f:
+            f.write(json.dumps(state, separators=(',', ':')))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path, max_age):
+        """The snapshot saved at `path` if it is younger than `max_age` seconds, else None."""
+        try:
+            with open(path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if state.get('format') != FILE_FORMAT or time.time() - state['built_at'] > max_age:
+            return None
+        postings = defaultdict(dict)
+        vectors = {}
+        for key, vector in state['vectors'].items():
+            job_id = int(key)
+            vectors[job_id] = vector
+            for term, weight in vector.items():
+                postings[term][job_id] = weight
+        return cls(vectors, dict(postings), Counter(state['df']), state['n_docs'], state['built_at'])
+
+
+class SimilarJobsIndex:
+    """Top-k cosine search over the TF-IDF vectors of active jobs.
+
+    Requests read the current IndexSnapshot without locking. Committed job
+    changes in this process are folded in by publishing a copy with a new
+    overlay, which the background thread merges into the base.
+    The full rebuild, which also picks up other workers' writes, runs in a
+    background thread every SIMILAR_JOBS_MAX_AGE seconds (or from `flask
+    build-similar-jobs-index`) and is saved to SIMILAR_JOBS_INDEX_PATH. A
+    worker starts from that file when it is fresh enough; it only builds
+    inside a request when it has nothing to serve yet.
+    """
+
+    def __init__(self):
+        self._snapshot = None
+        self._write_lock = threading.Lock()  # serializes publishing snapshots
+        self._stale_ids = set()              # changed jobs whose text must be re-read
+        self._rebuilding = None              # ids changed while a rebuild reads the table
+        self._unsaved = False
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self.rebuilds = 0
+        self.errors = 0
+
+    @property
+    def n_docs(self):
+        snapshot = self._snapshot
+        return snapshot.n_docs if snapshot is not None else 0
+
+    # --- background rebuild ---
+
+    def init_app(self, app):
+        if app.config.get('SIMILAR_JOBS_MAX_AGE', 3600) > 0:
+            app.before_request(lambda: self.start(app))
+
+    def start(self, app):
+        """Start the background rebuild thread if it is not running yet."""
+        if self._thread is not None:
+            return
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, args=(app,), name='similar-jobs-index', daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def _run(self, app):
+        max_age = app.config['SIMILAR_JOBS_MAX_AGE']
+        while not self._stop.is_set():
+            snapshot = self._snapshot
+            age = time.time() - snapshot.built_at if snapshot is not None else max_age
+            self._wake.wait(max(1.0, max_age - age))
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            with app.app_context():
+                try:
+                    self._maintain()
+                except Exception:
+                    db.session.rollback()
+                    self.errors += 1
+                    app.logger.exception('Similar jobs index rebuild failed')
+
+    def _maintain(self):
+        snapshot = self._snapshot
+        if snapshot is None or time.time() - snapshot.built_at >= current_app.config.get('SIMILAR_JOBS_MAX_AGE', 3600):
+            self.rebuild()
+            return
+        if len(snapshot.changes) >= OVERLAY_LIMIT:
+            self._merge(snapshot)
+        if self._unsaved and current_app.config.get('SIMILAR_JOBS_INDEX_PATH'):
+            self._unsaved = False
+            snapshot.save(current_app.config['SIMILAR_JOBS_INDEX_PATH'])
+
+    def rebuild(self, save=True):
+        """Build a new snapshot from the database and publish it; returns it.
+
+        The table is read without holding the write lock, so requests keep
+        being served (and job changes folded in) meanwhile; jobs changed
+        during the read are re-read afterwards.
+        """
+        with self._write_lock:
+            self._rebuilding = set()
+        try:
+            rows = (db.session.query(Job.id, *(getattr(Job, c) for c in TEXT_COLUMNS))
+                    .filter(Job.is_active == True)  # noqa: E712
+                    .yield_per(2000))
+            snapshot = IndexSnapshot.build(rows)
+        except BaseException:
+            with self._write_lock:
+                self._rebuilding = None
+            raise
+        self._publish_build(snapshot)
+        self.rebuilds += 1
+        path = current_app.config.get('SIMILAR_JOBS_INDEX_PATH')
+        if save and path:
+            snapshot.save(path)
+        else:
+            self._unsaved = True
+        return snapshot
+
+    def _merge(self, snapshot):
+        """Publish `snapshot` with its overlay merged into the base; jobs
+        changed during the merge are carried over into the new overlay."""
+        merged = snapshot.merged()
+        with self._write_lock:
+            current = self._snapshot
+            if current is None or current.vectors is not snapshot.vectors:
+                return  # rebuilt or invalidated meanwhile
+            merged = merged._fork()
+            for job_id, vector in current.changes.items():
+                if job_id not in snapshot.changes or snapshot.changes[job_id] is not vector:
+                    merged._put(job_id, vector)
+            for job_id in snapshot.changes.keys() - current.changes.keys():
+                merged._put(job_id, current.vector(job_id))
+            self._snapshot = merged
+
+    def _publish_build(self, snapshot):
+        with self._write_lock:
+            self._stale_ids |= self._rebuilding or set()
+            self._rebuilding = None
+            self._snapshot = snapshot
+
+    # --- keeping current ---
+
+    def _current(self):
+        """The snapshot to answer from, folding in this process's job changes."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self._cold_start()
+        # Stale jobs are re-read by whichever request gets the lock first;
+        # the others answer from the snapshot as it is
+        if self._stale_ids and self._write_lock.acquire(blocking=False):
+            try:
+                if self._stale_ids:
+                    self._snapshot = snapshot = self._refresh(self._snapshot, self._stale_ids)
+                    self._stale_ids = set()
+            finally:
+                self._write_lock.release()
+        return snapshot
+
+    def _cold_start(self):
+        # Nothing to serve yet in this process: load the saved index, or
+        # (first request after a deploy with no saved index) build it here
+        with self._write_lock:
+            if self._snapshot is None:
+                config = current_app.config
+                path = config.get('SIMILAR_JOBS_INDEX_PATH')
+                snapshot = IndexSnapshot.load(path, config.get('SIMILAR_JOBS_MAX_AGE', 3600)) if path else None
+                if snapshot is None:
+                    rows = (db.session.query(Job.id, *(getattr(Job, c) for c in TEXT_COLUMNS))
+                            .filter(Job.is_active == True)  # noqa: E712
+                            .all())
+                    snapshot = IndexSnapshot.build(rows)
+                    # Saved by the background thread, off the request path
+                    self._unsaved = True
+                    self._wake.set()
+                self._stale_ids.clear()
+                self._snapshot = snapshot
+            return self._snapshot
+
+    def _refresh(self, snapshot, job_ids):
+        # Caller holds self._write_lock
+        rows = (db.session.query(Job.id, Job.is_active, *(getattr(Job, c) for c in TEXT_COLUMNS))
+                .filter(Job.id.in_(job_ids)).all())
+        added = {row[0]: term_counts(dict(zip(TEXT_COLUMNS, row[2:]))) for row in rows if row[1]}
+        return snapshot.changed(added, set(job_ids) - added.keys())
+
+    def apply(self, changes):
+        """Fold committed job changes in; text not in the change is re-read on next use."""
+        with self._write_lock:
+            if self._rebuilding is not None:
+                self._rebuilding.update(values['id'] for _, values in changes)
+            if self._snapshot is None:
+                return
+            added, removed = {}, set()
+            for op, values in changes:
+                job_id = values['id']
+                if op == 'delete' or values.get('is_active') is False:
+                    removed.add(job_id)
+                    added.pop(job_id, None)
+                    self._stale_ids.discard(job_id)
+                elif values.get('is_active') is True and all(column in values for column in TEXT_COLUMNS):
+                    added[job_id] = term_counts(values)
+                    removed.discard(job_id)
+                    self._stale_ids.discard(job_id)
+                else:
+                    self._stale_ids.add(job_id)
+            if added or removed:
+                self._snapshot = self._snapshot.changed(added, removed)
+                if len(self._snapshot.changes) >= OVERLAY_LIMIT:
+                    self._wake.set()
+
+    def invalidate(self):
+        """Rebuild on the next use (or the next background run)."""
+        with self._write_lock:
+            self._snapshot = None
+        self._wake.set()
+
+    # --- queries ---
+
+    def weigh(self, counts):
+        """L2-normalized TF-IDF vector for `counts` under the current IDF."""
+        return self._current().weigh(counts)
+
+    def job_vectors(self, job_ids):
+        """{job id: vector} for existing `job_ids`; jobs outside the index
+        (inactive ones) are vectorized from one database read."""
+        snapshot = self._current()
+        vectors = {job_id: snapshot.vector(job_id) for job_id in job_ids}
+        vectors = {job_id: vector for job_id, vector in vectors.items() if vector is not None}
+        missing = set(job_ids) - vectors.keys()
+        if missing:
+            rows = (db.session.query(Job.id, *(getattr(Job, c) for c in TEXT_COLUMNS))
+                    .filter(Job.id.in_(missing)).all())
+            for row in rows:
+                vectors[row[0]] = snapshot.weigh(term_counts(dict(zip(TEXT_COLUMNS, row[1:]))))
+        return vectors
+
+    def job_vector(self, job_id):
+        """The job's vector, or None if it does not exist."""
+        return self.job_vectors([job_id]).get(job_id)
+
+    def top_k(self, vector, k, exclude=()):
+        """[(job id, cosine score)] of the `k` indexed jobs closest to `vector`."""
+        return self._current().top_k(vector, k, exclude)
+
+    def similar(self, job_id, k=10):
+        """Jobs most similar to `job_id`, or None if it does not exist."""
+        vector = self.job_vector(job_id)
+        if vector is None:
+            return None
+        return self.top_k(vector, k, exclude=(job_id,))
+
+
+similar_jobs = SimilarJobsIndex()
+on_jobs_committed(similar_jobs.apply)
+
+
+@click.command('build-similar-jobs-index')
+@with_appcontext
+def build_similar_jobs_index_command():
+    """Rebuild the similar-jobs index and save it for workers to load."""
+    started = time.monotonic()
+    snapshot = similar_jobs.rebuild(save=True)
+    click.echo(f"indexed={snapshot.n_docs} terms={len(snapshot.postings)} "
+               f"duration={time.monotonic() - started:.2f}s path={current_app.config.get('SIMILAR_JOBS_INDEX_PATH') or '-'}")
@@ -0,0 +1,248 @@
+# backend/app/trigram.py
+
+import re
+import threading
+import time
+from collections import defaultdict
+
+from flask import current_app
+from sqlalchemy import DDL, event, false, func, literal, select
+
+from app import db
+from app.job_changes import on_jobs_committed
+from app.models import Job
+
+# Job columns served by trigram matching
+TRIGRAM_COLUMNS = ('location', 'job_type')
+
+# Above this many matching ids an IN (...) list costs more than the scan it
+# replaces, so we let the database do the ILIKE instead.
+MAX_ID_FILTER = 5000
+
+# pg_trgm's default similarity threshold
+SIMILARITY_THRESHOLD = 0.3
+
+_WORD_RE = re.compile(r'[^\W_]+', re.UNICODE)
+
+
+def normalize_text(value):
+    """Lower-case and collapse whitespace, as substring filters compare text."""
+    return ' '.join((value or '').lower().split())
+
+
+def substring_trigrams(text_):
+    """Unpadded trigrams; every substring of length >= 3 shares all of them."""
+    text_ = normalize_text(text_)
+    return {text_[i:i + 3] for i in range(len(text_) - 2)}
+
+
+def word_trigrams(text_):
+    """pg_trgm-style trigrams: each alphanumeric word padded with two leading
+    spaces and one trailing space."""
+    grams = set()
+    for word in _WORD_RE.findall(normalize_text(text_)):
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    """In-process trigram postings for one text column.
+
+    Postings are kept per distinct value rather than per row, since job
+    locations and types repeat heavily; each value maps to the ids using it.
+    """
+
+    def __init__(self):
+        self._substring = defaultdict(set)   # trigram -> value keys
+        self._similar = defaultdict(set)     # padded word trigram -> value keys
+        self._ids = defaultdict(set)         # value key -> row ids
+        self._display = {}                   # value key -> value as first seen
+        self._row_value = {}                 # row id -> value key
+
+    def add(self, row_id, value):
+        self.remove(row_id)
+        key = normalize_text(value)
+        if not key:
+            return
+        if key not in self._ids:
+            self._display[key] = value.strip()
+            for gram in substring_trigrams(key):
+                self._substring[gram].add(key)
+            for gram in word_trigrams(key):
+                self._similar[gram].add(key)
+        self._ids[key].add(row_id)
+        self._row_value[row_id] = key
+
+    def remove(self, row_id):
+        key = self._row_value.pop(row_id, None)
+        if key is None:
+            return
+        ids = self._ids[key]
+        ids.discard(row_id)
+        if ids:
+            return
+        del self._ids[key]
+        del self._display[key]
+        for gram in substring_trigrams(key):
+            self._substring[gram].discard(key)
+        for gram in word_trigrams(key):
+            self._similar[gram].discard(key)
+
+    def search(self, needle):
+        """Return ids whose value contains `needle` (case-insensitive).
+
+        Returns None when `needle` is shorter than a trigram and so cannot
+        be answered from the index.
+        """
+        needle = normalize_text(needle)
+        grams = substring_trigrams(needle)
+        if not grams:
+            return None
+        postings = sorted((self._substring.get(g, set()) for g in grams), key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+        ids = set()
+        for key in candidates:
+            # Trigrams only prove co-occurrence; confirm the actual substring
+            if needle in key:
+                ids |= self._ids[key]
+        return ids
+
+    def suggest(self, text_, limit=5, threshold=SIMILARITY_THRESHOLD):
+        """Return [(value, score, count)] for the values most similar to `text_`.
+
+        Score is pg_trgm's strict_word_similarity: the best similarity
+        (shared trigrams over their union) between `text_` and any run of
+        whole words of the value, so that "nairboi" still finds
+        "Nairobi, Kenya".
+        """
+        query_grams = word_trigrams(text_)
+        candidates = set()
+        for gram in query_grams:
+            candidates.update(self._similar.get(gram, ()))
+        scored = []
+        for key in candidates:
+            score = word_similarity(query_grams, key)
+            if score >= threshold:
+                scored.append((self._display[key], round(score, 4), len(self._ids[key])))
+        scored.sort(key=lambda s: (-s[1], -s[2], s[0]))
+        return scored[:limit]
+
+
+def word_similarity(query_grams, value):
+    """Best trigram similarity between `query_grams` and a run of whole words of `value`."""
+    words = _WORD_RE.findall(normalize_text(value))
+    best = 0.0
+    for start in range(len(words)):
+        for end in range(start + 1, len(words) + 1):
+            grams = word_trigrams(' '.join(words[start:end]))
+            shared = len(query_grams & grams)
+            if shared:
+                best = max(best, shared / len(query_grams | grams))
+    return best
+
+
+class JobTrigramIndex:
+    """Trigram indexes over TRIGRAM_COLUMNS of the jobs table (SQLite path).
+
+    Built lazily from the database and updated incrementally from committed
+    job changes in this process. Writes made by other worker processes are
+    picked up by a full rebuild once the index is older than
+    TRIGRAM_INDEX_MAX_AGE seconds.
+    """
+
+    def __init__(self, columns=TRIGRAM_COLUMNS):
+        self.columns = columns
+        self._lock = threading.Lock()
+        self._indexes = None
+        self._built_at = 0.0
+
+    def _build(self):
+        indexes = {c: TrigramIndex() for c in self.columns}
+        rows = db.session.query(Job.id, *(getattr(Job, c) for c in self.columns)).yield_per(5000)
+        for row in rows:
+            for column, value in zip(self.columns, row[1:]):
+                indexes[column].add(row[0], value)
+        return indexes
+
+    def _current(self):
+        # Caller holds self._lock
+        max_age = current_app.config.get('TRIGRAM_INDEX_MAX_AGE', 300)
+        if self._indexes is None or time.monotonic() - self._built_at > max_age:
+            self._indexes = self._build()
+            self._built_at = time.monotonic()
+        return self._indexes
+
+    def search(self, column, needle):
+        with self._lock:
+            return self._current()[column].search(needle)
+
+    def suggest(self, column, text_, limit=5):
+        with self._lock:
+            return self._current()[column].suggest(text_, limit=limit)
+
+    def apply(self, changes):
+        with self._lock:
+            if self._indexes is None:
+                return
+            for op, values in changes:
+                for column, index in self._indexes.items():
+                    if op == 'delete':
+                        index.remove(values['id'])
+                    elif column in values:
+                        index.add(values['id'], values[column])
+
+    def invalidate(self):
+        with self._lock:
+            self._indexes = None
+
+
+job_trigrams = JobTrigramIndex()
+on_jobs_committed(job_trigrams.apply)
+
+
+def _is_postgres():
+    return db.session.get_bind().dialect.name == 'postgresql'
+
+
+def filter_substring(query, column, needle):
+    """Apply a case-insensitive substring filter on a Job text column.
+
+    PostgreSQL answers the ILIKE from its pg_trgm GIN index; elsewhere the
+    in-process trigram index narrows the match to a set of ids.
+    """
+    if not _is_postgres():
+        ids = job_trigrams.search(column.key, needle)
+        if ids is not None and len(ids) <= MAX_ID_FILTER:
+            return query.filter(Job.id.in_(ids)) if ids else query.filter(false())
+    return query.filter(column.ilike(f"%{needle}%"))
+
+
+def suggest_values(column, text_, limit=5):
+    """'Did you mean' suggestions for a Job text column, most similar first."""
+    if _is_postgres():
+        # `<<%` is answered from the trigram GIN index; its threshold is set
+        # for this transaction to match the in-process scoring
+        db.session.execute(select(func.set_config('pg_trgm.strict_word_similarity_threshold',
+                                                  str(SIMILARITY_THRESHOLD), True)))
+        score = func.strict_word_similarity(text_, column)
+        rows = (
+            db.session.query(column, func.max(score), func.count(Job.id))
+            .filter(literal(text_).op('<<%')(column))
+            .group_by(column)
+            .order_by(func.max(score).desc(), func.count(Job.id).desc(), column)
+            .limit(limit)
+            .all()
+        )
+        return [(value, round(float(s), 4), count) for value, s, count in rows]
+    return job_trigrams.suggest(column.key, text_, limit=limit)
+
+
+# Trigram GIN indexes for db.create_all() setups on PostgreSQL; migrated
+# databases get them from the Alembic revision instead.
+event.listen(Job.__table__, 'after_create',
+             DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect='postgresql'))
+for _column in TRIGRAM_COLUMNS:
+    event.listen(Job.__table__, 'after_create', DDL(
+        f"CREATE INDEX IF NOT EXISTS ix_jobs_{_column}_trgm ON jobs USING gin ({_column} gin_trgm_ops)"
+    ).execute_if(dialect='postgresql'))
@@ -0,0 +1,146 @@
+# backend/app/versioning.py
+
+import hashlib
+from datetime import datetime, timezone
+from functools import wraps
+
+from flask import current_app, g, request
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.orm import Session
+from werkzeug.http import http_date
+from werkzeug.wrappers import Response
+
+from app import db
+from app.models import TableVersion
+
+# Tables whose writes are tracked; everything else (including table_versions) is ignored
+TRACKED_TABLES = ('users', 'company', 'jobs', 'applications', 'saved_jobs')
+
+versions_table = TableVersion.__table__
+
+
+def bump_versions(connection, tables):
+    """Increment the version of each of `tables` inside the caller's transaction.
+
+    Rows are updated in a fixed order so concurrent writers cannot deadlock.
+    """
+    now = datetime.utcnow()
+    for name in sorted(set(tables) & set(TRACKED_TABLES)):
+        result = connection.execute(
+            update(versions_table)
+            .where(versions_table.c.table_name == name)
+            .values(version=versions_table.c.version + 1, updated_at=now)
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(versions_table).values(table_name=name, version=1, updated_at=now))
+
+
+@event.listens_for(Session, 'after_flush')
+def _bump_flushed_tables(session, flush_context):
+    # new/dirty/deleted still describe what this flush just wrote
+    tables = {
+        obj.__table__.name
+        for objects in (session.new, session.dirty, session.deleted)
+        for obj in objects
+    }
+    if tables & set(TRACKED_TABLES):
+        bump_versions(session.connection(), tables)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _bump_bulk_tables(orm_execute_state):
+    # Bulk INSERT/UPDATE/DELETE statements bypass the unit of work
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.local_table.name in TRACKED_TABLES:
+        bump_versions(orm_execute_state.session.connection(), [mapper.local_table.name])
+
+
+def current_versions(tables):
+    """Return {table: (version, updated_at)} for `tables` in one query."""
+    rows = db.session.execute(
+        select(versions_table.c.table_name, versions_table.c.version, versions_table.c.updated_at)
+        .where(versions_table.c.table_name.in_(tables))
+    )
+    versions = {name: (0, None) for name in tables}
+    versions.update({name: (version, updated_at) for name, version, updated_at in rows})
+    return versions
+
+
+def request_versions():
+    """[[table, version], ...] the current @conditional handler's ETag was built from, or None.
+
+    Caches of response bodies keep this with each entry and treat an entry
+    whose versions differ as a miss, so a body is never older than its ETag.
+    """
+    return g.get('table_versions')
+
+
+def _validators(tables):
+    versions = current_versions(tables)
+    g.table_versions = [[name, versions[name][0]] for name in tables]
+    digest = hashlib.sha1(request.full_path.encode('utf-8'))
+    # Responses of authenticated endpoints differ per caller
+    digest.update(request.headers.get('Authorization', '').encode('utf-8'))
+    for name in tables:
+        digest.update(f'|{name}={versions[name][0]}'.encode('utf-8'))
+
+    stamps = [updated_at for _, updated_at in versions.values() if updated_at is not None]
+    last_modified = max(stamps).replace(microsecond=0, tzinfo=timezone.utc) if stamps else None
+    return digest.hexdigest(), last_modified
+
+
+def _not_modified(etag, last_modified):
+    if request.if_none_match:
+        # If-None-Match wins over If-Modified-Since when both are sent
+        return request.if_none_match.contains(etag)
+    if request.if_modified_since and last_modified:
+        return last_modified <= request.if_modified_since
+    return False
+
+
+def _validator_headers(etag, last_modified):
+    headers = {
+        'ETag': f'"{etag}"',
+        'Cache-Control': 'no-cache',
+        'Vary': 'Authorization',
+    }
+    if last_modified:
+        headers['Last-Modified'] = http_date(last_modified)
+    return headers
+
+
+def conditional(*tables, on_not_modified=None):
+    """Make a GET handler answer conditional requests from table versions.
+
+    The ETag covers the request URL, the caller's Authorization header and
+    the versions of `tables` (everything the response is built from), so a
+    matching If-None-Match / If-Modified-Since gets a 304 before the handler
+    runs any query. `on_not_modified`, if given, is called with the
+    handler's arguments before that 304 is sent, for side effects a
+    revalidation must not skip (e.g. counting a view).
+    """
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            etag, last_modified = _validators(tables)
+            headers = _validator_headers(etag, last_modified)
+            if _not_modified(etag, last_modified):
+                if on_not_modified is not None:
+                    on_not_modified(*args, **kwargs)
+                return current_app.response_class(status=304, headers=headers)
+
+            rv = f(*args, **kwargs)
+            if isinstance(rv, Response):
+                if rv.status_code == 200:
+                    rv.headers.update(headers)
+                return rv
+            if not isinstance(rv, tuple):
+                return rv, 200, headers
+            data, code, extra = (tuple(rv) + (None, None))[:3]
+            if (code or 200) != 200:
+                return rv
+            return data, 200, {**(extra or {}), **headers}
+        return wrapper
+    return decorator
@@ -0,0 +1,93 @@
+# backend/bench_serializer.py
+#
+# Compare response serialization throughput: flask-restx marshal + output_json
+# (the previous path) against the compiled serializers, with json and orjson.
+#
+#   python bench_serializer.py [--rows 2000] [--repeat 5]
+
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from flask_restx import marshal
+from flask_restx.representations import output_json
+
+from app import create_app
+from app.models import Application, Company, Job, User
+from app.serializers import dumps, orjson, serialize
+
+
+def sample_rows(n):
+    """Transient jobs, companies and applications shaped like real API rows."""
+    recruiter = User(id=1, username='recruiter', email='recruiter@example.com', is_recruiter=True)
+    applicant = User(id=2, username='applicant', email='applicant@example.com')
+    companies = [Company(id=i, name=f'Company {i}', industry='Software', description='We build things.',
+                         website=f'https://company{i}.example.com', contact_email=f'jobs@company{i}.example.com',
+                         owner_id=1)
+                 for i in range(1, 21)]
+    posted = datetime(2025, 1, 1, 9, 30)
+    jobs, applications = [], []
+    for i in range(n):
+        company = companies[i % len(companies)]
+        job = Job(id=i + 1, title=f'Senior Engineer {i}', description='Build and run our platform. ' * 8,
+                  requirements='Python, SQL', location='Nairobi, Kenya', salary='$70,000 - $90,000',
+                  job_type='Full-time', date_posted=posted + timedelta(minutes=i),
+                  expires_date=posted + timedelta(days=30), is_active=True, recruiter_id=1,
+                  company_id=company.id, image=None)
+        job.company, job.recruiter = company, recruiter
+        application = Application(id=i + 1, user_id=2, job_id=job.id, status='pending',
+                                  application_date=posted + timedelta(hours=i),
+                                  resume_url='https://example.com/cv.pdf', cover_letter_text='Hello')
+        application.job, application.applicant = job, applicant
+        jobs.append(job)
+        applications.append(application)
+    return jobs, companies * max(1, n // len(companies)), applications
+
+
+def rate(func, rows, repeat):
+    best = min(_timed(func, rows) for _ in range(repeat))
+    return len(rows) / best
+
+
+def _timed(func, rows):
+    start = time.perf_counter()
+    func(rows)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark response serialization throughput')
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_app()
+    # Imported after create_app so the namespaces (and their models) exist
+    from app.routes.application_routes import application_model
+    from app.routes.company_routes import company_model
+    from app.routes.job_routes import job_model
+
+    jobs, companies, applications = sample_rows(args.rows)
+    cases = (('job_model', job_model, jobs),
+             ('company_model', company_model, companies),
+             ('application_model', application_model, applications))
+
+    with app.app_context():
+        print(f"{'model':<18} {'marshal+json':>14} {'compiled+json':>14} {'compiled+orjson':>16}  rows/sec (compiled+json speedup)")
+        for name, model, rows in cases:
+            app.config['RESPONSE_JSON_ENCODER'] = 'json'
+            expected = output_json(marshal(rows, model), 200).get_data()
+            assert dumps(serialize(rows, model)) == expected, f'{name}: compiled output differs from marshal'
+
+            restx = rate(lambda r: output_json(marshal(r, model), 200).get_data(), rows, args.repeat)
+            compiled = rate(lambda r: dumps(serialize(r, model)), rows, args.repeat)
+            if orjson is not None:
+                app.config['RESPONSE_JSON_ENCODER'] = 'orjson'
+                fast = f'{rate(lambda r: dumps(serialize(r, model)), rows, args.repeat):>16,.0f}'
+            else:
+                fast = f"{'(not installed)':>16}"
+            print(f'{name:<18} {restx:>14,.0f} {compiled:>14,.0f} {fast}  ({compiled / restx:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -16,3 +16,63 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     FRONTEND_URL = os.environ.get('FRONTEND_URL', 'http://localhost:3000')
     JWT_ACCESS_TOKEN_EXPIRES = 3600  # 1 hour in seconds
+    # Seconds before the in-process trigram index (SQLite) is rebuilt to pick up other workers' writes
+    TRIGRAM_INDEX_MAX_AGE = int(os.environ.get('TRIGRAM_INDEX_MAX_AGE', 300))
+    # Seconds a /api/jobs/facets result may be served from cache (cleared on any job change)
+    FACET_CACHE_TTL = int(os.environ.get('FACET_CACHE_TTL', 30))
+    # Job list/detail response cache: 'memory' (per worker), 'sqlite' (shared file) or 'none'
+    RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND', 'memory')
+    RESPONSE_CACHE_PATH = os.environ.get('RESPONSE_CACHE_PATH') or os.path.join(basedir, 'instance', 'response_cache.db')
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', 60))
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', 1024))
+    RESPONSE_CACHE_MAX_BYTES = int(os.environ.get('RESPONSE_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    # JSON encoder for serialized responses: 'json' (byte-identical to flask-restx) or 'orjson' (faster, compact; needs orjson installed)
+    RESPONSE_JSON_ENCODER = os.environ.get('RESPONSE_JSON_ENCODER', 'json')
+    # Rows fetched per server-side cursor batch by the /export endpoints
+    EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', 1000))
+    # Seconds between background expiry sweeps in each worker; 0 leaves it to `flask sweep-expired-jobs`
+    EXPIRY_SWEEP_INTERVAL = float(os.environ.get('EXPIRY_SWEEP_INTERVAL', 0))
+    # Jobs deactivated per sweeper transaction
+    EXPIRY_SWEEP_BATCH_SIZE = int(os.environ.get('EXPIRY_SWEEP_BATCH_SIZE', 500))
+    # Seconds between background rebuilds of the in-process similar-jobs TF-IDF index (and age at which a saved copy is stale)
+    SIMILAR_JOBS_MAX_AGE = int(os.environ.get('SIMILAR_JOBS_MAX_AGE', 3600))
+    # Where the similar-jobs index is saved after each build so new workers start warm; empty disables it
+    SIMILAR_JOBS_INDEX_PATH = os.environ.get('SIMILAR_JOBS_INDEX_PATH', os.path.join(basedir, 'instance', 'similar_jobs.json'))
+    # Seconds a user's recommendations are cached (dropped early when they save or apply to a job)
+    RECOMMENDATION_CACHE_TTL = int(os.environ.get('RECOMMENDATION_CACHE_TTL', 300))
+    # Rows per transaction (one executemany, or COPY on PostgreSQL) for POST /api/jobs/bulk
+    BULK_IMPORT_CHUNK_SIZE = int(os.environ.get('BULK_IMPORT_CHUNK_SIZE', 500))
+    # Largest upload POST /api/jobs/bulk accepts, in rows
+    BULK_IMPORT_MAX_ROWS = int(os.environ.get('BULK_IMPORT_MAX_ROWS', 5000))
+    # Seconds between flushes of each worker's buffered job view counts to job_stats; 0 writes every view at once
+    JOB_VIEWS_FLUSH_INTERVAL = float(os.environ.get('JOB_VIEWS_FLUSH_INTERVAL', 10))
+    # Hours for a view's weight in the trending score to halve
+    TRENDING_HALF_LIFE_HOURS = float(os.environ.get('TRENDING_HALF_LIFE_HOURS', 24))
+    # Seconds the precomputed /api/jobs/trending list is served before it is re-read
+    TRENDING_REFRESH_INTERVAL = float(os.environ.get('TRENDING_REFRESH_INTERVAL', 60))
+    # What happens to a new posting that nearly duplicates an active job of the same company: 'flag', 'reject' or 'off'
+    DUPLICATE_JOB_POLICY = os.environ.get('DUPLICATE_JOB_POLICY', 'flag')
+    # Estimated Jaccard similarity (of word 3-grams in title and description) from which postings count as duplicates
+    DUPLICATE_JOB_THRESHOLD = float(os.environ.get('DUPLICATE_JOB_THRESHOLD', 0.8))
+    # Seconds before the in-process duplicate-posting index is rebuilt to pick up other workers' writes
+    DUPLICATE_INDEX_MAX_AGE = int(os.environ.get('DUPLICATE_INDEX_MAX_AGE', 3600))
+    # Seconds between background deliveries of application events (status changes) from the outbox; 0 leaves it to `flask dispatch-outbox`
+    OUTBOX_DISPATCH_INTERVAL = float(os.environ.get('OUTBOX_DISPATCH_INTERVAL', 5))
+    # Application events delivered per outbox transaction
+    OUTBOX_BATCH_SIZE = int(os.environ.get('OUTBOX_BATCH_SIZE', 100))
+    # Failed deliveries after which an application event is set aside
+    OUTBOX_MAX_ATTEMPTS = int(os.environ.get('OUTBOX_MAX_ATTEMPTS', 5))
+    # Directory of the content-addressed resume store (files under <first 2 hex>/<next 2 hex>/<sha256>)
+    RESUME_STORAGE_DIR = os.environ.get('RESUME_STORAGE_DIR') or os.path.join(basedir, 'instance', 'resumes')
+    # Largest resume POST /api/resumes accepts, in bytes
+    RESUME_MAX_BYTES = int(os.environ.get('RESUME_MAX_BYTES', 10 * 1024 * 1024))
+    # Seconds clients may cache a downloaded resume; its content never changes under the same id
+    RESUME_CACHE_MAX_AGE = int(os.environ.get('RESUME_CACHE_MAX_AGE', 365 * 24 * 3600))
+    # Seconds between background checks of the resume text extraction queue in each worker; 0 leaves it to `flask extract-resumes`
+    RESUME_EXTRACT_INTERVAL = float(os.environ.get('RESUME_EXTRACT_INTERVAL', 10))
+    # Processes that parse resumes (PDF through pypdf when installed) per worker, and resumes claimed at a time
+    RESUME_EXTRACT_WORKERS = int(os.environ.get('RESUME_EXTRACT_WORKERS', 2))
+    # Seconds one resume may take to parse before its process is killed
+    RESUME_EXTRACT_TIMEOUT = float(os.environ.get('RESUME_EXTRACT_TIMEOUT', 60))
+    # Failed extractions after which a resume is left out of candidate search
+    RESUME_EXTRACT_MAX_ATTEMPTS = int(os.environ.get('RESUME_EXTRACT_MAX_ATTEMPTS', 3))
@@ -0,0 +1,30 @@
+"""Add composite indexes for keyset pagination of jobs
+
+Revision ID: a1c3e5f7b901
+Revises: 344038c3ec86
+Create Date: 2026-10-17 09:12:04.118203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1c3e5f7b901'
+down_revision = '344038c3ec86'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.create_index('ix_jobs_active_date_posted_id', ['is_active', 'date_posted', 'id'], unique=False)
+        batch_op.create_index('ix_jobs_active_salary_id', ['is_active', 'salary', 'id'], unique=False)
+        batch_op.create_index('ix_jobs_active_title_id', ['is_active', 'title', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.drop_index('ix_jobs_active_title_id')
+        batch_op.drop_index('ix_jobs_active_salary_id')
+        batch_op.drop_index('ix_jobs_active_date_posted_id')
@@ -0,0 +1,40 @@
+"""Add application_events outbox
+
+Revision ID: a2d4f6b8c071
+Revises: f8c2a4e6b350
+Create Date: 2026-10-18 04:05:52.118734
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a2d4f6b8c071'
+down_revision = 'f8c2a4e6b350'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'application_events',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('application_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('event', sa.String(length=50), nullable=False),
+        sa.Column('status', sa.String(length=50), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('dispatched_at', sa.DateTime(), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(['application_id'], ['applications.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_application_events_dispatched_at_id', 'application_events', ['dispatched_at', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_application_events_dispatched_at_id', table_name='application_events')
+    op.drop_table('application_events')
@@ -0,0 +1,62 @@
+"""Add indexes on foreign key and filter columns; unique user/job pairs
+
+Revision ID: a8c6e2f4b175
+Revises: f2b8d4e6a913
+Create Date: 2026-10-17 18:03:12.664091
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8c6e2f4b175'
+down_revision = 'f2b8d4e6a913'
+branch_labels = None
+depends_on = None
+
+
+def _drop_duplicate_pairs(table_name):
+    # Racing requests could store the same (user_id, job_id) twice before the
+    # unique index existed; keep the earliest row of each pair.
+    op.execute(
+        f"DELETE FROM {table_name} WHERE id NOT IN "
+        f"(SELECT min_id FROM (SELECT MIN(id) AS min_id FROM {table_name} GROUP BY user_id, job_id) AS keep)"
+    )
+
+
+def upgrade():
+    _drop_duplicate_pairs('applications')
+    _drop_duplicate_pairs('saved_jobs')
+
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.create_index('uq_applications_user_id_job_id', ['user_id', 'job_id'], unique=True)
+        batch_op.create_index('ix_applications_job_id_status', ['job_id', 'status'], unique=False)
+
+    with op.batch_alter_table('saved_jobs', schema=None) as batch_op:
+        batch_op.create_index('uq_saved_jobs_user_id_job_id', ['user_id', 'job_id'], unique=True)
+        batch_op.create_index('ix_saved_jobs_job_id', ['job_id'], unique=False)
+
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.create_index('ix_jobs_recruiter_id_date_posted_id', ['recruiter_id', 'date_posted', 'id'], unique=False)
+        batch_op.create_index('ix_jobs_company_id_date_posted_id', ['company_id', 'date_posted', 'id'], unique=False)
+
+    with op.batch_alter_table('company', schema=None) as batch_op:
+        batch_op.create_index('ix_company_owner_id', ['owner_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('company', schema=None) as batch_op:
+        batch_op.drop_index('ix_company_owner_id')
+
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.drop_index('ix_jobs_company_id_date_posted_id')
+        batch_op.drop_index('ix_jobs_recruiter_id_date_posted_id')
+
+    with op.batch_alter_table('saved_jobs', schema=None) as batch_op:
+        batch_op.drop_index('ix_saved_jobs_job_id')
+        batch_op.drop_index('uq_saved_jobs_user_id_job_id')
+
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.drop_index('ix_applications_job_id_status')
+        batch_op.drop_index('uq_applications_user_id_job_id')
@@ -0,0 +1,76 @@
+"""Add applications.reviewed_at and per-job / per-company application stats
+
+Revision ID: b4e6a8c0d213
+Revises: a2d4f6b8c071
+Create Date: 2026-10-18 05:21:37.604182
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4e6a8c0d213'
+down_revision = 'a2d4f6b8c071'
+branch_labels = None
+depends_on = None
+
+COUNTER_COLUMNS = ('applications', 'pending', 'reviewed', 'accepted', 'rejected', 'first_reviews', 'review_seconds')
+
+
+def _counter_columns():
+    return [
+        *(sa.Column(name, sa.Integer(), nullable=False) for name in COUNTER_COLUMNS if name != 'review_seconds'),
+        sa.Column('review_seconds', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+    ]
+
+
+def upgrade():
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('reviewed_at', sa.DateTime(), nullable=True))
+
+    op.create_table(
+        'job_application_stats',
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        *_counter_columns(),
+        sa.ForeignKeyConstraint(['job_id'], ['jobs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('job_id'),
+    )
+    op.create_table(
+        'company_application_stats',
+        sa.Column('company_id', sa.Integer(), nullable=False),
+        *_counter_columns(),
+        sa.ForeignKeyConstraint(['company_id'], ['company.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('company_id'),
+    )
+
+    # Existing applications have no review time; count them as they stand
+    op.execute("""
+        INSERT INTO job_application_stats
+            (job_id, applications, pending, reviewed, accepted, rejected, first_reviews, review_seconds, updated_at)
+        SELECT job_id, COUNT(*),
+               SUM(CASE WHEN status = 'pending' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN status = 'reviewed' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN status = 'accepted' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN status = 'rejected' THEN 1 ELSE 0 END),
+               0, 0.0, CURRENT_TIMESTAMP
+        FROM applications
+        GROUP BY job_id
+    """)
+    op.execute("""
+        INSERT INTO company_application_stats
+            (company_id, applications, pending, reviewed, accepted, rejected, first_reviews, review_seconds, updated_at)
+        SELECT jobs.company_id, SUM(s.applications), SUM(s.pending), SUM(s.reviewed), SUM(s.accepted),
+               SUM(s.rejected), 0, 0.0, CURRENT_TIMESTAMP
+        FROM job_application_stats s JOIN jobs ON jobs.id = s.job_id
+        WHERE jobs.company_id IS NOT NULL
+        GROUP BY jobs.company_id
+    """)
+
+
+def downgrade():
+    op.drop_table('company_application_stats')
+    op.drop_table('job_application_stats')
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.drop_column('reviewed_at')
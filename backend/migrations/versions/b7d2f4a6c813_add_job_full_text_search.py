@@ -0,0 +1,48 @@
+"""Add full-text search index over job title, description and requirements
+
+Revision ID: b7d2f4a6c813
+Revises: a1c3e5f7b901
+Create Date: 2026-10-17 10:02:47.530114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d2f4a6c813'
+down_revision = 'a1c3e5f7b901'
+branch_labels = None
+depends_on = None
+
+# Kept in step with app/search.py
+SEARCH_COLUMNS = ('title', 'description', 'requirements')
+COALESCED_COLUMNS = [f"coalesce({c}, '')" for c in SEARCH_COLUMNS]
+PG_DOCUMENT_SQL = " || ' ' || ".join(COALESCED_COLUMNS)
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts "
+            f"USING fts5({', '.join(SEARCH_COLUMNS)}, tokenize='porter unicode61')"
+        )
+        # Backfill existing postings
+        op.execute(
+            f"INSERT INTO jobs_fts (rowid, {', '.join(SEARCH_COLUMNS)}) "
+            f"SELECT id, {', '.join(COALESCED_COLUMNS)} FROM jobs"
+        )
+    elif dialect == 'postgresql':
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_jobs_search_tsv ON jobs "
+            f"USING gin (to_tsvector('english', {PG_DOCUMENT_SQL}))"
+        )
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("DROP TABLE IF EXISTS jobs_fts")
+    elif dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_jobs_search_tsv")
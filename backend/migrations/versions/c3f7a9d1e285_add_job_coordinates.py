@@ -0,0 +1,49 @@
+"""Add geocoded coordinates to jobs and backfill them
+
+Revision ID: c3f7a9d1e285
+Revises: a8c6e2f4b175
+Create Date: 2026-10-17 20:14:37.218846
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.geo import backfill_locations
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f7a9d1e285'
+down_revision = 'a8c6e2f4b175'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+jobs = sa.table(
+    'jobs',
+    sa.column('id', sa.Integer),
+    sa.column('location', sa.String),
+    sa.column('latitude', sa.Float),
+    sa.column('longitude', sa.Float),
+    sa.column('geohash', sa.String),
+)
+
+
+def upgrade():
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('latitude', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('longitude', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('geohash', sa.String(length=12), nullable=True))
+
+    backfill_locations(op.get_bind(), jobs, batch_size=BACKFILL_BATCH_SIZE)
+
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.create_index('ix_jobs_active_geohash', ['is_active', 'geohash', 'latitude', 'longitude'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.drop_index('ix_jobs_active_geohash')
+        batch_op.drop_column('geohash')
+        batch_op.drop_column('longitude')
+        batch_op.drop_column('latitude')
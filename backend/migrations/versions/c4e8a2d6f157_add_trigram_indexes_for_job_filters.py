@@ -0,0 +1,32 @@
+"""Add trigram indexes for job location and job_type filters
+
+Revision ID: c4e8a2d6f157
+Revises: b7d2f4a6c813
+Create Date: 2026-10-17 11:26:33.904512
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e8a2d6f157'
+down_revision = 'b7d2f4a6c813'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # SQLite is served by the in-process index in app/trigram.py
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_jobs_location_trgm ON jobs USING gin (location gin_trgm_ops)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_jobs_job_type_trgm ON jobs USING gin (job_type gin_trgm_ops)")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("DROP INDEX IF EXISTS ix_jobs_job_type_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_jobs_location_trgm")
@@ -0,0 +1,55 @@
+"""Add resume_blobs, resume_uploads and applications.resume_blob_id
+
+Revision ID: c7a9e1f3b524
+Revises: b4e6a8c0d213
+Create Date: 2026-10-18 06:02:15.338470
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7a9e1f3b524'
+down_revision = 'b4e6a8c0d213'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'resume_blobs',
+        sa.Column('id', sa.String(length=64), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('content_type', sa.String(length=100), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_table(
+        'resume_uploads',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('blob_id', sa.String(length=64), nullable=False),
+        sa.Column('filename', sa.String(length=255), nullable=True),
+        sa.Column('uploaded_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['blob_id'], ['resume_blobs.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('uq_resume_uploads_user_id_blob_id', 'resume_uploads', ['user_id', 'blob_id'], unique=True)
+
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('resume_blob_id', sa.String(length=64), nullable=True))
+        batch_op.create_foreign_key('fk_applications_resume_blob_id', 'resume_blobs', ['resume_blob_id'], ['id'])
+        batch_op.create_index('ix_applications_resume_blob_id', ['resume_blob_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.drop_index('ix_applications_resume_blob_id')
+        batch_op.drop_constraint('fk_applications_resume_blob_id', type_='foreignkey')
+        batch_op.drop_column('resume_blob_id')
+
+    op.drop_index('uq_resume_uploads_user_id_blob_id', table_name='resume_uploads')
+    op.drop_table('resume_uploads')
+    op.drop_table('resume_blobs')
@@ -0,0 +1,34 @@
+"""Add job_stats for buffered view counts and trending scores
+
+Revision ID: d4a8b2c6e913
+Revises: c3f7a9d1e285
+Create Date: 2026-10-17 23:41:09.553102
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4a8b2c6e913'
+down_revision = 'c3f7a9d1e285'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'job_stats',
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('views', sa.Integer(), nullable=False),
+        sa.Column('trend_key', sa.Float(), nullable=False),
+        sa.Column('last_viewed_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['job_id'], ['jobs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('job_id'),
+    )
+    op.create_index('ix_job_stats_trend_key', 'job_stats', ['trend_key', 'job_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_job_stats_trend_key', table_name='job_stats')
+    op.drop_table('job_stats')
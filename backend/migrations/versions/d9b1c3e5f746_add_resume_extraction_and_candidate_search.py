@@ -0,0 +1,88 @@
+"""Add resume text extraction queue and candidate search over applications
+
+Revision ID: d9b1c3e5f746
+Revises: c7a9e1f3b524
+Create Date: 2026-10-18 07:40:08.215593
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9b1c3e5f746'
+down_revision = 'c7a9e1f3b524'
+branch_labels = None
+depends_on = None
+
+# Kept in step with app/candidate_search.py
+SEARCH_COLUMNS = ('cover_letter_text', 'resume_text')
+COALESCED_COLUMNS = [f"coalesce({c}, '')" for c in SEARCH_COLUMNS]
+PG_DOCUMENT_SQL = " || ' ' || ".join(COALESCED_COLUMNS)
+
+
+def upgrade():
+    with op.batch_alter_table('resume_blobs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('text', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('extracted_at', sa.DateTime(), nullable=True))
+
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('resume_text', sa.Text(), nullable=True))
+
+    op.create_table(
+        'resume_extractions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('blob_id', sa.String(length=64), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['blob_id'], ['resume_blobs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_resume_extractions_status_id', 'resume_extractions', ['status', 'id'], unique=False)
+    op.create_index('uq_resume_extractions_blob_id', 'resume_extractions', ['blob_id'], unique=True)
+
+    # Resumes uploaded before this revision are extracted by the queue like new ones
+    op.execute(
+        "INSERT INTO resume_extractions (blob_id, status, attempts, created_at) "
+        "SELECT id, 'queued', 0, CURRENT_TIMESTAMP FROM resume_blobs"
+    )
+
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS applications_fts "
+            f"USING fts5({', '.join(SEARCH_COLUMNS)}, tokenize='porter unicode61')"
+        )
+        # Backfill existing applications (cover letters; resumes follow as they are extracted)
+        op.execute(
+            f"INSERT INTO applications_fts (rowid, {', '.join(SEARCH_COLUMNS)}) "
+            f"SELECT id, {', '.join(COALESCED_COLUMNS)} FROM applications"
+        )
+    elif dialect == 'postgresql':
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_applications_search_tsv ON applications "
+            f"USING gin (to_tsvector('english', {PG_DOCUMENT_SQL}))"
+        )
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("DROP TABLE IF EXISTS applications_fts")
+    elif dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_applications_search_tsv")
+
+    op.drop_index('uq_resume_extractions_blob_id', table_name='resume_extractions')
+    op.drop_index('ix_resume_extractions_status_id', table_name='resume_extractions')
+    op.drop_table('resume_extractions')
+
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.drop_column('resume_text')
+
+    with op.batch_alter_table('resume_blobs', schema=None) as batch_op:
+        batch_op.drop_column('extracted_at')
+        batch_op.drop_column('text')
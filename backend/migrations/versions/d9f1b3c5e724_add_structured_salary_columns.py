@@ -0,0 +1,92 @@
+"""Add structured salary columns to jobs and backfill them
+
+Revision ID: d9f1b3c5e724
+Revises: c4e8a2d6f157
+Create Date: 2026-10-17 13:40:12.661370
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.salary import parse_salary
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9f1b3c5e724'
+down_revision = 'c4e8a2d6f157'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+jobs = sa.table(
+    'jobs',
+    sa.column('id', sa.Integer),
+    sa.column('salary', sa.String),
+    sa.column('salary_min', sa.Integer),
+    sa.column('salary_max', sa.Integer),
+    sa.column('salary_currency', sa.String),
+    sa.column('salary_period', sa.String),
+)
+
+
+def backfill_salaries(connection):
+    """Parse jobs.salary into the structured columns, one id-ordered batch at a time."""
+    update = (
+        jobs.update()
+        .where(jobs.c.id == sa.bindparam('job_id'))
+        .values(
+            salary_min=sa.bindparam('salary_min'),
+            salary_max=sa.bindparam('salary_max'),
+            salary_currency=sa.bindparam('salary_currency'),
+            salary_period=sa.bindparam('salary_period'),
+        )
+    )
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(jobs.c.id, jobs.c.salary)
+            .where(jobs.c.id > last_id, jobs.c.salary.isnot(None))
+            .order_by(jobs.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        params = []
+        for job_id, salary in rows:
+            parsed = parse_salary(salary)
+            params.append({
+                'job_id': job_id,
+                'salary_min': parsed.min,
+                'salary_max': parsed.max,
+                'salary_currency': parsed.currency,
+                'salary_period': parsed.period,
+            })
+        connection.execute(update, params)
+        last_id = rows[-1][0]
+
+
+def upgrade():
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('salary_min', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('salary_max', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('salary_currency', sa.String(length=3), nullable=True))
+        batch_op.add_column(sa.Column('salary_period', sa.String(length=10), nullable=True))
+        batch_op.drop_index('ix_jobs_active_salary_id')
+
+    backfill_salaries(op.get_bind())
+
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.create_index('ix_jobs_active_salary_max_id', ['is_active', 'salary_max', 'id'], unique=False)
+        batch_op.create_index('ix_jobs_active_salary_min', ['is_active', 'salary_min'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.drop_index('ix_jobs_active_salary_min')
+        batch_op.drop_index('ix_jobs_active_salary_max_id')
+        batch_op.create_index('ix_jobs_active_salary_id', ['is_active', 'salary', 'id'], unique=False)
+        batch_op.drop_column('salary_period')
+        batch_op.drop_column('salary_currency')
+        batch_op.drop_column('salary_max')
+        batch_op.drop_column('salary_min')
@@ -0,0 +1,37 @@
+"""Add table_versions for ETag / Last-Modified support
+
+Revision ID: e3a7c9b1d468
+Revises: d9f1b3c5e724
+Create Date: 2026-10-17 15:08:51.270936
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3a7c9b1d468'
+down_revision = 'd9f1b3c5e724'
+branch_labels = None
+depends_on = None
+
+TRACKED_TABLES = ('users', 'company', 'jobs', 'applications', 'saved_jobs')
+
+
+def upgrade():
+    table_versions = op.create_table('table_versions',
+    sa.Column('table_name', sa.String(length=64), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('table_name')
+    )
+    now = datetime.utcnow()
+    op.bulk_insert(table_versions, [
+        {'table_name': name, 'version': 1, 'updated_at': now} for name in TRACKED_TABLES
+    ])
+
+
+def downgrade():
+    op.drop_table('table_versions')
@@ -0,0 +1,69 @@
+"""Add annualised salary columns to jobs and backfill them
+
+Revision ID: e5a7c9d1f382
+Revises: d9b1c3e5f746
+Create Date: 2026-10-18 09:12:44.503127
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.salary import PERIODS_PER_YEAR
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a7c9d1f382'
+down_revision = 'd9b1c3e5f746'
+branch_labels = None
+depends_on = None
+
+jobs = sa.table(
+    'jobs',
+    sa.column('salary_min', sa.Integer),
+    sa.column('salary_max', sa.Integer),
+    sa.column('salary_period', sa.String),
+    sa.column('salary_annual_min', sa.BigInteger),
+    sa.column('salary_annual_max', sa.BigInteger),
+)
+
+
+def backfill_annual_salaries(connection):
+    """Annualise the parsed bounds in one UPDATE; no period means yearly, as in app/salary.py."""
+    factor = sa.case(
+        *((jobs.c.salary_period == period, per_year) for period, per_year in PERIODS_PER_YEAR.items()),
+        else_=1,
+    )
+    connection.execute(
+        jobs.update()
+        .where(jobs.c.salary_min.isnot(None))
+        .values(
+            salary_annual_min=sa.cast(jobs.c.salary_min, sa.BigInteger) * factor,
+            salary_annual_max=sa.cast(jobs.c.salary_max, sa.BigInteger) * factor,
+        )
+    )
+
+
+def upgrade():
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('salary_annual_min', sa.BigInteger(), nullable=True))
+        batch_op.add_column(sa.Column('salary_annual_max', sa.BigInteger(), nullable=True))
+        batch_op.drop_index('ix_jobs_active_salary_min')
+        batch_op.drop_index('ix_jobs_active_salary_max_id')
+
+    backfill_annual_salaries(op.get_bind())
+
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.create_index('ix_jobs_active_currency_annual_max_id',
+                              ['is_active', 'salary_currency', 'salary_annual_max', 'id'], unique=False)
+        batch_op.create_index('ix_jobs_active_currency_annual_min',
+                              ['is_active', 'salary_currency', 'salary_annual_min'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.drop_index('ix_jobs_active_currency_annual_min')
+        batch_op.drop_index('ix_jobs_active_currency_annual_max_id')
+        batch_op.create_index('ix_jobs_active_salary_max_id', ['is_active', 'salary_max', 'id'], unique=False)
+        batch_op.create_index('ix_jobs_active_salary_min', ['is_active', 'salary_min'], unique=False)
+        batch_op.drop_column('salary_annual_max')
+        batch_op.drop_column('salary_annual_min')
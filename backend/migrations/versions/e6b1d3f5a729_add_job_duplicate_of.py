@@ -0,0 +1,28 @@
+"""Add jobs.duplicate_of_id for near-duplicate postings
+
+Revision ID: e6b1d3f5a729
+Revises: d4a8b2c6e913
+Create Date: 2026-10-18 01:12:44.906215
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e6b1d3f5a729'
+down_revision = 'd4a8b2c6e913'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('duplicate_of_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('fk_jobs_duplicate_of_id', 'jobs', ['duplicate_of_id'], ['id'], ondelete='SET NULL')
+
+
+def downgrade():
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_jobs_duplicate_of_id', type_='foreignkey')
+        batch_op.drop_column('duplicate_of_id')
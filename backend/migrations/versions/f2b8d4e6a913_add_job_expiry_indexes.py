@@ -0,0 +1,31 @@
+"""Add indexes for the job expiry sweeper and live-job listing
+
+Revision ID: f2b8d4e6a913
+Revises: e3a7c9b1d468
+Create Date: 2026-10-17 16:41:27.530184
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2b8d4e6a913'
+down_revision = 'e3a7c9b1d468'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.create_index('ix_jobs_active_expires_date', ['is_active', 'expires_date'], unique=False)
+    # Partial index over live rows only; SQLite keeps using ix_jobs_active_date_posted_id
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("CREATE INDEX IF NOT EXISTS ix_jobs_live_date_posted ON jobs (date_posted, id) WHERE is_active")
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_jobs_live_date_posted")
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.drop_index('ix_jobs_active_expires_date')
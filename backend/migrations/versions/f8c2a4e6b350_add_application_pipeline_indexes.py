@@ -0,0 +1,32 @@
+"""Index applications for the per-job applicant pipeline
+
+Revision ID: f8c2a4e6b350
+Revises: e6b1d3f5a729
+Create Date: 2026-10-18 02:37:15.440931
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f8c2a4e6b350'
+down_revision = 'e6b1d3f5a729'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.create_index('ix_applications_job_id_date_id', ['job_id', 'application_date', 'id'], unique=False)
+        # Extends ix_applications_job_id_status, which it replaces
+        batch_op.create_index('ix_applications_job_id_status_date_id',
+                              ['job_id', 'status', 'application_date', 'id'], unique=False)
+        batch_op.drop_index('ix_applications_job_id_status')
+
+
+def downgrade():
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.create_index('ix_applications_job_id_status', ['job_id', 'status'], unique=False)
+        batch_op.drop_index('ix_applications_job_id_status_date_id')
+        batch_op.drop_index('ix_applications_job_id_date_id')